@@ -1,3 +1,129 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from .models import AnalyticsReport, ChangeLogEntry, HarvestSource, ImageAsset, RequestProfile, ViewProfile
+from .profiling import hot_frames, parse_collapsed, speedscope
+
+
+@admin.register(ImageAsset)
+class ImageAssetAdmin(admin.ModelAdmin):
+    list_display = ['source_url', 'is_valid', 'width', 'height', 'checked_at']
+    list_filter = ['is_valid']
+    search_fields = ['source_url']
+    readonly_fields = [
+        'source_url', 'content_hash', 'extension', 'width', 'height',
+        'is_valid', 'error', 'checked_at',
+    ]
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ['seq', 'collection', 'object_id', 'action', 'changed_at']
+    list_filter = ['collection', 'action']
+    readonly_fields = ['seq', 'collection', 'object_id', 'action', 'changed_at']
+
+
+@admin.register(HarvestSource)
+class HarvestSourceAdmin(admin.ModelAdmin):
+    list_display = ['name', 'url', 'enabled', 'last_status', 'last_harvested_at']
+    list_filter = ['enabled', 'last_status']
+    readonly_fields = ['last_harvested_at', 'last_status', 'last_error']
+
+
+@admin.register(AnalyticsReport)
+class AnalyticsReportAdmin(admin.ModelAdmin):
+    list_display = ['name', 'generation', 'computed_at']
+    readonly_fields = ['name', 'generation', 'computed_at']
+
+
+class ProfileAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for stored profiles, with their hot frames and downloads.
+
+    ``<id>/download/collapsed/`` serves the collapsed stacks and
+    ``<id>/download/speedscope/`` a speedscope JSON file.
+    """
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path(
+                '<int:pk>/download/<str:kind>/', self.admin_site.admin_view(self.download),
+                name='%s_%s_download' % info,
+            ),
+        ] + super().get_urls()
+
+    def interval_ms(self, profile):
+        return profile.interval_ms
+
+    def download(self, request, pk, kind):
+        profile = get_object_or_404(self.model, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise PermissionDenied
+        name = f"profile-{self.model._meta.model_name}-{pk}"
+        if kind == 'collapsed':
+            response = HttpResponse(profile.stacks, content_type='text/plain; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{name}.txt"'
+        elif kind == 'speedscope':
+            data = speedscope(parse_collapsed(profile.stacks), str(profile), self.interval_ms(profile))
+            response = HttpResponse(json.dumps(data), content_type='application/json')
+            response['Content-Disposition'] = f'attachment; filename="{name}.speedscope.json"'
+        else:
+            return HttpResponse(status=404)
+        return response
+
+    @admin.display(description="Download")
+    def downloads(self, profile):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return format_html_join(' | ', '<a href="{}">{}</a>', (
+            (reverse('admin:%s_%s_download' % info, args=[profile.pk, kind]), kind)
+            for kind in ('collapsed', 'speedscope')
+        ))
+
+    @admin.display(description="Hot frames")
+    def hot_frames_table(self, profile):
+        rows = hot_frames(parse_collapsed(profile.stacks))
+        total = profile.samples or 1
+        return format_html(
+            '<table><tr><th>Frame</th><th>Self</th><th>Total</th></tr>{}</table>',
+            format_html_join('', '<tr><td>{}</td><td>{}%</td><td>{}%</td></tr>', (
+                (label, round(100 * own / total, 1), round(100 * inclusive / total, 1))
+                for label, own, inclusive in rows
+            )),
+        )
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(ProfileAdmin):
+    list_display = ['created_at', 'method', 'path', 'view', 'status_code', 'duration_ms', 'samples', 'downloads']
+    list_filter = ['view']
+    search_fields = ['path', 'view']
+    fields = [
+        'created_at', 'method', 'path', 'view', 'username', 'status_code',
+        'duration_ms', 'interval_ms', 'samples', 'downloads', 'hot_frames_table',
+    ]
+    readonly_fields = fields
+
+
+@admin.register(ViewProfile)
+class ViewProfileAdmin(ProfileAdmin):
+    list_display = ['view', 'requests', 'samples', 'updated_at', 'downloads']
+    search_fields = ['view']
+    fields = ['view', 'requests', 'samples', 'updated_at', 'downloads', 'hot_frames_table']
+    readonly_fields = fields
 
-# Register your models here.
+    def interval_ms(self, profile):
+        return settings.PROFILING_CONTINUOUS_INTERVAL_MS or 1
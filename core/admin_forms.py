@@ -1,4 +1,11 @@
 from django import forms
 
 class CsvImportForm(forms.Form):
-    csv_file = forms.FileField(label="Select CSV file")
\ No newline at end of file
+    csv_file = forms.FileField(label="Select CSV file")
+    validate_only = forms.BooleanField(
+        required=False, label="Only check the file",
+        help_text=(
+            "Report every problem in the file without importing anything. "
+            "Otherwise the rows are imported as they are, without this check."
+        ),
+    )
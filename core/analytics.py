@@ -0,0 +1,236 @@
+"""
+Collaboration analytics over the whole catalog.
+
+This file contains the job behind ``/api/analytics/`` and ``manage.py
+refresh_analytics``: who teaches with whom (through ProfessorCourse), which
+research groups courses bridge (through CourseResearch) and how PhD
+supervision is spread. Each relation table is read once with ``values_list``
+into sparse adjacency matrices, kept as {row: {column: weight}} dicts:
+
+- co-teaching, professors x professors, weighted by the number of shared
+  courses (A·Aᵀ of the professor x course incidence matrix A);
+- bridges, research groups x research groups, weighted by the number of
+  courses shared (Bᵀ·B of the course x group incidence matrix B).
+
+On those it computes degrees, connected components (union-find) and
+eigenvector centrality (power iteration, one sparse matrix-vector product per
+step). The report is stored in an AnalyticsReport row together with the
+catalog generation it was computed at (core/changes.py), so the endpoint
+serves it without recomputing and says when it is stale.
+"""
+
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+REPORT_NAME = 'collaboration'
+# Pairs listed in the "top" sections of the report.
+TOP_PAIRS = 20
+CENTRALITY_ITERATIONS = 100
+CENTRALITY_TOLERANCE = 1e-9
+
+
+def incidence(pairs):
+    """Return {row: [columns]} for (row, column) pairs, a sparse 0/1 matrix by rows."""
+    rows = defaultdict(list)
+    for row, column in pairs:
+        rows[row].append(column)
+    return rows
+
+
+def cooccurrence(columns):
+    """
+    Return the symmetric {node: {node: weight}} matrix of nodes sharing columns.
+
+    ``columns`` maps each column to the nodes in it; the weight of two nodes
+    is the number of columns they share. The diagonal is left out.
+    """
+    matrix = defaultdict(Counter)
+    for nodes in columns.values():
+        for a, b in combinations(sorted(set(nodes)), 2):
+            matrix[a][b] += 1
+            matrix[b][a] += 1
+    return matrix
+
+
+def components(nodes, matrix):
+    """Return {node: component}, each component labelled by its smallest node."""
+    parent = {node: node for node in nodes}
+
+    def root(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for a, row in matrix.items():
+        for b in row:
+            ra, rb = root(a), root(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+    return {node: root(node) for node in nodes}
+
+
+def eigenvector_centrality(nodes, matrix):
+    """
+    Return {node: centrality} scaled so the most central node scores 1.
+
+    Power iteration on A + I (the identity keeps bipartite graphs from
+    oscillating). Nodes outside the dominant component tend to 0, as
+    eigenvector centrality does.
+    """
+    scores = {node: 1.0 for node in nodes}
+    for _ in range(CENTRALITY_ITERATIONS):
+        updated = {
+            node: score + sum(weight * scores[other] for other, weight in matrix.get(node, {}).items())
+            for node, score in scores.items()
+        }
+        norm = math.sqrt(sum(value * value for value in updated.values())) or 1.0
+        updated = {node: value / norm for node, value in updated.items()}
+        change = sum(abs(updated[node] - scores[node]) for node in nodes)
+        scores = updated
+        if change < CENTRALITY_TOLERANCE * max(1, len(nodes)):
+            break
+    highest = max(scores.values(), default=0) or 1.0
+    return {node: round(value / highest, 4) for node, value in scores.items()}
+
+
+def top_pairs(matrix, key, limit=TOP_PAIRS):
+    pairs = [(weight, a, b) for a, row in matrix.items() for b, weight in row.items() if a < b]
+    pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    return [{key: [a, b], 'courses': weight} for weight, a, b in pairs[:limit]]
+
+
+def compute_report():
+    """Compute the collaboration report of the current catalog with five queries."""
+    from phd_students.models import PhDStudent
+    from professors.models import Professor
+    from relations.models import CourseResearch, ProfessorCourse
+    from research_groups.models import ResearchGroup
+
+    professors = {}
+    professor_group = {}
+    for pk, title, name, group, leads in Professor.objects.values_list(
+        'pk', 'title', 'name', 'research_group_id', 'leads_research_group_id',
+    ).iterator():
+        professors[pk] = ' '.join(filter(None, (title, name)))
+        professor_group[pk] = group or leads
+    groups = dict(ResearchGroup.objects.values_list('pk', 'name').iterator())
+
+    teaching = incidence(ProfessorCourse.objects.values_list('professor_id', 'course_id').iterator())
+    course_professors = defaultdict(list)
+    for professor, courses in teaching.items():
+        for course in courses:
+            course_professors[course].append(professor)
+    course_groups = incidence(CourseResearch.objects.values_list('course_id', 'research_group_id').iterator())
+    group_courses = Counter(group for course_list in course_groups.values() for group in set(course_list))
+
+    supervised = Counter()
+    group_students = Counter()
+    unsupervised = 0
+    for supervisor, group in PhDStudent.objects.values_list('supervisor_id', 'research_group_id').iterator():
+        if supervisor is None:
+            unsupervised += 1
+        else:
+            supervised[supervisor] += 1
+        if group is not None:
+            group_students[group] += 1
+
+    coteaching = cooccurrence(course_professors)
+    bridges = cooccurrence(course_groups)
+    nodes = sorted(professors)
+    component = components(nodes, coteaching)
+    sizes = Counter(component.values())
+    centrality = eigenvector_centrality(nodes, coteaching)
+    others = max(1, len(nodes) - 1)
+
+    professor_rows = []
+    for pk in nodes:
+        row = coteaching.get(pk, {})
+        group = professor_group[pk]
+        professor_rows.append({
+            'id': pk,
+            'name': professors[pk],
+            'research_group': group,
+            'courses': len(teaching.get(pk, ())),
+            'coteachers': len(row),
+            'shared_courses': sum(row.values()),
+            # Only pairs whose groups are both known can cross groups.
+            'cross_group_coteachers': sum(
+                1 for other in row
+                if group is not None and professor_group.get(other) not in (None, group)
+            ),
+            'supervised_students': supervised[pk],
+            'component': component[pk],
+            'degree_centrality': round(len(row) / others, 4),
+            'eigenvector_centrality': centrality[pk],
+        })
+
+    members = Counter(group for group in professor_group.values() if group is not None)
+    group_rows = [
+        {
+            'id': pk,
+            'name': groups[pk],
+            'professors': members[pk],
+            'phd_students': group_students[pk],
+            'courses': group_courses[pk],
+            'bridged_groups': len(bridges.get(pk, {})),
+            'bridge_courses': sum(bridges.get(pk, {}).values()),
+        }
+        for pk in sorted(groups)
+    ]
+
+    loads = [supervised[pk] for pk in nodes]
+    return {
+        'summary': {
+            'professors': len(nodes),
+            'research_groups': len(groups),
+            'taught_courses': len(course_professors),
+            'coteaching_pairs': sum(len(row) for row in coteaching.values()) // 2,
+            'components': len(sizes),
+            'largest_component': max(sizes.values(), default=0),
+            'isolated_professors': sum(1 for pk in nodes if pk not in coteaching),
+            'group_bridges': sum(len(row) for row in bridges.values()) // 2,
+            'supervised_students': sum(loads),
+            'unsupervised_students': unsupervised,
+            'max_supervision_load': max(loads, default=0),
+        },
+        'professors': professor_rows,
+        'research_groups': group_rows,
+        'top_coteaching': top_pairs(coteaching, 'professors'),
+        'top_bridges': top_pairs(bridges, 'research_groups'),
+    }
+
+
+def refresh_analytics():
+    """Recompute the collaboration report and store it; return the stored AnalyticsReport."""
+    from core.changes import latest_sequence
+    from core.models import AnalyticsReport
+
+    generation = latest_sequence()
+    report, _created = AnalyticsReport.objects.update_or_create(
+        name=REPORT_NAME, defaults={'generation': generation, 'data': compute_report()},
+    )
+    return report
+
+
+_report = None
+
+
+def get_analytics():
+    """
+    Return the stored collaboration report, computing it first if there is none yet.
+
+    The decoded report is kept in process until a newer one is stored, so a
+    request costs one query for its timestamp.
+    """
+    from core.models import AnalyticsReport
+
+    global _report
+    reports = AnalyticsReport.objects.filter(name=REPORT_NAME)
+    computed_at = reports.values_list('computed_at', flat=True).first()
+    if computed_at is None:
+        _report = refresh_analytics()
+    elif _report is None or _report.computed_at != computed_at:
+        _report = reports.first()
+    return _report
@@ -0,0 +1,19 @@
+"""
+URL configuration for the Core app API.
+
+This file defines the URL patterns of the MOOChub change feed, the live
+change stream, the search box typeahead, the batch endpoint and the
+collaboration analytics.
+"""
+
+from django.urls import path
+
+from .api_views import AnalyticsView, AutocompleteView, BatchView, MOOChubChangesView, live_changes
+
+urlpatterns = [
+    path('moochub/changes/', MOOChubChangesView.as_view(), name='moochub-changes'),
+    path('live/changes/', live_changes, name='live-changes'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('analytics/', AnalyticsView.as_view(), name='analytics'),
+]
@@ -0,0 +1,251 @@
+"""
+API views for the Core app.
+
+This file contains the MOOChub change feed, which lets harvesters fetch only
+what changed since their last sync instead of the whole catalog, and the live
+change stream for the portal frontend (server-sent events with a long-poll
+fallback), which needs an ASGI server, the search box typeahead, the batch
+endpoint that runs many API requests in one round trip and the collaboration
+analytics.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from core.analytics import get_analytics
+from core.autocomplete import DETAIL_VIEWS, MAX_LIMIT, TYPES, get_index
+from core.batch import BatchError, parse_paths, run_batch
+from core.changes import iter_changes, latest_sequence, settled_sequence
+from core.db import ReplicaReadsMixin
+from core.live import HEARTBEAT_SECONDS, MAX_POLL_TIMEOUT, MAX_STREAM_SECONDS, QUEUE_SIZE, fetch_events, hub
+from core.moochub import JSONAPI_VERSION
+
+
+class MOOChubChangesView(APIView):
+    """
+    Stream the MOOChub catalog changes after a sequence number.
+
+    GET /api/moochub/changes/?since=<seq>&limit=<n> returns, in sequence order,
+    one record per changed resource: upserts carry the resource's current
+    MOOChub representation, deletes are tombstones. ``links.next`` is the URL to
+    poll next time and ``meta.latest`` the newest sequence number served, which
+    lags the change log by CHANGE_FEED_COMMIT_LAG_SECONDS (see core/changes.py);
+    start a full sync with ``since=0``.
+    """
+
+    default_limit = 1000
+    max_limit = 10000
+
+    def get_int_param(self, name, default, maximum=None):
+        raw = self.request.query_params.get(name, default)
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({name: "A non-negative integer is required."})
+        if value < 0:
+            raise ValidationError({name: "A non-negative integer is required."})
+        return min(value, maximum) if maximum is not None else value
+
+    def get(self, request, *args, **kwargs):
+        since = self.get_int_param('since', 0)
+        limit = self.get_int_param('limit', self.default_limit, self.max_limit)
+        latest = settled_sequence(since)
+        response = StreamingHttpResponse(
+            self.stream(since, limit, latest), content_type='application/json',
+        )
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def stream(self, since, limit, latest):
+        """Yield the JSON document piece by piece, one record at a time."""
+        render = JSONRenderer().render
+        yield b'{"jsonapi":' + render(JSONAPI_VERSION) + b',"data":['
+        last = since
+        for index, record in enumerate(iter_changes(since, latest, limit, self.request)):
+            yield (b',' if index else b'') + render(record)
+            last = record['seq']
+        url = replace_query_param(self.request.build_absolute_uri(), 'since', max(last, since))
+        yield b'],"links":' + render({"next": url}) + b',"meta":' + render({"latest": latest}) + b'}'
+
+
+class AutocompleteView(ReplicaReadsMixin, APIView):
+    """
+    Suggest courses, professors and research groups for a search box.
+
+    GET /api/autocomplete/?q=<prefix>&limit=<n>&type=course,professor returns
+    the best matches for names (and course codes) with a word starting with
+    ``q``, served from the in-process prefix index in core/autocomplete.py.
+    ``meta`` reports the index's generation, size and approximate memory use.
+    """
+
+    default_limit = 10
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '')
+        try:
+            limit = parse_int(request.query_params.get('limit'), self.default_limit, MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': "A non-negative integer is required."})
+        types = None
+        if request.query_params.get('type'):
+            types = set(request.query_params['type'].split(','))
+            if not types <= set(TYPES):
+                raise ValidationError({'type': f"Choose from {', '.join(TYPES)}."})
+
+        index = get_index()
+        data = [
+            {"type": kind, "id": pk, "label": label, "url": reverse(DETAIL_VIEWS[kind], args=[pk])}
+            for kind, pk, label in index.search(query, limit, types)
+        ]
+        meta = {"generation": index.generation, "entries": len(index), "memory_bytes": index.memory_bytes()}
+        return Response({"data": data, "meta": meta})
+
+
+class BatchView(APIView):
+    """
+    Run several API GET requests in one round trip.
+
+    POST /api/batch/ with {"requests": ["/api/courses/1/", {"path": "/api/courses/1/professors/"}],
+    "parallel": false} returns {"responses": [{"path", "status", "body"}, ...]}
+    in request order, each as if it had been requested on its own (see
+    core/batch.py). Up to MAX_REQUESTS paths under /api/ per batch.
+    """
+
+    def post(self, request, *args, **kwargs):
+        body = request.data if isinstance(request.data, dict) else {}
+        try:
+            paths = parse_paths(body.get('requests'))
+        except BatchError as exc:
+            raise ValidationError({'requests': str(exc)})
+        parallel = body.get('parallel', False)
+        if not isinstance(parallel, bool):
+            raise ValidationError({'parallel': "Must be true or false."})
+        return Response({"responses": run_batch(request, paths, parallel)})
+
+
+class AnalyticsView(APIView):
+    """
+    Serve the collaboration analytics report.
+
+    GET /api/analytics/ returns {"data": {"summary", "professors",
+    "research_groups", "top_coteaching", "top_bridges"}, "meta": {...}}, as
+    last computed by ``manage.py refresh_analytics`` (see core/analytics.py).
+    ``meta.stale`` tells whether the catalog changed since.
+    """
+
+    def get(self, request, *args, **kwargs):
+        report = get_analytics()
+        latest = latest_sequence()
+        return Response({
+            "data": report.data,
+            "meta": {
+                "generation": report.generation,
+                "latest": latest,
+                "stale": report.generation != latest,
+                "computed_at": report.computed_at,
+            },
+        })
+
+
+def format_event(event):
+    """Return a change event in server-sent events format."""
+    return f"id: {event['seq']}\nevent: change\ndata: {json.dumps(event)}\n\n".encode()
+
+
+RESYNC_EVENT = b'event: resync\ndata: {}\n\n'
+HEARTBEAT = b': heartbeat\n\n'
+
+
+def parse_int(value, default, maximum=None):
+    if value is None or value == '':
+        return default
+    number = int(value)
+    if number < 0:
+        raise ValueError(value)
+    return min(number, maximum) if maximum is not None else number
+
+
+async def live_changes(request):
+    """
+    Push catalog change notifications to a live client.
+
+    With ``Accept: text/event-stream`` (what EventSource sends) the response is
+    a server-sent events stream: one ``change`` event per changed resource,
+    {"seq", "collection", "id", "action"}, a comment line as heartbeat while
+    idle, and a ``resync`` event when the client fell too far behind and should
+    reload. Reconnecting clients get the changes after their Last-Event-ID.
+
+    Otherwise the request is a long poll: ``?since=<seq>&timeout=<seconds>``
+    returns as soon as there are changes after ``since`` (or after the timeout,
+    with an empty list). ``links.next`` is the URL of the following poll.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    try:
+        if 'text/event-stream' in request.headers.get('Accept', ''):
+            last_event_id = parse_int(request.headers.get('Last-Event-ID'), None)
+            return event_stream_response(last_event_id)
+        since = parse_int(request.GET.get('since'), None)
+        timeout = parse_int(request.GET.get('timeout'), 25, MAX_POLL_TIMEOUT)
+    except ValueError:
+        return JsonResponse({"detail": "since, timeout and Last-Event-ID must be non-negative integers."}, status=400)
+    return await long_poll_response(request, since, timeout)
+
+
+def event_stream_response(last_event_id):
+    async def stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MAX_STREAM_SECONDS
+        subscription = hub.subscribe()
+        try:
+            yield b'retry: 5000\n\n'
+            if last_event_id is not None:
+                missed = await sync_to_async(fetch_events)(last_event_id, QUEUE_SIZE + 1)
+                if len(missed) > QUEUE_SIZE:
+                    yield RESYNC_EVENT
+                else:
+                    for event in missed:
+                        yield format_event(event)
+            while loop.time() < deadline:
+                events, overflowed = await subscription.get(HEARTBEAT_SECONDS)
+                if overflowed:
+                    yield RESYNC_EVENT
+                for event in events:
+                    yield format_event(event)
+                if not events and not overflowed:
+                    yield HEARTBEAT
+        finally:
+            hub.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def long_poll_response(request, since, timeout):
+    subscription = hub.subscribe()
+    try:
+        if since is None:
+            since = await sync_to_async(latest_sequence)()
+        events = await sync_to_async(fetch_events)(since)
+        if not events and timeout:
+            await subscription.get(timeout)
+            events = await sync_to_async(fetch_events)(since)
+    finally:
+        hub.unsubscribe(subscription)
+    last = events[-1]['seq'] if events else since
+    next_url = replace_query_param(request.build_absolute_uri(), 'since', last)
+    response = JsonResponse({"data": events, "links": {"next": next_url}})
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,138 @@
+"""
+In-process prefix index behind the search box typeahead.
+
+This file contains the index used by ``/api/autocomplete/``. It holds every
+course name and code, professor name and research group name as a sorted array
+of normalized keys (one key per word, so "learn" finds "Machine Learning"), and
+answers a prefix query with a binary search instead of a ``LIKE`` scan.
+
+The index belongs to a catalog generation, the sequence number of the newest
+change log entry (core/changes.py). Each lookup checks the generation with one
+cheap query and rebuilds the index first if the catalog changed since it was
+built; concurrent requests keep using the old index until the new one is
+swapped in.
+"""
+
+import sys
+import threading
+from bisect import bisect_left
+
+from core.matching import TOKEN_RE, fold
+
+# Matches ranked per lookup; a prefix matching more keys of the requested
+# types than this only ranks the first ones in key order.
+SCAN_LIMIT = 200
+MAX_LIMIT = 20
+
+COURSE = 'course'
+PROFESSOR = 'professor'
+RESEARCH_GROUP = 'research_group'
+TYPES = (COURSE, PROFESSOR, RESEARCH_GROUP)
+
+# Result type -> name of the HTML detail view.
+DETAIL_VIEWS = {
+    COURSE: 'course_detail',
+    PROFESSOR: 'professor_detail',
+    RESEARCH_GROUP: 'researchgroup_detail',
+}
+
+
+def normalize(text):
+    return ' '.join(TOKEN_RE.findall(fold(text)))
+
+
+def load_entries():
+    """Yield (type, id, label, [indexed texts]) for everything the box can find."""
+    from courses.models import Course
+    from professors.models import Professor
+    from research_groups.models import ResearchGroup
+
+    for pk, name, code in Course.objects.values_list('pk', 'name', 'code').iterator():
+        yield COURSE, pk, name, [name, code]
+    for pk, title, name in Professor.objects.values_list('pk', 'title', 'name').iterator():
+        yield PROFESSOR, pk, f"{title} {name}".strip(), [name]
+    for pk, name in ResearchGroup.objects.values_list('pk', 'name').iterator():
+        yield RESEARCH_GROUP, pk, name, [name]
+
+
+class PrefixIndex:
+    """Sorted array of normalized keys pointing at (type, id, label) entries."""
+
+    def __init__(self, entries, generation=0):
+        self.generation = generation
+        self.entries = []
+        keyed = []
+        for kind, pk, label, texts in entries:
+            position = len(self.entries)
+            self.entries.append((kind, pk, label))
+            for text in texts:
+                tokens = normalize(text or '').split()
+                # Every word starts a key, so prefixes match in mid-name too;
+                # the word number ranks matches at the start of a name first.
+                for number in range(len(tokens)):
+                    keyed.append((' '.join(tokens[number:]), number, position))
+        keyed.sort()
+        self.keys = [key for key, _number, _position in keyed]
+        self.refs = [(number, position) for _key, number, position in keyed]
+        self._memory_bytes = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query, limit=10, types=None):
+        """Return up to ``limit`` (type, id, label) entries whose words start with ``query``."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        best = {}
+        scanned = 0
+        for index in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[index].startswith(prefix):
+                break
+            number, position = self.refs[index]
+            # Filter before counting, so keys of other types don't use up the limit.
+            if types is not None and self.entries[position][0] not in types:
+                continue
+            scanned += 1
+            if scanned > SCAN_LIMIT:
+                break
+            if number < best.get(position, len(self.keys)):
+                best[position] = number
+        ranked = sorted(best, key=lambda position: (best[position], len(self.entries[position][2]), position))
+        return [self.entries[position] for position in ranked[:limit]]
+
+    def memory_bytes(self):
+        """Approximate size of the index in bytes, shared strings counted once; computed once."""
+        if self._memory_bytes is not None:
+            return self._memory_bytes
+        seen = set()
+        total = sys.getsizeof(self.keys) + sys.getsizeof(self.refs) + sys.getsizeof(self.entries)
+        for key in self.keys:
+            if id(key) not in seen:
+                seen.add(id(key))
+                total += sys.getsizeof(key)
+        for ref in self.refs:
+            total += sys.getsizeof(ref)
+        for entry in self.entries:
+            total += sys.getsizeof(entry) + sys.getsizeof(entry[2])
+        self._memory_bytes = total
+        return total
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """Return the index of the current catalog generation, rebuilding it if needed."""
+    from core.changes import latest_sequence
+
+    global _index
+    generation = latest_sequence()
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+    with _lock:
+        if _index is None or _index.generation != generation:
+            _index = PrefixIndex(load_entries(), generation)
+        return _index
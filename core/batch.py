@@ -0,0 +1,136 @@
+"""
+Batched API requests.
+
+This file contains the machinery behind ``/api/batch/``, which runs many GET
+requests against the API in one round trip. Each sub-request is resolved with
+the project URLconf and handed straight to its view (the same ViewSets, filters
+and serializers as a normal request), skipping the middleware, which already
+ran for the batch request itself.
+
+Sub-requests run one after the other on the batch request's database
+connection and share its RelationLoader (core/loaders.py), so an object loaded
+by one sub-request is reused by the next. With ``parallel`` they run on a small
+thread pool instead; each thread then has its own connection and loader, and
+each sub-request runs in a copy of the batch request's context, so replica
+routing and pinning (core/db.py) carry over.
+"""
+
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.db import connections
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from core.loaders import loader_for
+
+MAX_REQUESTS = 25
+WORKERS = 4
+# Only API routes can be batched, and batches don't nest.
+PREFIX = '/api/'
+BATCH_PATH = '/api/batch/'
+
+
+class BatchError(ValueError):
+    """A sub-request can't be run; the message says why."""
+
+
+class SubRequest(HttpRequest):
+    """A GET request for ``path`` made on behalf of the batch request ``parent``."""
+
+    def __init__(self, parent, path):
+        super().__init__()
+        parts = urlsplit(path)
+        self.parent = parent
+        self.method = 'GET'
+        self.path = self.path_info = parts.path
+        self.META = {
+            **parent.META,
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'CONTENT_LENGTH': '',
+        }
+        self.META.pop('CONTENT_TYPE', None)
+        self.GET = QueryDict(parts.query)
+        self.COOKIES = parent.COOKIES
+        for name in ('user', 'session', 'auth'):
+            if hasattr(parent, name):
+                setattr(self, name, getattr(parent, name))
+        # Batches are reads only; there is no form to protect.
+        self._dont_enforce_csrf_checks = True
+
+    def _get_scheme(self):
+        return self.parent._get_scheme()
+
+
+def parse_paths(items):
+    """Return the paths of the sub-requests in a batch body, or raise BatchError."""
+    if not isinstance(items, list) or not items:
+        raise BatchError("Provide a non-empty list of requests.")
+    if len(items) > MAX_REQUESTS:
+        raise BatchError(f"At most {MAX_REQUESTS} requests per batch.")
+    paths = []
+    for item in items:
+        path = item.get('path') if isinstance(item, dict) else item
+        if not isinstance(path, str) or not path.startswith(PREFIX):
+            raise BatchError(f"Requests must be paths starting with {PREFIX}.")
+        if urlsplit(path).path == BATCH_PATH:
+            raise BatchError("Batches can't contain batches.")
+        paths.append(path)
+    return paths
+
+
+def response_body(response):
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(content) if content else None
+    return content.decode(response.charset)
+
+
+def run_one(parent, path, loader=None):
+    """Run the sub-request for ``path``; return its {"path", "status", "body"} entry."""
+    request = SubRequest(parent, path)
+    if loader is not None:
+        request.relation_loader = loader
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return {"path": path, "status": 404, "body": {"detail": "Not found."}}
+    if iscoroutinefunction(match.func):
+        return {"path": path, "status": 400, "body": {"detail": "This route can't be batched."}}
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+    except Http404:
+        return {"path": path, "status": 404, "body": {"detail": "Not found."}}
+    if hasattr(response, 'render'):
+        response.render()
+    return {"path": path, "status": response.status_code, "body": response_body(response)}
+
+
+def run_in_thread(parent, path):
+    try:
+        return run_one(parent, path)
+    finally:
+        # Pool threads open their own connections; don't leak them.
+        connections.close_all()
+
+
+def run_batch(request, paths, parallel=False):
+    """Run GET sub-requests for ``paths`` on behalf of ``request``; return their entries in order."""
+    parent = getattr(request, '_request', request)
+    if not parallel or len(paths) == 1:
+        loader = loader_for({'request': parent})
+        return [run_one(parent, path, loader) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(WORKERS, len(paths))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_in_thread, parent, path) for path in paths
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,410 @@
+"""
+Benchmark suite for the LMS Consolidator.
+
+This file contains the benchmarks run by ``python manage.py benchmark``. Each
+benchmark is a function registered with ``@benchmark`` that returns a dict of
+metric name -> value; the command prints them and can append them to a JSON
+lines file so results can be tracked across commits.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+from core.startup import measure_cold_start
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark function under ``name``."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+@contextmanager
+def benchmark_database():
+    """Run the body against a freshly migrated throwaway database."""
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def best_of(func, repeat):
+    """Return the fastest of ``repeat`` runs of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def seed_catalog(size):
+    """Create ``size`` courses and research groups with professors and students."""
+    from courses.computed import recompute_course_fields
+    from courses.models import Course
+    from phd_students.models import PhDStudent
+    from professors.models import Professor
+    from relations.models import ProfessorCourse
+    from research_groups.models import ResearchGroup
+
+    groups = ResearchGroup.objects.bulk_create(
+        ResearchGroup(name=f"Group {i}", description="Benchmark group") for i in range(size)
+    )
+    professors = Professor.objects.bulk_create(
+        Professor(title="Prof.", name=f"Professor {i}", position="Chair", leads_research_group=groups[i])
+        for i in range(size)
+    )
+    PhDStudent.objects.bulk_create(
+        PhDStudent(name=f"Student {i}", research_group=groups[i % size], supervisor=professors[i % size])
+        for i in range(size * 3)
+    )
+    courses = Course.objects.bulk_create(
+        Course(
+            name=f"Course {i}", description="Benchmark course", code=f"B{i}", credits=i % 10,
+            level=["Master", "Basics", "MBA", ""][i % 4], format="Self-paced",
+        )
+        for i in range(size)
+    )
+    ProfessorCourse.objects.bulk_create(
+        ProfessorCourse(professor=professors[(i + k) % size], course=course)
+        for i, course in enumerate(courses) for k in range(2)
+    )
+    # bulk_create() skips Course.save(), which fills in the derived MOOChub fields.
+    recompute_course_fields(Course.objects.all())
+
+
+@benchmark('compiled_serializers')
+def compiled_serializers(repeat=5, size=1000):
+    """Serialize 1000 MOOChub courses and organizations with DRF and with the compiled serializers."""
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from courses.models import Course
+    from courses.moochub_serializers import CompiledMOOChubCourseSerializer, MOOChubCourseSerializer
+    from research_groups.models import ResearchGroup
+    from research_groups.moochub_serializers import (
+        CompiledMOOChubOrganizationSerializer,
+        MOOChubOrganizationSerializer,
+    )
+
+    cases = [
+        ('course', Course, MOOChubCourseSerializer, CompiledMOOChubCourseSerializer, ['professors']),
+        ('organization', ResearchGroup, MOOChubOrganizationSerializer,
+         CompiledMOOChubOrganizationSerializer, ['lead_professor', 'phd_students']),
+    ]
+    context = {'request': Request(APIRequestFactory().get('/api/moochub/'))}
+    metrics = {}
+    with benchmark_database():
+        seed_catalog(size)
+        for label, model, serializer_class, compiled_class, prefetch in cases:
+            queryset = model.objects.order_by('pk')
+
+            def drf():
+                serializer_class(queryset.prefetch_related(*prefetch), many=True, context=context).data
+
+            def compiled():
+                serializer = compiled_class(context=context)
+                serializer.serialize(serializer.prepare(queryset))
+
+            drf_ms = best_of(drf, repeat) * 1000 / size
+            compiled_ms = best_of(compiled, repeat) * 1000 / size
+            metrics[f'{label}_drf_ms_per_1000'] = round(drf_ms, 1)
+            metrics[f'{label}_compiled_ms_per_1000'] = round(compiled_ms, 1)
+            metrics[f'{label}_speedup'] = round(drf_ms / compiled_ms, 1)
+    return metrics
+
+
+@benchmark('course_fields')
+def course_fields(repeat=5, size=10000):
+    """Recompute the derived MOOChub fields of 10000 courses row by row and with UPDATE ... CASE."""
+    from django.db import transaction
+
+    from courses.computed import recompute_course_fields
+    from courses.models import Course
+
+    with benchmark_database():
+        seed_catalog(size)
+
+        def per_row():
+            with transaction.atomic():
+                for course in Course.objects.all():
+                    course.save(update_fields=[])
+
+        def bulk():
+            recompute_course_fields(Course.objects.all())
+
+        per_row_ms = best_of(per_row, repeat)
+        bulk_ms = best_of(bulk, repeat)
+    return {
+        'per_row_ms': round(per_row_ms, 1),
+        'update_case_ms': round(bulk_ms, 1),
+        'speedup': round(per_row_ms / bulk_ms, 1),
+    }
+
+
+@benchmark('validate_csv')
+def validate_csv(repeat=3, size=100000):
+    """Validate a 100000-row courses file and a 100000-row PhD students file without importing them."""
+    import csv
+    import os
+    import tempfile
+
+    from core.importers import CatalogValidator
+
+    with benchmark_database(), tempfile.TemporaryDirectory() as directory:
+        seed_catalog(100)
+        files = {
+            'courses': (
+                ['name', 'code', 'credits', 'start_date', 'end_date', 'image_url', 'level'],
+                lambda i: [f"Course {i}", f"V{i}", i % 10, f"2024-{i % 12 + 1:02d}-01", "2024-12-31",
+                           f"https://img.example.org/{i}.jpg", "Master"],
+            ),
+            'phd_students': (
+                ['name', 'research_group', 'supervisor', 'enrollment_date'],
+                lambda i: [f"Student V{i}", f"Group {i % 100}", f"Professor {i % 100}", "2023-10-01"],
+            ),
+        }
+        metrics = {}
+        for entity, (header, make_row) in files.items():
+            path = os.path.join(directory, f'{entity}.csv')
+            with open(path, 'w', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(header)
+                writer.writerows(make_row(i) for i in range(size))
+            milliseconds = best_of(lambda: CatalogValidator().validate_file(entity, path), repeat)
+            metrics[f'{entity}_ms'] = round(milliseconds, 1)
+    return metrics
+
+
+@benchmark('autocomplete')
+def autocomplete(repeat=5, size=10000):
+    """Build the typeahead index over 10000 courses, professors and groups and time prefix lookups."""
+    from core.autocomplete import PrefixIndex, load_entries
+
+    queries = ['c', 'cour', 'course 12', 'prof', 'professor 99', 'b4', 'group 5', 'xyz']
+    with benchmark_database():
+        seed_catalog(size)
+        entries = list(load_entries())
+        build_ms = best_of(lambda: PrefixIndex(entries), repeat)
+        index = PrefixIndex(entries)
+
+        def lookups():
+            for query in queries:
+                index.search(query, 10)
+
+        lookup_ms = best_of(lookups, repeat) / len(queries)
+    return {
+        'entries': len(index),
+        'keys': len(index.keys),
+        'build_ms': round(build_ms, 1),
+        'lookup_us': round(lookup_ms * 1000, 1),
+        'memory_mb': round(index.memory_bytes() / 2 ** 20, 2),
+    }
+
+
+@benchmark('catalog_snapshot')
+def catalog_snapshot(repeat=5, size=10000):
+    """Build the catalog snapshot over 10000 of everything and time API pages from it and from the database."""
+    import os
+    import tempfile
+    import tracemalloc
+
+    from django.test import Client, override_settings
+
+    from core import catalog
+    from core.changes import latest_sequence
+
+    urls = ['/api/moochub/courses/?page=50', '/api/courses/?page=50', '/api/moochub/organizations/?page=50', '/courses/7/']
+    client = Client()
+    metrics = {}
+    with benchmark_database(), tempfile.TemporaryDirectory() as root:
+        seed_catalog(size)
+        generation = latest_sequence()
+        metrics['build_ms'] = round(best_of(lambda: catalog.CatalogSnapshot.build(generation), repeat), 1)
+        tracemalloc.start()
+        snapshot = catalog.CatalogSnapshot.build(generation)
+        metrics['memory_mb'] = round(tracemalloc.get_traced_memory()[0] / 2 ** 20, 1)
+        tracemalloc.stop()
+        path = os.path.join(root, 'catalog.bin')
+        snapshot.save(path)
+        metrics['file_mb'] = round(os.path.getsize(path) / 2 ** 20, 1)
+        metrics['open_ms'] = round(best_of(lambda: catalog.CatalogSnapshot.open(path), repeat), 2)
+
+        for label, options in [
+            ('database', {'CATALOG_SNAPSHOT': False}),
+            ('snapshot', {'CATALOG_SNAPSHOT': True, 'CATALOG_SNAPSHOT_PATH': ''}),
+            ('mapped', {'CATALOG_SNAPSHOT': True, 'CATALOG_SNAPSHOT_PATH': root}),
+        ]:
+            catalog._snapshot = None
+            with override_settings(**options):
+                def pages():
+                    for url in urls:
+                        client.get(url)
+
+                pages()
+                # Each request resets connection.queries, so count with a wrapper.
+                queries = []
+                with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+                    pages()
+                metrics[f'{label}_ms_per_page'] = round(best_of(pages, repeat) / len(urls), 2)
+                metrics[f'{label}_queries_per_page'] = len(queries) / len(urls)
+        catalog._snapshot = None
+    return metrics
+
+
+@benchmark('similar_courses')
+def similar_courses(repeat=1, size=10000):
+    """Precompute similar courses for 10000 courses, then incrementally after editing one (timed once each)."""
+    from courses.models import Course
+    from courses.similarity import update_similar_courses
+
+    with benchmark_database():
+        seed_catalog(size)
+        started = time.perf_counter()
+        update_similar_courses()
+        full_ms = (time.perf_counter() - started) * 1000
+        course = Course.objects.order_by('pk')[size // 2]
+        course.description = "Statistics and machine learning for the benchmark"
+        course.save()
+        started = time.perf_counter()
+        updated = update_similar_courses()
+        incremental_ms = (time.perf_counter() - started) * 1000
+    return {
+        'full_ms': round(full_ms, 1),
+        'incremental_ms': round(incremental_ms, 1),
+        'incremental_courses': updated,
+    }
+
+
+@benchmark('course_calendar')
+def course_calendar(repeat=20, size=10000):
+    """Find the courses running in one week among 10000, with the interval tree and with the database."""
+    import datetime
+
+    from django.db.models import Q
+
+    from courses.models import Course
+    from courses.schedule import get_interval_index
+
+    first = datetime.date(2025, 1, 1)
+    with benchmark_database():
+        seed_catalog(size)
+        courses = list(Course.objects.order_by('pk'))
+        for number, course in enumerate(courses):
+            # Spread over two years, a few open-ended.
+            course.start_date = first + datetime.timedelta(days=number * 7 % 730)
+            course.end_date = None if number % 50 == 0 else course.start_date + datetime.timedelta(days=number % 120)
+        Course.objects.bulk_update(courses, ['start_date', 'end_date'], batch_size=500)
+        low, high = datetime.date(2025, 6, 2), datetime.date(2025, 6, 8)
+        started = time.perf_counter()
+        index = get_interval_index()
+        build_ms = (time.perf_counter() - started) * 1000
+        tree_ms = best_of(lambda: index.overlapping(low, high), repeat)
+        active = (Q(start_date__isnull=True) | Q(start_date__lte=high)) & (Q(end_date__isnull=True) | Q(end_date__gte=low))
+        database_ms = best_of(lambda: list(Course.objects.filter(active).values_list('pk', flat=True)), repeat)
+        found = len(index.overlapping(low, high))
+    return {
+        'build_ms': round(build_ms, 1),
+        'tree_ms': round(tree_ms, 3),
+        'database_ms': round(database_ms, 2),
+        'courses_found': found,
+    }
+
+
+@benchmark('collaboration_analytics')
+def collaboration_analytics(repeat=3, size=10000):
+    """Compute the collaboration report for a catalog of 10000 courses and groups."""
+    from core.analytics import compute_report
+
+    with benchmark_database():
+        seed_catalog(size)
+        queries = []
+        with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+            report = compute_report()
+        compute_ms = best_of(compute_report, repeat)
+    return {
+        'compute_ms': round(compute_ms, 1),
+        'queries': len(queries),
+        'professors': report['summary']['professors'],
+        'coteaching_pairs': report['summary']['coteaching_pairs'],
+    }
+
+
+@benchmark('profiling_overhead')
+def profiling_overhead(repeat=20, size=1000):
+    """Time a MOOChub organizations page plain, under continuous 10ms sampling and profiled on demand."""
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+
+    from core import profiling
+
+    url = '/api/moochub/organizations/?page=5'
+    metrics = {}
+    with benchmark_database():
+        seed_catalog(size)
+        anonymous = Client()
+        staff = Client()
+        staff.force_login(User.objects.create_user('benchmark', is_staff=True))
+        anonymous.get(url)
+        metrics['plain_ms'] = round(best_of(lambda: anonymous.get(url), repeat), 2)
+        with override_settings(PROFILING_CONTINUOUS_INTERVAL_MS=10, PROFILING_FLUSH_SECONDS=3600):
+            profiling._sampler = None
+            try:
+                metrics['continuous_ms'] = round(best_of(lambda: anonymous.get(url), repeat), 2)
+            finally:
+                profiling._sampler.stop()
+                profiling._sampler = None
+        # Staff requests also load the session and user.
+        metrics['staff_ms'] = round(best_of(lambda: staff.get(url), repeat), 2)
+        metrics['staff_profiled_ms'] = round(best_of(lambda: staff.get(url, HTTP_X_PROFILE='1'), repeat), 2)
+    return metrics
+
+
+@benchmark('lean_middleware')
+def lean_middleware(repeat=5, size=100):
+    """Time anonymous API requests through the full and the lean middleware stack (200 requests per run)."""
+    from django.test import Client, override_settings
+
+    urls = ['/api/courses/1/', '/api/moochub/courses/?page=2', '/api/autocomplete/?q=cou']
+    client = Client()
+    metrics = {}
+    with benchmark_database():
+        seed_catalog(size)
+        for url in urls:
+            label = url.split('?')[0].strip('/').replace('/', '_')
+            for stack, lean in [('full', False), ('lean', True)]:
+                with override_settings(LEAN_API_MIDDLEWARE=lean):
+                    client.get(url)
+
+                    def requests():
+                        for _ in range(200):
+                            client.get(url)
+
+                    metrics[f'{label}_{stack}_us'] = round(best_of(requests, repeat) * 1000 / 200, 1)
+            metrics[f'{label}_saved_us'] = round(metrics[f'{label}_full_us'] - metrics[f'{label}_lean_us'], 1)
+    return metrics
+
+
+@benchmark('cold_start')
+def cold_start(repeat=5):
+    """Time a worker cold start (settings, apps, WSGI handler and URLconf) in fresh interpreters."""
+    startup = []
+    process = []
+    for _ in range(repeat):
+        startup_seconds, process_seconds, _stderr = measure_cold_start()
+        startup.append(startup_seconds * 1000)
+        process.append(process_seconds * 1000)
+    return {
+        'startup_ms_median': round(statistics.median(startup), 1),
+        'startup_ms_min': round(min(startup), 1),
+        'process_ms_median': round(statistics.median(process), 1),
+    }
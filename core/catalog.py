@@ -0,0 +1,543 @@
+"""
+In-memory snapshot of the public catalog.
+
+This file contains CatalogSnapshot, an immutable copy of every course,
+professor, PhD student and research group plus the links between them, and
+the helpers that let public reads use it instead of the database when
+``settings.CATALOG_SNAPSHOT`` is on. Rows are kept as ``__slots__`` records
+sorted by id (looked up by binary search over an id array); foreign keys are
+arrays of row indexes and to-many relations CSR adjacency arrays (the
+neighbours of row ``i`` are ``targets[offsets[i]:offsets[i + 1]]``).
+
+A snapshot belongs to a catalog generation, the sequence number of the newest
+change log entry (core/changes.py). The generation is checked at most every
+CATALOG_SNAPSHOT_CHECK_SECONDS; when it moved, a new snapshot is built and
+swapped in with a single assignment, so requests never see a half-built one.
+
+With ``settings.CATALOG_SNAPSHOT_PATH`` the snapshot is written to a file
+there and memory-mapped: the arrays are read in place and records decoded on
+access, so all worker processes share one copy through the page cache.
+
+Views get model instances from a SnapshotReader, one per request. Their
+relations (``course.professors.all()``, ``student.supervisor``...) are filled
+in from the snapshot on first access, so templates and serializers run
+unchanged without queries.
+"""
+
+import datetime
+import json
+import mmap
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from core.db import PIN_COOKIE, SAFE_METHODS
+from core.profiling import PROFILE_PARAM
+
+# Snapshot table -> model.
+TABLES = {
+    'courses': 'courses.Course',
+    'professors': 'professors.Professor',
+    'phd_students': 'phd_students.PhDStudent',
+    'research_groups': 'research_groups.ResearchGroup',
+}
+TABLE_FOR_MODEL = {label: table for table, label in TABLES.items()}
+
+# Foreign keys: (table, field) -> target table.
+FOREIGN_KEYS = {
+    ('professors', 'research_group'): 'research_groups',
+    ('professors', 'leads_research_group'): 'research_groups',
+    ('phd_students', 'research_group'): 'research_groups',
+    ('phd_students', 'supervisor'): 'professors',
+}
+# Reverse one-to-ones and foreign keys: (table, accessor) -> the (table, field) pointing back.
+REVERSE_ONE = {
+    ('research_groups', 'main_professor'): ('professors', 'research_group'),
+    ('research_groups', 'lead_professor'): ('professors', 'leads_research_group'),
+}
+REVERSE_MANY = {
+    ('research_groups', 'phd_students'): ('phd_students', 'research_group'),
+    ('professors', 'phd_students'): ('phd_students', 'supervisor'),
+}
+# Many-to-many: (table, accessor) -> (link model, own column, target table, target column).
+LINKS = {
+    ('courses', 'professors'): ('relations.ProfessorCourse', 'course_id', 'professors', 'professor_id'),
+    ('professors', 'courses'): ('relations.ProfessorCourse', 'professor_id', 'courses', 'course_id'),
+    ('courses', 'research_groups'): ('relations.CourseResearch', 'course_id', 'research_groups', 'research_group_id'),
+    ('research_groups', 'courses'): ('relations.CourseResearch', 'research_group_id', 'courses', 'course_id'),
+}
+# (table, accessor) -> target table, for every relation the snapshot answers.
+TO_ONE = {
+    **FOREIGN_KEYS,
+    **{key: source for key, (source, _field) in REVERSE_ONE.items()},
+}
+TO_MANY = {
+    **{key: source for key, (source, _field) in REVERSE_MANY.items()},
+    **{key: target for key, (_label, _own, target, _column) in LINKS.items()},
+}
+
+MAGIC = b'LMSCAT1\n'
+ALIGNMENT = 8
+
+
+class Record:
+    """Immutable row; subclasses declare the fields of one table as ``__slots__``."""
+
+    __slots__ = ()
+
+    def __init__(self, values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("snapshot records are read-only")
+
+    def values(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+
+def record_class(model, fields):
+    return type(f'{model.__name__}Record', (Record,), {'__slots__': tuple(fields)})
+
+
+def csr(groups, size):
+    """Return (offsets, targets) arrays for ``groups``, a {row: [targets]} dict over ``size`` rows."""
+    offsets = array('q', [0])
+    targets = array('q')
+    for row in range(size):
+        targets.extend(groups.get(row, ()))
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class MappedRecords:
+    """Records of one table decoded from a memory-mapped snapshot file on access."""
+
+    def __init__(self, buffer, offsets, record_type, date_fields):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.record_type = record_type
+        self.date_fields = date_fields
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        values = json.loads(bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]]))
+        for position in self.date_fields:
+            if values[position] is not None:
+                values[position] = datetime.date.fromisoformat(values[position])
+        return self.record_type(values)
+
+
+class CatalogSnapshot:
+    """
+    Immutable copy of the catalog graph.
+
+    ``records[table]`` are the rows sorted by id, ``ids[table]`` their ids,
+    ``one[(table, name)]`` the row index of a to-one relation (-1 for none)
+    and ``many[(table, name)]`` (offsets, targets) adjacency arrays.
+    """
+
+    __slots__ = ('generation', 'fields', 'records', 'ids', 'one', 'many', 'mapping')
+
+    def __init__(self, generation, fields, records, ids, one, many, mapping=None):
+        self.generation = generation
+        self.fields = fields
+        self.records = records
+        self.ids = ids
+        self.one = one
+        self.many = many
+        self.mapping = mapping
+
+    @classmethod
+    def build(cls, generation):
+        """Load the catalog with one query per table and link table."""
+        fields, records, ids = {}, {}, {}
+        for table, label in TABLES.items():
+            model = apps.get_model(label)
+            fields[table] = [field.attname for field in model._meta.concrete_fields]
+            record_type = record_class(model, fields[table])
+            rows = model.objects.order_by('pk').values_list(*fields[table])
+            records[table] = tuple(record_type(row) for row in rows.iterator())
+            ids[table] = array('q', (record.id for record in records[table]))
+
+        def index_of(table, pk):
+            return find(ids[table], pk) if pk is not None else -1
+
+        one = {}
+        for (table, field), target in FOREIGN_KEYS.items():
+            one[table, field] = array(
+                'q', (index_of(target, getattr(record, f'{field}_id')) for record in records[table])
+            )
+        for (table, name), (source, field) in REVERSE_ONE.items():
+            reverse = array('q', [-1]) * len(records[table])
+            for row, target in enumerate(one[source, field]):
+                if target >= 0:
+                    reverse[target] = row
+            one[table, name] = reverse
+
+        many = {}
+        for (table, name), (source, field) in REVERSE_MANY.items():
+            groups = {}
+            for row, target in enumerate(one[source, field]):
+                if target >= 0:
+                    groups.setdefault(target, []).append(row)
+            many[table, name] = csr(groups, len(records[table]))
+        for (table, name), (label, own, target_table, column) in LINKS.items():
+            groups = {}
+            links = apps.get_model(label).objects.order_by('pk').values_list(own, column)
+            for own_id, target_id in links.iterator():
+                row, target = index_of(table, own_id), index_of(target_table, target_id)
+                if row >= 0 and target >= 0:
+                    groups.setdefault(row, []).append(target)
+            many[table, name] = csr(groups, len(records[table]))
+        return cls(generation, fields, records, ids, one, many)
+
+    def save(self, path):
+        """Write the snapshot to ``path`` in the memory-mappable format."""
+        from core.snapshots import write_atomic
+
+        sections = []
+        size = 0
+
+        def add(data):
+            nonlocal size
+            data = bytes(data)
+            start = size
+            sections.append(data + b'\0' * (-len(data) % ALIGNMENT))
+            size += len(sections[-1])
+            return [start, len(data)]
+
+        header = {'generation': self.generation, 'tables': {}, 'one': {}, 'many': {}}
+        for table, records in self.records.items():
+            blobs = [json.dumps(record.values(), default=str, separators=(',', ':')).encode() for record in records]
+            offsets = array('q', [0])
+            for blob in blobs:
+                offsets.append(offsets[-1] + len(blob))
+            model = apps.get_model(TABLES[table])
+            header['tables'][table] = {
+                'fields': self.fields[table],
+                'dates': [
+                    position for position, name in enumerate(self.fields[table])
+                    if model._meta.get_field(name).get_internal_type() == 'DateField'
+                ],
+                'ids': add(self.ids[table]),
+                'offsets': add(offsets),
+                'data': add(b''.join(blobs)),
+            }
+        for (table, name), indexes in self.one.items():
+            header['one'][f'{table}.{name}'] = add(indexes)
+        for (table, name), (offsets, targets) in self.many.items():
+            header['many'][f'{table}.{name}'] = [add(offsets), add(targets)]
+
+        encoded = json.dumps(header).encode()
+        prefix = MAGIC + len(encoded).to_bytes(8, 'little') + encoded
+        prefix += b'\0' * (-len(prefix) % ALIGNMENT)
+        write_atomic(path, prefix + b''.join(sections))
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a snapshot written by save()."""
+        with open(path, 'rb') as handle:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        length = int.from_bytes(view[len(MAGIC):len(MAGIC) + 8], 'little')
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(view[start:start + length]))
+        base = start + length + (-(start + length) % ALIGNMENT)
+
+        def section(location, integers=True):
+            offset, size = location
+            data = view[base + offset:base + offset + size]
+            return data.cast('q') if integers else data
+
+        fields, records, ids = {}, {}, {}
+        for table, info in header['tables'].items():
+            fields[table] = info['fields']
+            record_type = record_class(apps.get_model(TABLES[table]), info['fields'])
+            ids[table] = section(info['ids'])
+            records[table] = MappedRecords(
+                section(info['data'], integers=False), section(info['offsets']), record_type, info['dates'],
+            )
+        one = {tuple(key.split('.')): section(location) for key, location in header['one'].items()}
+        many = {
+            tuple(key.split('.')): (section(offsets), section(targets))
+            for key, (offsets, targets) in header['many'].items()
+        }
+        return cls(header['generation'], fields, records, ids, one, many, mapping)
+
+    def index(self, table, pk):
+        return find(self.ids[table], pk)
+
+    def neighbours(self, table, name, index):
+        offsets, targets = self.many[table, name]
+        return targets[offsets[index]:offsets[index + 1]]
+
+
+def find(ids, pk):
+    """Return the index of ``pk`` in the sorted ``ids`` array, or -1."""
+    position = bisect_left(ids, pk)
+    if position < len(ids) and ids[position] == pk:
+        return position
+    return -1
+
+
+class RelatedCache(dict):
+    """
+    Relation cache of a snapshot instance, filled from the snapshot on first access.
+
+    Installed as both ``instance._state.fields_cache`` (to-one relations) and
+    ``instance._prefetched_objects_cache`` (to-many relations), the dicts Django
+    consults before querying a relation.
+    """
+
+    def __init__(self, reader, table, index, instance, relations):
+        super().__init__()
+        self.reader = reader
+        self.table = table
+        self.index = index
+        self.instance = instance
+        self.relations = relations
+        self.resolving = set()
+
+    def __contains__(self, name):
+        # Relations the snapshot answers count as loaded (see core/loaders.py).
+        return super().__contains__(name) or (self.table, name) in self.relations
+
+    def __missing__(self, name):
+        if (self.table, name) not in self.relations or name in self.resolving:
+            raise KeyError(name)
+        if self.relations is TO_ONE:
+            value = self.reader.related_object(self.table, self.index, name)
+        else:
+            # Let the related manager build its (unevaluated) queryset, then fill it.
+            self.resolving.add(name)
+            try:
+                value = getattr(self.instance, name).all()
+            finally:
+                self.resolving.discard(name)
+            value._result_cache = self.reader.related_objects(self.table, self.index, name)
+            value._prefetch_done = True
+        self[name] = value
+        return value
+
+
+class SnapshotReader:
+    """
+    Model instances backed by one snapshot, for the duration of a request.
+
+    Each row is materialized at most once (an identity map), so a professor
+    shared by many courses on a page is one instance.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.instances = {}
+
+    @property
+    def generation(self):
+        return self.snapshot.generation
+
+    def instance(self, table, index):
+        instance = self.instances.get((table, index))
+        if instance is None:
+            record = self.snapshot.records[table][index]
+            model = apps.get_model(TABLES[table])
+            instance = model.from_db(DEFAULT_DB_ALIAS, self.snapshot.fields[table], record.values())
+            instance._state.fields_cache = RelatedCache(self, table, index, instance, TO_ONE)
+            instance._prefetched_objects_cache = RelatedCache(self, table, index, instance, TO_MANY)
+            self.instances[table, index] = instance
+        return instance
+
+    def get(self, table, pk):
+        """Return the instance with primary key ``pk``, or None."""
+        index = self.snapshot.index(table, pk)
+        return self.instance(table, index) if index >= 0 else None
+
+    def list(self, table):
+        return SnapshotList(self, table)
+
+    def related_object(self, table, index, name):
+        target = self.snapshot.one[table, name][index]
+        return self.instance(TO_ONE[table, name], target) if target >= 0 else None
+
+    def related_objects(self, table, index, name):
+        target_table = TO_MANY[table, name]
+        return [self.instance(target_table, target) for target in self.snapshot.neighbours(table, name, index)]
+
+
+class SnapshotList:
+    """
+    All rows of a table in primary key order, as a lazy sequence.
+
+    Stands in for ``Model.objects.order_by('pk')`` wherever views only iterate,
+    count and slice: slicing a page materializes just that page.
+    """
+
+    ordered = True
+
+    def __init__(self, reader, table):
+        self.reader = reader
+        self.table = table
+        self.model = apps.get_model(TABLES[table])
+
+    def __len__(self):
+        return len(self.reader.snapshot.records[self.table])
+
+    def count(self):
+        return len(self)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.reader.instance(self.table, index) for index in range(*item.indices(len(self)))]
+        return self.reader.instance(self.table, range(len(self))[item])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.reader.instance(self.table, index)
+
+
+def snapshot_path(generation):
+    return os.path.join(settings.CATALOG_SNAPSHOT_PATH, f'catalog-{generation}.bin')
+
+
+def load_snapshot(generation):
+    """
+    Return the snapshot of ``generation``.
+
+    Without CATALOG_SNAPSHOT_PATH it is built in memory. Otherwise the worker
+    that first needs a generation writes its file, everyone maps it, and files
+    of older generations are removed (processes still mapping them keep their
+    pages until they swap).
+    """
+    if not settings.CATALOG_SNAPSHOT_PATH:
+        return CatalogSnapshot.build(generation)
+    path = snapshot_path(generation)
+    if not os.path.exists(path):
+        os.makedirs(settings.CATALOG_SNAPSHOT_PATH, exist_ok=True)
+        CatalogSnapshot.build(generation).save(path)
+        for name in os.listdir(settings.CATALOG_SNAPSHOT_PATH):
+            if name.startswith('catalog-') and name.endswith('.bin') and name != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(settings.CATALOG_SNAPSHOT_PATH, name))
+                except FileNotFoundError:
+                    pass
+    try:
+        return CatalogSnapshot.open(path)
+    except FileNotFoundError:
+        # A newer generation replaced the file meanwhile; the next check swaps again.
+        return CatalogSnapshot.build(generation)
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Return the snapshot of the current catalog generation, swapping in a new one if needed."""
+    from core.changes import latest_sequence
+
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _checked_at < settings.CATALOG_SNAPSHOT_CHECK_SECONDS:
+        return snapshot
+    generation = latest_sequence()
+    _checked_at = now
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.generation != generation:
+            _snapshot = load_snapshot(generation)
+        return _snapshot
+
+
+def snapshot_for(request):
+    """
+    Return a SnapshotReader for ``request``, or None if it must read the database.
+
+    Only safe requests of clients not pinned to the primary by a recent write
+    (core/db.py) are served from the snapshot.
+    """
+    if (
+        not settings.CATALOG_SNAPSHOT
+        or request.method not in SAFE_METHODS
+        or PIN_COOKIE in request.COOKIES
+    ):
+        return None
+    return SnapshotReader(get_snapshot())
+
+
+def catalog_list(request, model):
+    """All ``model`` objects for an HTML list view, from the snapshot when enabled."""
+    reader = snapshot_for(request)
+    if reader is None:
+        return model.objects.all()
+    return reader.list(TABLE_FOR_MODEL[model._meta.label])
+
+
+def catalog_object_or_404(request, model, pk):
+    """``get_object_or_404(model, pk=pk)`` for HTML detail views, from the snapshot when enabled."""
+    reader = snapshot_for(request)
+    if reader is None:
+        return get_object_or_404(model, pk=pk)
+    instance = reader.get(TABLE_FOR_MODEL[model._meta.label], int(pk))
+    if instance is None:
+        raise Http404(f"No {model._meta.object_name} matches the given query.")
+    return instance
+
+
+class SnapshotReadsMixin:
+    """
+    Serve unfiltered list pages and object lookups of a DRF view from the snapshot.
+
+    Lists with any query parameter besides ``snapshot_params`` (filters,
+    search, ordering) and all unsafe requests still go to the database.
+    """
+
+    snapshot_params = {'page', 'page_size', 'format', 'meta', PROFILE_PARAM}
+
+    def get_snapshot_reader(self):
+        if not hasattr(self, '_snapshot_reader'):
+            self._snapshot_reader = snapshot_for(self.request)
+        return self._snapshot_reader
+
+    def get_snapshot_table(self):
+        return TABLE_FOR_MODEL[self.get_queryset().model._meta.label]
+
+    def filter_queryset(self, queryset):
+        reader = self.get_snapshot_reader()
+        if (
+            reader is not None
+            and self.action == 'list'
+            and set(self.request.query_params) <= self.snapshot_params
+        ):
+            return reader.list(self.get_snapshot_table())
+        return super().filter_queryset(queryset)
+
+    def get_object(self):
+        reader = self.get_snapshot_reader()
+        if reader is None:
+            return super().get_object()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            pk = int(self.kwargs[lookup_url_kwarg])
+        except ValueError:
+            raise Http404
+        instance = reader.get(self.get_snapshot_table(), pk)
+        if instance is None:
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
@@ -0,0 +1,281 @@
+"""
+Change log of the MOOChub catalog.
+
+This file contains the signal handlers that record a ChangeLogEntry whenever a
+course, professor, PhD student, research group or course link is saved or
+deleted, plus the helpers behind ``/api/moochub/changes/`` and the
+compact_changes command. Entries name the MOOChub collection and id of every
+resource whose representation changed, including resources that only embed
+the changed object (a course lists its instructors, an organization its
+members), so harvesters can sync by re-reading just those resources.
+
+A row that moves (a PhD student to another research group, a professor to
+lead another group) also changes the resource it moved away from, so the
+links a row had before a save are read in ``pre_save`` and recorded too
+(EMBEDDING_KEYS).
+
+Entries are written in the same transaction as the change, so rolled-back
+changes leave no trace. Bulk writes that bypass signals (core/importers.py)
+call ``record_model_changes()`` themselves.
+
+Sequence numbers are handed out when an entry is inserted, not when its
+transaction commits, so on PostgreSQL a harvester can see entry 11 while entry
+10 is still uncommitted; moving its cursor past 11 would skip 10 for good.
+The change feed therefore only serves entries up to the first one younger
+than CHANGE_FEED_COMMIT_LAG_SECONDS (``settled_sequence()``), which assumes
+no transaction writing the change log stays open longer than that. The live
+stream (core/live.py) notifies clients right away and is not a sync cursor.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from django.db.models.signals import post_save, pre_delete, pre_save
+
+from core.live import hub
+from core.models import ChangeLogEntry
+
+
+def record_changes(collection, ids, action=ChangeLogEntry.UPSERT):
+    """
+    Record ``action`` for the resources ``ids`` of ``collection``.
+
+    The entries are published to live clients (core/live.py) once the
+    transaction commits.
+    """
+    entries = ChangeLogEntry.objects.bulk_create(
+        ChangeLogEntry(collection=collection, object_id=pk, action=action)
+        for pk in dict.fromkeys(ids) if pk is not None
+    )
+    events = [
+        {"seq": entry.seq, "collection": collection, "id": entry.object_id, "action": action}
+        for entry in entries if entry.seq is not None
+    ]
+    if events:
+        transaction.on_commit(lambda: hub.publish(events))
+
+
+def latest_sequence():
+    """Return the sequence number of the newest change, or 0."""
+    return ChangeLogEntry.objects.aggregate(latest=Max('seq'))['latest'] or 0
+
+
+def settled_sequence(since=0):
+    """
+    Return the newest sequence number after ``since`` that the change feed may serve.
+
+    That is the entry before the first one recorded within the last
+    CHANGE_FEED_COMMIT_LAG_SECONDS, or the newest entry if all are older.
+    Both are read in one statement, so they come from the same snapshot.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_COMMIT_LAG_SECONDS)
+    found = ChangeLogEntry.objects.filter(seq__gt=since).aggregate(
+        recent=Min('seq', filter=Q(changed_at__gt=cutoff)),
+        latest=Max('seq'),
+    )
+    if found['recent'] is not None:
+        return found['recent'] - 1
+    return found['latest'] or since
+
+
+def course_changed(ids):
+    return [('courses', ids)]
+
+
+def professor_changed(ids):
+    from phd_students.models import PhDStudent
+    from professors.models import Professor
+    from relations.models import ProfessorCourse
+
+    return [
+        ('persons', ids),
+        # Courses list their instructors, students their mentor and
+        # organizations their lead.
+        ('courses', ProfessorCourse.objects.filter(professor_id__in=ids).values_list('course_id', flat=True)),
+        ('students', PhDStudent.objects.filter(supervisor_id__in=ids).values_list('pk', flat=True)),
+        ('organizations', Professor.objects.filter(pk__in=ids).values_list('leads_research_group_id', flat=True)),
+    ]
+
+
+def phd_student_changed(ids):
+    from phd_students.models import PhDStudent
+
+    return [
+        ('students', ids),
+        ('organizations', PhDStudent.objects.filter(pk__in=ids).values_list('research_group_id', flat=True)),
+    ]
+
+
+def research_group_changed(ids):
+    from phd_students.models import PhDStudent
+    from professors.models import Professor
+
+    return [
+        ('organizations', ids),
+        # Professors and students name their group as their affiliation.
+        ('persons', Professor.objects.filter(research_group_id__in=ids).values_list('pk', flat=True)),
+        ('students', PhDStudent.objects.filter(research_group_id__in=ids).values_list('pk', flat=True)),
+    ]
+
+
+def professor_course_changed(ids):
+    from relations.models import ProfessorCourse
+
+    return [('courses', ProfessorCourse.objects.filter(pk__in=ids).values_list('course_id', flat=True))]
+
+
+def course_research_changed(ids):
+    from relations.models import CourseResearch
+
+    return [('courses', CourseResearch.objects.filter(pk__in=ids).values_list('course_id', flat=True))]
+
+
+# Model -> function returning [(collection, ids)] of the resources affected by a
+# change to the given rows. For models published themselves, the first entry
+# is their own collection.
+TRACKED_MODELS = {
+    'courses.Course': course_changed,
+    'professors.Professor': professor_changed,
+    'phd_students.PhDStudent': phd_student_changed,
+    'research_groups.ResearchGroup': research_group_changed,
+    'relations.ProfessorCourse': professor_course_changed,
+    'relations.CourseResearch': course_research_changed,
+}
+PUBLISHED_MODELS = {
+    'courses.Course', 'professors.Professor', 'phd_students.PhDStudent',
+    'research_groups.ResearchGroup',
+}
+# Model -> [(foreign key, collection)] of the resources that embed a row
+# through that key; their values before a change are recorded as well.
+EMBEDDING_KEYS = {
+    'professors.Professor': [('leads_research_group_id', 'organizations')],
+    'phd_students.PhDStudent': [('research_group_id', 'organizations')],
+    'relations.ProfessorCourse': [('course_id', 'courses')],
+    'relations.CourseResearch': [('course_id', 'courses')],
+}
+
+
+def current_links(model, ids):
+    """Return [(collection, ids)] of the resources the stored rows ``ids`` of ``model`` are embedded in."""
+    keys = EMBEDDING_KEYS.get(model._meta.label)
+    if not keys or not ids:
+        return []
+    rows = list(model._default_manager.filter(pk__in=ids).values_list(*(field for field, _collection in keys)))
+    return [(collection, [row[index] for row in rows]) for index, (_field, collection) in enumerate(keys)]
+
+
+def record_model_changes(model, ids, deleted=False, previous=()):
+    """
+    Record changes to the rows ``ids`` of ``model`` and to every resource embedding them.
+
+    With ``deleted``, the rows' own resources get tombstones; call this before
+    the rows are deleted so their links can still be followed. ``previous`` is
+    ``current_links()`` as read before the rows were updated.
+    """
+    label = model._meta.label
+    affected = TRACKED_MODELS[label](list(ids))
+    if deleted and label in PUBLISHED_MODELS:
+        collection, ids = affected.pop(0)
+        record_changes(collection, ids, ChangeLogEntry.DELETE)
+    changed = {}
+    for collection, ids in [*affected, *previous]:
+        changed.setdefault(collection, []).extend(ids)
+    for collection, ids in changed.items():
+        record_changes(collection, ids)
+
+
+def handle_pre_save(sender, instance, raw=False, **kwargs):
+    if not raw and not instance._state.adding and instance.pk is not None:
+        instance._changelog_previous = current_links(sender, [instance.pk])
+
+
+def handle_save(sender, instance, **kwargs):
+    record_model_changes(sender, [instance.pk], previous=instance.__dict__.pop('_changelog_previous', ()))
+
+
+def handle_delete(sender, instance, **kwargs):
+    # Runs before the delete so that links removed by cascades or SET_NULL are
+    # still there to tell which resources embedded the instance.
+    record_model_changes(sender, [instance.pk], deleted=True)
+
+
+def connect_signals():
+    """Connect the change log to the tracked models; called from CoreConfig.ready()."""
+    from django.apps import apps
+
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        if label in EMBEDDING_KEYS:
+            pre_save.connect(handle_pre_save, sender=model, dispatch_uid=f'changelog-pre-save-{label}')
+        post_save.connect(handle_save, sender=model, dispatch_uid=f'changelog-save-{label}')
+        pre_delete.connect(handle_delete, sender=model, dispatch_uid=f'changelog-delete-{label}')
+
+
+def compact_changes():
+    """
+    Delete entries superseded by a later entry for the same resource.
+
+    Harvesters only need the newest entry per resource, so this keeps the log
+    at no more than one entry per resource ever published. Returns the number
+    of entries deleted.
+    """
+    newest = (
+        ChangeLogEntry.objects.values('collection', 'object_id')
+        .annotate(newest=Max('seq'))
+        .values('newest')
+    )
+    deleted, _by_model = ChangeLogEntry.objects.exclude(seq__in=newest).delete()
+    return deleted
+
+
+def iter_changes(since, until, limit, request, batch_size=500):
+    """
+    Yield MOOChub change records with ``since < seq <= until`` in sequence order.
+
+    Each record is {"seq", "collection", "id", "action"}, plus the resource's
+    current MOOChub representation for upserts. Resources are loaded per batch
+    with one query per collection; an upsert for a resource that no longer
+    exists is reported as a delete. Within a batch, only the newest entry per
+    resource is sent.
+    """
+    from core.moochub import get_collection_view, serialize_resources
+
+    views = {}
+    remaining = limit
+    while remaining > 0:
+        entries = list(
+            ChangeLogEntry.objects.filter(seq__gt=since, seq__lte=until)
+            .order_by('seq')
+            .values_list('seq', 'collection', 'object_id', 'action')[:min(batch_size, remaining)]
+        )
+        if not entries:
+            return
+        since = entries[-1][0]
+        remaining -= len(entries)
+
+        newest = {(collection, pk): seq for seq, collection, pk, _action in entries}
+        wanted = {}
+        for seq, collection, pk, action in entries:
+            if action == ChangeLogEntry.UPSERT and newest[collection, pk] == seq:
+                wanted.setdefault(collection, []).append(pk)
+        resources = {}
+        for collection, ids in wanted.items():
+            if collection not in views:
+                views[collection] = get_collection_view(collection, request)
+            view = views[collection]
+            for data in serialize_resources(view, view.get_queryset().filter(pk__in=ids)):
+                resources[collection, data['id']] = data
+
+        for seq, collection, pk, action in entries:
+            if newest[collection, pk] != seq:
+                continue
+            record = {"seq": seq, "collection": collection, "id": pk, "action": action}
+            if action == ChangeLogEntry.UPSERT:
+                if (collection, pk) in resources:
+                    record["resource"] = resources[collection, pk]
+                else:
+                    record["action"] = ChangeLogEntry.DELETE
+            yield record
@@ -0,0 +1,144 @@
+"""
+Compiled read-only serializers for read-heavy list endpoints.
+
+This file contains CompiledSerializer, a fast path for DRF ModelSerializers that
+are only ever used for output. The serializer's field list is compiled once
+into a list of plain functions that work on ``values()`` rows and on relation
+maps prefetched for the whole page, so a page costs one query per relation and
+no model instances, bound fields or ``get_attribute()`` calls. The output is the
+same as the original serializer's; each app's tests assert that.
+"""
+
+from django.urls import reverse
+from rest_framework import serializers
+
+# Stand-in primary key used to turn a reversed URL into a template.
+PK_SENTINEL = 918273645
+
+
+class Row(dict):
+    """
+    A ``values()`` row that also supports attribute access.
+
+    This lets the original ``get_<field>`` methods run unchanged on rows, as long
+    as they only read plain column values (``obj.level``, ``obj.pk``...).
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def compile_reverse(viewname, request=None):
+    """
+    Return a function pk -> URL equivalent to ``reverse(viewname, kwargs={'pk': pk})``.
+
+    The URL is reversed once with a sentinel pk and split around it, so building a
+    URL per row is a string concatenation. With a request, URLs are absolute.
+    """
+    url = reverse(viewname, kwargs={'pk': PK_SENTINEL})
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    head, tail = url.split(str(PK_SENTINEL), 1)
+    return lambda pk: f"{head}{pk}{tail}"
+
+
+class CompiledSerializer:
+    """
+    Base class for compiled, read-only versions of a ModelSerializer.
+
+    Subclasses set:
+
+    - ``serializer_class``: the serializer whose output is reproduced.
+    - ``row_fields``: the model fields loaded with ``values()``.
+    - ``constant_fields``: SerializerMethodFields whose method ignores ``obj``;
+      they are evaluated once at compile time.
+    - ``relation_fields``: {field name: method name} for fields computed from
+      relation maps. The method takes (row, relations), where ``relations`` is
+      what ``load_relations()`` returned for the page.
+
+    All other SerializerMethodFields call the original method with a Row.
+    """
+
+    serializer_class = None
+    row_fields = ()
+    constant_fields = ()
+    relation_fields = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.serializer = self.serializer_class(context=self.context)
+        self.plan = self.bind(self.get_field_specs())
+
+    @classmethod
+    def get_field_specs(cls):
+        """
+        Return the compiled field list, computed once per class.
+
+        Each entry is (output name, kind, argument) where kind is 'constant',
+        'relation', 'method' or 'column'.
+        """
+        if '_field_specs' not in cls.__dict__:
+            serializer = cls.serializer_class()
+            specs = []
+            for name, field in serializer.fields.items():
+                if field.write_only:
+                    continue
+                if name in cls.constant_fields:
+                    specs.append((name, 'constant', getattr(serializer, field.method_name)(None)))
+                elif name in cls.relation_fields:
+                    specs.append((name, 'relation', cls.relation_fields[name]))
+                elif isinstance(field, serializers.SerializerMethodField):
+                    specs.append((name, 'method', field.method_name))
+                else:
+                    specs.append((name, 'column', (field.source, field.to_representation)))
+            cls._field_specs = specs
+        return cls._field_specs
+
+    def bind(self, specs):
+        """Turn field specs into [(output name, function(row, relations))] for this context."""
+        plan = []
+        for name, kind, argument in specs:
+            if kind == 'constant':
+                plan.append((name, self._constant(argument)))
+            elif kind == 'relation':
+                plan.append((name, getattr(self, argument)))
+            elif kind == 'method':
+                plan.append((name, self._method(getattr(self.serializer, argument))))
+            else:
+                plan.append((name, self._column(*argument)))
+        return plan
+
+    @staticmethod
+    def _constant(value):
+        return lambda row, relations: value
+
+    @staticmethod
+    def _method(method):
+        return lambda row, relations: method(row)
+
+    @staticmethod
+    def _column(source, to_representation):
+        def column(row, relations):
+            value = row[source]
+            return None if value is None else to_representation(value)
+        return column
+
+    def prepare(self, queryset):
+        """Return ``queryset`` as Row objects holding ``row_fields``."""
+        return queryset.values(*self.row_fields)
+
+    def load_relations(self, rows):
+        """Prefetch whatever the relation fields need for ``rows``; override as needed."""
+        return None
+
+    def serialize(self, rows):
+        """Serialize a page of rows from ``prepare()`` into a list of dicts."""
+        rows = [Row(row, pk=row['id']) for row in rows]
+        relations = self.load_relations(rows)
+        plan = self.plan
+        return [{name: func(row, relations) for name, func in plan} for row in rows]
@@ -0,0 +1,144 @@
+"""
+Database routing for read replicas and read-only deployments.
+
+This file contains ReplicaRouter, which sends catalog reads made inside
+``replica_reads()`` to the database alias named by ``settings.REPLICA_DATABASE``
+(for example a periodically refreshed copy of the SQLite database, or a
+Postgres streaming replica). Public read paths opt in: MOOChub viewsets
+through ReplicaReadsMixin, HTML views through ``@reads_from_replica``.
+Everything else, including admin pages, CSV imports and all writes, keeps
+using ``default``.
+
+Clients that just wrote something are pinned to ``default`` for
+REPLICA_PIN_SECONDS by a cookie (ReadYourWritesMiddleware), so admins see
+their own edits on the public pages even while the replica lags behind.
+
+With ``settings.READ_ONLY_MODE`` the write routes are switched off: the admin
+is not mounted and the REST ViewSets only accept safe methods.
+"""
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.exceptions import MethodNotAllowed
+
+# Apps whose reads may be served by the replica; auth, sessions and admin
+# always read from default.
+REPLICA_APPS = {'core', 'courses', 'professors', 'phd_students', 'research_groups', 'relations'}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'replica_pin'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_enabled_for(request):
+    """Return whether ``request`` may read from the replica."""
+    return bool(
+        settings.REPLICA_DATABASE
+        and request.method in SAFE_METHODS
+        and PIN_COOKIE not in request.COOKIES
+    )
+
+
+@contextmanager
+def replica_reads(request):
+    """Route catalog reads made inside the block to the replica, if ``request`` allows it."""
+    token = _use_replica.set(replica_enabled_for(request))
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def reads_from_replica(view):
+    """Decorator for function views that only read public catalog data."""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(request):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadsMixin:
+    """Serve the view's reads from the replica (see reads_from_replica)."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads(request):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReadOnlyModeMixin:
+    """Refuse unsafe methods on a DRF view when ``settings.READ_ONLY_MODE`` is on."""
+
+    @property
+    def allowed_methods(self):
+        methods = super().allowed_methods
+        if settings.READ_ONLY_MODE:
+            return [method for method in methods if method in SAFE_METHODS]
+        return methods
+
+    def initial(self, request, *args, **kwargs):
+        if settings.READ_ONLY_MODE and request.method not in SAFE_METHODS:
+            raise MethodNotAllowed(request.method)
+        super().initial(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    """Send catalog reads to the replica inside ``replica_reads()``; everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and model._meta.app_label in REPLICA_APPS:
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica rows are copies of default rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return db != settings.REPLICA_DATABASE if settings.REPLICA_DATABASE else None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin clients that made a successful write to the default database for a while.
+
+    Sets a short-lived cookie, so it works before sessions or authentication
+    are even loaded. Only active when a replica or the catalog snapshot
+    (core/catalog.py) is configured, both of which can lag behind writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.pin(request, await self.get_response(request))
+
+    def pin(self, request, response):
+        if (
+            (settings.REPLICA_DATABASE or settings.CATALOG_SNAPSHOT)
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,184 @@
+"""
+Facet counts for the API list views.
+
+This file contains FacetedListMixin, which adds ``?facets=level,format`` to a
+ViewSet's list action: the response then carries, next to the usual page,
+``facets`` with the number of matching rows per value of each facet, counted
+over the whole filtered result (not just the page). Facets are declared in a
+``facet_spec`` dict on the view, like ``filter_spec`` (core/filters.py)::
+
+    facet_spec = {
+        'level': FieldFacet('level'),
+        'credits': BucketFacet('credits', [('0-2', None, 3), ('3+', 3, None)]),
+        'professor': RelationFacet(ProfessorCourse, 'course', 'professor', label=('title', 'name')),
+    }
+
+Every facet is one statement: a GROUP BY over the filtered queryset (or the
+through table, restricted to it), or conditional aggregation for buckets.
+Counts are cached per filter combination and catalog generation, the sequence
+number of the newest change log entry (core/changes.py), so they never
+outlive a change.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+from rest_framework.exceptions import ValidationError
+
+from core.profiling import PROFILE_PARAM
+
+FACETS_PARAM = 'facets'
+# Values returned per facet, most frequent first.
+MAX_VALUES = 50
+CACHE_SECONDS = 3600
+# Parameters that don't change which rows match.
+IGNORED_PARAMS = {'page', 'page_size', 'ordering', 'format', FACETS_PARAM, PROFILE_PARAM}
+
+
+def ranked(counts):
+    counts.sort(key=lambda entry: (-entry['count'], str(entry['value'])))
+    return counts[:MAX_VALUES]
+
+
+def labelled(rows, value_field, label_fields):
+    counts = []
+    for row in rows:
+        entry = {'value': row[value_field], 'count': row['count']}
+        if label_fields:
+            entry['label'] = ' '.join(
+                str(row[name]) for name in label_fields if row[name] not in (None, '')
+            ) or None
+        counts.append(entry)
+    return counts
+
+
+class FieldFacet:
+    """
+    Count rows per value of a field.
+
+    For foreign keys, ``label`` names fields of the related model shown next
+    to each id; they are joined into the same GROUP BY.
+    """
+
+    def __init__(self, field_name, label=()):
+        self.field_name = field_name
+        self.label = [f'{field_name}__{name}' for name in label]
+
+    def count(self, queryset):
+        rows = queryset.order_by().values(self.field_name, *self.label).annotate(count=Count('pk'))
+        return ranked(labelled(rows, self.field_name, self.label))
+
+
+class YearFacet:
+    """Count rows per year of a date field."""
+
+    def __init__(self, field_name):
+        self.field_name = field_name
+
+    def count(self, queryset):
+        rows = queryset.order_by().values(year=ExtractYear(self.field_name)).annotate(count=Count('pk'))
+        return ranked([{'value': row['year'], 'count': row['count']} for row in rows])
+
+
+class BucketFacet:
+    """
+    Count rows per range of a numeric field, with conditional aggregation.
+
+    ``buckets`` are (label, low, high) with ``low`` inclusive and ``high``
+    exclusive, either open when None. Rows without a value count as None.
+    """
+
+    def __init__(self, field_name, buckets):
+        self.field_name = field_name
+        self.buckets = buckets
+
+    def count(self, queryset):
+        aggregates = {}
+        for number, (_label, low, high) in enumerate(self.buckets):
+            condition = Q(**{f'{self.field_name}__isnull': False})
+            if low is not None:
+                condition &= Q(**{f'{self.field_name}__gte': low})
+            if high is not None:
+                condition &= Q(**{f'{self.field_name}__lt': high})
+            aggregates[f'bucket_{number}'] = Count('pk', filter=condition)
+        aggregates['missing'] = Count('pk', filter=Q(**{f'{self.field_name}__isnull': True}))
+        totals = queryset.order_by().aggregate(**aggregates)
+        counts = [
+            {'value': label, 'count': totals[f'bucket_{number}']}
+            for number, (label, _low, _high) in enumerate(self.buckets)
+        ]
+        counts.append({'value': None, 'count': totals['missing']})
+        return [entry for entry in counts if entry['count']]
+
+
+class RelationFacet:
+    """
+    Count rows per object linked through a through table.
+
+    ``through``, ``outer_field`` and ``target_field`` are as for RelationFilter
+    (core/filters.py); the filtered queryset becomes an ``IN`` subquery.
+    """
+
+    def __init__(self, through, outer_field, target_field, label=()):
+        self.through = through
+        self.outer_field = outer_field
+        self.target_field = target_field
+        self.label = [f'{target_field}__{name}' for name in label]
+
+    def count(self, queryset):
+        links = self.through.objects.filter(**{f'{self.outer_field}__in': queryset.order_by().values('pk')})
+        rows = links.order_by().values(self.target_field, *self.label).annotate(count=Count(self.outer_field))
+        return ranked(labelled(rows, self.target_field, self.label))
+
+
+class FacetedListMixin:
+    """
+    Add the facets named in ``?facets=`` to a ViewSet's list responses.
+
+    ``facets=all`` asks for every facet in ``facet_spec``.
+    """
+
+    facet_spec = {}
+
+    def get_facet_names(self):
+        raw = self.request.query_params.get(FACETS_PARAM)
+        if not raw:
+            return []
+        if raw == 'all':
+            return list(self.facet_spec)
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.facet_spec]
+        if unknown:
+            raise ValidationError({FACETS_PARAM: f"Unknown facets: {', '.join(unknown)}. "
+                                                 f"Choose from {', '.join(self.facet_spec)}."})
+        return names
+
+    def get_facets(self, names):
+        from core.changes import latest_sequence
+
+        params = sorted(
+            (param, value) for param, values in self.request.query_params.lists()
+            if param not in IGNORED_PARAMS for value in values
+        )
+        digest = hashlib.sha1(repr(params).encode()).hexdigest()
+        prefix = f"facets:{self.get_queryset().model._meta.label_lower}:{latest_sequence()}:{digest}"
+        keys = {name: f"{prefix}:{name}" for name in names}
+        facets = cache.get_many(keys.values())
+        missing = [name for name in names if keys[name] not in facets]
+        if missing:
+            queryset = self.filter_queryset(self.get_queryset())
+            computed = {keys[name]: self.facet_spec[name].count(queryset) for name in missing}
+            cache.set_many(computed, CACHE_SECONDS)
+            facets.update(computed)
+        return {name: facets[keys[name]] for name in names}
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_facet_names()
+        response = super().list(request, *args, **kwargs)
+        if names:
+            if not isinstance(response.data, dict):
+                response.data = {'results': response.data}
+            response.data[FACETS_PARAM] = self.get_facets(names)
+        return response
@@ -0,0 +1,153 @@
+"""
+Declarative query-parameter filtering for the API ViewSets.
+
+This file contains DeclarativeFilterBackend, a DRF filter backend driven by a
+``filter_spec`` dict on the view. Each entry maps a query parameter to a filter
+and the lookups it allows, e.g.::
+
+    filter_spec = {
+        'level': FieldFilter('level', lookups=['exact', 'in']),
+        'start_date': FieldFilter('start_date', lookups=RANGE_LOOKUPS),
+        'professor': RelationFilter(ProfessorCourse, 'course', 'professor'),
+        'active': IntervalFilter('start_date', 'end_date'),
+    }
+
+which accepts ``?level__in=Master,MBA&start_date__gte=2025-04-01&professor=3``
+or ``?active__on=2025-05-01``. Relation filters compile to ``EXISTS``
+subqueries on the through table, so they never duplicate rows the way a join
+would.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+RANGE_LOOKUPS = ['exact', 'gte', 'lte', 'gt', 'lt', 'isnull']
+CHOICE_LOOKUPS = ['exact', 'in']
+
+
+def parse_boolean(raw):
+    value = raw.strip().lower()
+    if value in ('1', 'true', 'yes'):
+        return True
+    if value in ('0', 'false', 'no'):
+        return False
+    raise DjangoValidationError(f"'{raw}' is not a boolean.")
+
+
+class FieldFilter:
+    """Filter on a model field (or foreign key column) with the given lookups."""
+
+    def __init__(self, field_name, lookups=('exact',)):
+        self.field_name = field_name
+        self.lookups = list(lookups)
+
+    def to_python(self, model, raw):
+        return model._meta.get_field(self.field_name).to_python(raw.strip())
+
+    def build(self, model, lookup, raw):
+        """Return the Q object for ``?<param>__<lookup>=<raw>``."""
+        if lookup == 'isnull':
+            return Q(**{f'{self.field_name}__isnull': parse_boolean(raw)})
+        if lookup == 'in':
+            values = [self.to_python(model, part) for part in raw.split(',') if part.strip()]
+            return Q(**{f'{self.field_name}__in': values})
+        return Q(**{f'{self.field_name}__{lookup}': self.to_python(model, raw)})
+
+
+class RelationFilter:
+    """
+    Filter on rows linked through a through table, as an EXISTS subquery.
+
+    ``through`` is the link model, ``outer_field`` its foreign key to the filtered
+    model and ``target_field`` its foreign key to the related model, whose ids
+    are given in the query parameter.
+    """
+
+    lookups = ['exact', 'in']
+
+    def __init__(self, through, outer_field, target_field):
+        self.through = through
+        self.outer_field = outer_field
+        self.target_field = target_field
+
+    def build(self, model, lookup, raw):
+        target = self.through._meta.get_field(self.target_field).target_field
+        parts = raw.split(',') if lookup == 'in' else [raw]
+        ids = [target.to_python(part.strip()) for part in parts if part.strip()]
+        links = self.through.objects.filter(**{
+            self.outer_field: OuterRef('pk'),
+            f'{self.target_field}__in': ids,
+        })
+        return Q(Exists(links))
+
+
+class IntervalFilter:
+    """
+    Filter on rows whose [start, end] date range includes a day or overlaps a range.
+
+    ``?<param>__on=<day>`` and ``?<param>__overlaps=<from>,<to>``; both ends
+    are inclusive, and a row without a start or end counts as open-ended on
+    that side. A row whose end comes before its start covers the days between
+    the two, as in courses/schedule.py.
+    """
+
+    lookups = ['on', 'overlaps']
+
+    def __init__(self, start_field, end_field):
+        self.start_field = start_field
+        self.end_field = end_field
+
+    def build(self, model, lookup, raw):
+        field = model._meta.get_field(self.start_field)
+        if lookup == 'on':
+            low = high = field.to_python(raw.strip())
+        else:
+            parts = [part.strip() for part in raw.split(',')]
+            if len(parts) != 2:
+                raise DjangoValidationError(f"'{raw}' is not a range; use <from>,<to>.")
+            low, high = (field.to_python(part) if part else None for part in parts)
+        start, end = self.start_field, self.end_field
+        # Comparing both fields on each side also covers inverted ranges; for
+        # ordered ones the extra comparison never adds a row.
+        condition = Q()
+        if high is not None:
+            condition &= Q(**{f'{start}__isnull': True}) | Q(**{f'{start}__lte': high}) | Q(**{f'{end}__lte': high})
+        if low is not None:
+            condition &= Q(**{f'{end}__isnull': True}) | Q(**{f'{end}__gte': low}) | Q(**{f'{start}__gte': low})
+        return condition
+
+
+class DeclarativeFilterBackend(BaseFilterBackend):
+    """
+    Apply the filters declared in the view's ``filter_spec``.
+
+    Parameters use Django's ``name__lookup`` syntax; a bare name means ``exact``.
+    Unknown parameters are ignored so they can be used by other backends
+    (search, ordering, pagination); invalid values raise a 400 error.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        spec = getattr(view, 'filter_spec', None)
+        if not spec:
+            return queryset
+
+        conditions = []
+        errors = {}
+        for param, values in request.query_params.lists():
+            name, _, lookup = param.partition('__')
+            lookup = lookup or 'exact'
+            filter_ = spec.get(name)
+            if filter_ is None or lookup not in filter_.lookups:
+                continue
+            for raw in values:
+                try:
+                    conditions.append(filter_.build(queryset.model, lookup, raw))
+                except DjangoValidationError as exc:
+                    errors.setdefault(param, []).extend(exc.messages)
+        if errors:
+            raise ValidationError(errors)
+        for condition in conditions:
+            queryset = queryset.filter(condition)
+        return queryset
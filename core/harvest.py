@@ -0,0 +1,331 @@
+"""
+Harvesting of partner LMS catalogs.
+
+This file contains the Harvester behind ``manage.py harvest``, which pulls the
+MOOChub feeds of every enabled HarvestSource (core/models.py) into the catalog;
+run it from cron to keep partners in sync. Sources are fetched concurrently on
+a thread pool and stored as soon as each one is complete, so a slow or failing
+partner only delays itself.
+
+Pages are fetched with conditional requests (If-None-Match and
+If-Modified-Since) and ``links.next`` is followed to the end of the feed.
+Persons become professors and courses become courses, written through the bulk
+upsert path of core/importers.py, so values are validated like CSV columns and
+existing rows are matched by natural key. Course instructors are linked to
+professors by name (fuzzy, see core/matching.py) once every source is stored.
+
+Resources removed from a partner's feed are not deleted here.
+"""
+
+import gzip
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+from core.importers import CatalogImporter, ImportResult, parse_chunk
+from core.models import HarvestSource
+from courses.computed import COURSE_MODES
+
+USER_AGENT = 'lms-consolidator-harvester'
+ACCEPT = 'application/vnd.api+json, application/json;q=0.9'
+# Seconds allowed for one HTTP request and for all pages of one source.
+REQUEST_TIMEOUT = 20
+SOURCE_TIMEOUT = 300
+MAX_PAGES = 1000
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+
+# MOOChub resource type -> importer entity; JSON:API collection names included.
+RESOURCE_ENTITIES = {
+    'course': 'courses',
+    'courses': 'courses',
+    'person': 'professors',
+    'persons': 'professors',
+}
+# Entities in the order they are written.
+HARVESTED_ENTITIES = ('professors', 'courses')
+FORMATS_BY_MODE = {mode: format.capitalize() for format, mode in COURSE_MODES.items()}
+
+
+class HarvestError(Exception):
+    """A source could not be fetched; the message says which page and why."""
+
+
+class Feed:
+    """The resources fetched from one source and the page validators to keep."""
+
+    def __init__(self):
+        self.resources = []
+        self.validators = {}
+        self.pages = 0
+        self.unchanged = 0
+
+
+class HarvestResult:
+    """Outcome of harvesting one source."""
+
+    def __init__(self, source):
+        self.source = source
+        self.status = HarvestSource.OK
+        self.pages = 0
+        self.unchanged = 0
+        self.created = 0
+        self.updated = 0
+        self.links = 0
+        self.errors = []
+        self.error = ''
+
+
+def fetch_page(url, validators, timeout):
+    """
+    Fetch one page of a feed.
+
+    Returns (document, validators), or (None, ``validators``) if the server
+    answered 304 Not Modified.
+    """
+    headers = {'User-Agent': USER_AGENT, 'Accept': ACCEPT, 'Accept-Encoding': 'gzip'}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read(MAX_PAGE_BYTES + 1)
+            response_headers = response.headers
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return None, validators
+        raise HarvestError(f"{url}: HTTP {exc.code}")
+    except (urllib.error.URLError, OSError) as exc:
+        raise HarvestError(f"{url}: {getattr(exc, 'reason', exc)}")
+    if len(data) > MAX_PAGE_BYTES:
+        raise HarvestError(f"{url}: page is larger than {MAX_PAGE_BYTES} bytes")
+    try:
+        if response_headers.get('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        document = json.loads(data)
+    except (OSError, ValueError):
+        raise HarvestError(f"{url}: not a JSON document")
+    return document, {
+        'etag': response_headers.get('ETag', ''),
+        'last_modified': response_headers.get('Last-Modified', ''),
+    }
+
+
+def fetch_feed(url, validators, request_timeout=REQUEST_TIMEOUT, source_timeout=SOURCE_TIMEOUT, max_pages=MAX_PAGES):
+    """
+    Fetch every page of the feed starting at ``url``; runs on worker threads.
+
+    ``validators`` are those kept from the last harvest. Unchanged pages
+    contribute no resources; their stored next link is followed instead.
+    """
+    feed = Feed()
+    deadline = time.monotonic() + source_timeout
+    seen = set()
+    while url and url not in seen:
+        if len(seen) >= max_pages:
+            raise HarvestError(f"{url}: more than {max_pages} pages")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HarvestError(f"{url}: timed out after {len(seen)} pages")
+        seen.add(url)
+        cached = validators.get(url, {})
+        document, page_validators = fetch_page(url, cached, min(request_timeout, remaining))
+        if document is None:
+            feed.unchanged += 1
+            feed.validators[url] = cached
+            url = cached.get('next')
+            continue
+
+        data = document.get('data') if isinstance(document, dict) else None
+        if not isinstance(data, list):
+            raise HarvestError(f"{url}: document has no data list")
+        feed.resources.extend(data)
+        feed.pages += 1
+        next_url = (document.get('links') or {}).get('next')
+        next_url = urljoin(url, next_url) if next_url else None
+        feed.validators[url] = dict(page_validators, next=next_url)
+        url = next_url
+    return feed
+
+
+def first(value):
+    """MOOChub wraps many values in lists; return the first one."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def text(value):
+    value = first(value)
+    return '' if value is None or isinstance(value, dict) else str(value).strip()
+
+
+def date_text(value):
+    # Date-times keep only their date.
+    return text(value)[:10]
+
+
+def image_text(value):
+    value = first(value)
+    if isinstance(value, dict):
+        value = value.get('contentUrl')
+    return text(value)
+
+
+def course_row(attributes):
+    return {
+        'name': text(attributes.get('name')),
+        'description': text(attributes.get('description')),
+        'image_url': image_text(attributes.get('image')),
+        'credits': text(attributes.get('credits')),
+        'code': text(attributes.get('courseCode')),
+        'start_date': date_text(attributes.get('startDate')),
+        'end_date': date_text(attributes.get('endDate')),
+        'format': FORMATS_BY_MODE.get(text(attributes.get('courseMode')), ''),
+        'level': text(attributes.get('level')),
+    }
+
+
+def person_row(attributes):
+    return {
+        'name': text(attributes.get('name')),
+        'title': text(attributes.get('honorificPrefix')),
+        'position': text(attributes.get('jobTitle')),
+        'bio': text(attributes.get('description')),
+        'image_url': image_text(attributes.get('image')),
+    }
+
+
+ROW_MAPPERS = {'courses': course_row, 'professors': person_row}
+
+
+def map_resources(resources):
+    """
+    Turn MOOChub resources into importer CSV rows.
+
+    Returns ({entity: [row, ...]}, [professor_courses row, ...], errors).
+    JSON:API resources keep their fields under ``attributes``; flat resources
+    (like this project's own feed) are read as they are.
+    """
+    rows = {entity: [] for entity in HARVESTED_ENTITIES}
+    links = []
+    errors = []
+    for number, resource in enumerate(resources, start=1):
+        if not isinstance(resource, dict):
+            errors.append((number, "resource is not an object"))
+            continue
+        attributes = resource.get('attributes') or resource
+        kind = text(attributes.get('type') or resource.get('type')).lower()
+        entity = RESOURCE_ENTITIES.get(kind)
+        if entity is None:
+            errors.append((number, f"unsupported resource type '{kind}'"))
+            continue
+        row = ROW_MAPPERS[entity](attributes)
+        rows[entity].append(row)
+        if entity == 'courses':
+            instructors = attributes.get('instructor') or []
+            for instructor in instructors if isinstance(instructors, list) else [instructors]:
+                name = text(instructor.get('name')) if isinstance(instructor, dict) else text(instructor)
+                if name:
+                    links.append({'professor': name, 'course': row['code'] or row['name']})
+    return rows, links, errors
+
+
+class Harvester:
+    """
+    Harvest HarvestSources into the catalog.
+
+    Feeds are fetched on ``workers`` threads; everything touching the database
+    runs in the calling thread.
+    """
+
+    def __init__(self, workers=8, request_timeout=REQUEST_TIMEOUT, source_timeout=SOURCE_TIMEOUT, full=False):
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.source_timeout = source_timeout
+        self.full = full
+        self.importer = CatalogImporter(workers=1)
+
+    def harvest(self, sources):
+        """Harvest ``sources`` and return a HarvestResult per source, in completion order."""
+        results = []
+        pending_links = []
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            futures = {
+                executor.submit(
+                    fetch_feed, source.url, {} if self.full else source.validators,
+                    self.request_timeout, self.source_timeout,
+                ): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                result = HarvestResult(futures[future])
+                try:
+                    feed = future.result()
+                    links = self.store(feed, result)
+                except (HarvestError, DatabaseError) as exc:
+                    result.status = HarvestSource.FAILED
+                    result.error = str(exc)
+                    feed = None
+                else:
+                    pending_links.append((result, links))
+                self.finish(result, feed)
+                results.append(result)
+
+        # Instructors may be persons of another source, so links come last.
+        for result, links in pending_links:
+            self.store_links(links, result)
+        return results
+
+    def store(self, feed, result):
+        """Upsert the resources of a fetched feed; return its instructor links."""
+        result.pages = feed.pages
+        result.unchanged = feed.unchanged
+        if not feed.pages:
+            result.status = HarvestSource.NOT_MODIFIED
+        rows, links, errors = map_resources(feed.resources)
+        result.errors.extend((f"resource {number}", message) for number, message in errors)
+        for entity in HARVESTED_ENTITIES:
+            if not rows[entity]:
+                continue
+            import_result = ImportResult(entity, result.source.url)
+            records, errors = parse_chunk(entity, 1, rows[entity])
+            for start in range(0, len(records), self.importer.batch_size):
+                self.importer.write_batch(entity, records[start:start + self.importer.batch_size], import_result)
+            self.importer.forget(entity)
+            result.created += import_result.created
+            result.updated += import_result.updated
+            result.errors.extend((f"{entity} row {number}", message) for number, message in errors)
+        return links
+
+    def store_links(self, links, result):
+        if not links:
+            return
+        entity = 'professor_courses'
+        import_result = ImportResult(entity, result.source.url)
+        records, errors = parse_chunk(entity, 1, links)
+        records = self.importer.resolve_foreign_keys(entity, records, import_result)
+        self.importer.write_batch(entity, records, import_result)
+        result.links += import_result.created
+        result.errors.extend(
+            (f"instructor link {number}", message) for number, message in errors + import_result.errors
+        )
+
+    def finish(self, result, feed):
+        """Remember the outcome and, after a successful harvest, the page validators."""
+        source = result.source
+        source.last_harvested_at = timezone.now()
+        source.last_status = result.status
+        source.last_error = result.error
+        fields = ['last_harvested_at', 'last_status', 'last_error']
+        if feed is not None:
+            source.validators = feed.validators
+            fields.append('validators')
+        source.save(update_fields=fields)
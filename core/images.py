@@ -0,0 +1,211 @@
+"""
+Image pipeline for professor, PhD student and course pictures.
+
+This file contains the helpers that fetch each remote ``image_url`` once, record
+its dimensions and validity in an ImageAsset row, and write resized renditions
+under MEDIA_ROOT keyed by the image's content hash. Templates and MOOChub
+serializers use ``rendition_url()``/``moochub_image()`` to point at the cached
+renditions instead of the full-size originals.
+"""
+
+import hashlib
+import io
+import urllib.request
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+# Rendition name -> maximum width/height in pixels. 'thumb' covers the 60px admin
+# thumbnails at 2x, 'medium' the detail pages and list cards.
+RENDITION_SIZES = {
+    'thumb': 120,
+    'medium': 480,
+}
+
+# Refuse to download anything larger than this.
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+FETCH_TIMEOUT = 10
+
+# Asset lookups are cached per process; keep them short-lived so renditions
+# written by the process_images command show up soon.
+CACHE_TIMEOUT = 300
+MISSING = 'missing'
+
+
+def image_sources():
+    """Return the models and URL fields that feed the image pipeline."""
+    from courses.models import Course
+    from phd_students.models import PhDStudent
+    from professors.models import Professor
+    return [(Professor, 'image_url'), (PhDStudent, 'image_url'), (Course, 'image_url')]
+
+
+def collect_image_urls():
+    """Return the set of distinct non-empty image URLs used across the catalog."""
+    urls = set()
+    for model, field in image_sources():
+        urls.update(
+            model.objects.exclude(**{field: ''}).values_list(field, flat=True).distinct()
+        )
+    return urls
+
+
+def fetch_image_bytes(url, timeout=FETCH_TIMEOUT):
+    """
+    Return the raw bytes of the image at ``url``.
+
+    Only http(s) URLs are fetched; anything else, such as ``file://`` URLs or
+    local paths, is refused so catalog data can't make the server read its own
+    files.
+    """
+    if urlsplit(url).scheme not in ('http', 'https'):
+        raise ValueError("image URL is not an http(s) URL")
+    request = urllib.request.Request(url, headers={'User-Agent': 'lms-consolidator'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        data = response.read(MAX_IMAGE_BYTES + 1)
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ValueError("image is larger than %d bytes" % MAX_IMAGE_BYTES)
+    return data
+
+
+def rendition_name(content_hash, size, extension):
+    """Return the storage path of a rendition, relative to MEDIA_ROOT."""
+    return f"thumbnails/{content_hash[:2]}/{content_hash}-{size}.{extension}"
+
+
+def write_renditions(image, content_hash):
+    """
+    Write every rendition of a decoded PIL image, skipping ones already stored.
+
+    Returns the file extension used for the renditions.
+    """
+    has_alpha = image.mode in ('RGBA', 'LA', 'P')
+    extension, pil_format = ('png', 'PNG') if has_alpha else ('jpg', 'JPEG')
+    for size, pixels in RENDITION_SIZES.items():
+        name = rendition_name(content_hash, size, extension)
+        if default_storage.exists(name):
+            continue
+        rendition = image.copy()
+        rendition.thumbnail((pixels, pixels))
+        if not has_alpha and rendition.mode != 'RGB':
+            rendition = rendition.convert('RGB')
+        buffer = io.BytesIO()
+        rendition.save(buffer, pil_format, optimize=True)
+        default_storage.save(name, ContentFile(buffer.getvalue()))
+    return extension
+
+
+def process_image(url):
+    """
+    Fetch, validate and render the image at ``url`` and record the outcome.
+
+    Returns the saved ImageAsset. Failures are recorded on the asset instead of
+    raised, so one broken URL doesn't stop a batch.
+    """
+    from PIL import Image
+
+    from core.models import ImageAsset
+
+    asset, _created = ImageAsset.objects.get_or_create(source_url=url)
+    try:
+        data = fetch_image_bytes(url)
+        content_hash = hashlib.sha256(data).hexdigest()
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            asset.width, asset.height = image.size
+            asset.extension = write_renditions(image, content_hash)
+        asset.content_hash = content_hash
+        asset.is_valid = True
+        asset.error = ''
+    except Exception as exc:
+        asset.is_valid = False
+        asset.error = str(exc)[:255]
+    asset.checked_at = timezone.now()
+    asset.save()
+    cache.delete(_cache_key(url))
+    return asset
+
+
+def _cache_key(url):
+    return 'image-asset:' + hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def get_asset_info(url):
+    """
+    Return (content hash, extension, width, height, is_valid) for ``url``.
+
+    Returns None if the URL hasn't been processed yet. Results are cached so list
+    pages don't query the ImageAsset table once per picture.
+    """
+    key = _cache_key(url)
+    info = cache.get(key)
+    if info is None:
+        from core.models import ImageAsset
+        row = (
+            ImageAsset.objects.filter(source_url=url)
+            .values_list('content_hash', 'extension', 'width', 'height', 'is_valid')
+            .first()
+        )
+        info = tuple(row) if row else MISSING
+        cache.set(key, info, CACHE_TIMEOUT)
+    return None if info == MISSING else info
+
+
+def prefetch_asset_info(urls):
+    """
+    Warm the asset lookup cache for many URLs with at most one query.
+
+    List pages call this before rendering so that ``get_asset_info()`` doesn't
+    query once per picture.
+    """
+    keys = {_cache_key(url): url for url in set(urls) if url}
+    missing = keys.keys() - cache.get_many(list(keys)).keys()
+    if not missing:
+        return
+    from core.models import ImageAsset
+    urls = [keys[key] for key in missing]
+    found = {
+        row[0]: tuple(row[1:])
+        for row in ImageAsset.objects.filter(source_url__in=urls).values_list(
+            'source_url', 'content_hash', 'extension', 'width', 'height', 'is_valid'
+        )
+    }
+    cache.set_many(
+        {_cache_key(url): found.get(url, MISSING) for url in urls},
+        CACHE_TIMEOUT,
+    )
+
+
+def rendition_url(url, size='thumb'):
+    """
+    Return the URL to show for the image at ``url``.
+
+    Processed images resolve to their cached rendition, broken images to '' and
+    images the pipeline hasn't seen yet to the original URL.
+    """
+    if not url:
+        return ''
+    info = get_asset_info(url)
+    if info is None:
+        return url
+    content_hash, extension, _width, _height, is_valid = info
+    if not is_valid:
+        return ''
+    return default_storage.url(rendition_name(content_hash, size, extension))
+
+
+def moochub_image(url, request=None, size='medium'):
+    """Return a MOOChub ImageObject for ``url``, or None if there is no usable image."""
+    content_url = rendition_url(url, size)
+    if not content_url:
+        return None
+    if request is not None:
+        content_url = request.build_absolute_uri(content_url)
+    return {
+        "type": "ImageObject",
+        "contentUrl": content_url,
+    }
@@ -0,0 +1,152 @@
+"""
+In-process broadcast of catalog changes to live clients.
+
+This file contains the hub behind the ``/api/live/changes/`` stream. Every
+change log entry (core/changes.py) is published to the hub once its
+transaction commits, and the hub fans it out to the connected clients. Each
+client has a small queue of pending changes: repeated changes to the same
+resource are coalesced, and a client that falls too far behind gets a single
+"resync" event instead of an ever-growing backlog.
+
+Changes committed by other processes are picked up by one poller per process,
+which reads new change log entries every few seconds while clients are
+connected. Idle clients therefore cost a queue and a sleeping task each, no
+matter how many there are.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+
+# Seconds between heartbeats on an idle stream.
+HEARTBEAT_SECONDS = 15
+# Pending changes kept per client before it has to resync.
+QUEUE_SIZE = 100
+# Seconds between checks for changes committed by other processes.
+POLL_SECONDS = 2
+# Sequence numbers remembered to avoid publishing a change twice.
+RECENT_SIZE = 10000
+# Streams are closed after this long; EventSource reconnects with Last-Event-ID.
+MAX_STREAM_SECONDS = 300
+# Upper bound for the ``timeout`` of a long poll.
+MAX_POLL_TIMEOUT = 55
+
+
+class Subscription:
+    """The pending changes of one connected client; only used on its event loop."""
+
+    def __init__(self, loop, maxsize=QUEUE_SIZE):
+        self.loop = loop
+        self.maxsize = maxsize
+        self.pending = OrderedDict()
+        self.overflowed = False
+        self.ready = asyncio.Event()
+
+    def push(self, events):
+        for event in events:
+            key = (event['collection'], event['id'])
+            self.pending.pop(key, None)
+            if len(self.pending) >= self.maxsize:
+                self.pending.clear()
+                self.overflowed = True
+            else:
+                self.pending[key] = event
+        self.ready.set()
+
+    async def get(self, timeout):
+        """
+        Wait up to ``timeout`` seconds for changes.
+
+        Returns (events, overflowed); ``overflowed`` means changes were dropped
+        and the client should resync.
+        """
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        events, overflowed = list(self.pending.values()), self.overflowed
+        self.pending.clear()
+        self.overflowed = False
+        self.ready.clear()
+        return events, overflowed
+
+
+class BroadcastHub:
+    """Fan change events out to every subscription, from any thread."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.recent = OrderedDict()
+        self.poller = None
+
+    def subscribe(self, maxsize=QUEUE_SIZE):
+        """Return a new Subscription; must be called from the client's event loop."""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(loop, maxsize)
+        with self.lock:
+            self.subscribers.add(subscription)
+        if self.poller is None or self.poller.done() or self.poller.get_loop() is not loop:
+            self.poller = loop.create_task(self.poll())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+            idle = not self.subscribers
+        if idle and self.poller is not None:
+            self.poller.cancel()
+            self.poller = None
+
+    def publish(self, events):
+        """Send ``events`` (dicts with seq, collection, id and action) to every client."""
+        with self.lock:
+            fresh = []
+            for event in events:
+                if event['seq'] in self.recent:
+                    continue
+                self.recent[event['seq']] = None
+                fresh.append(event)
+            while len(self.recent) > RECENT_SIZE:
+                self.recent.popitem(last=False)
+            subscribers = list(self.subscribers)
+        if not fresh:
+            return
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, fresh)
+            except RuntimeError:
+                # The client's event loop is already closed.
+                self.unsubscribe(subscription)
+
+    async def poll(self):
+        """Publish changes committed by other processes while anyone listens."""
+        from core.changes import latest_sequence
+
+        cursor = await sync_to_async(latest_sequence)()
+        while self.subscribers:
+            await asyncio.sleep(POLL_SECONDS)
+            events = await sync_to_async(fetch_events)(cursor)
+            if events:
+                cursor = events[-1]['seq']
+                self.publish(events)
+
+
+def fetch_events(since, limit=1000):
+    """Return up to ``limit`` change events after ``since`` from the change log."""
+    from core.models import ChangeLogEntry
+
+    entries = (
+        ChangeLogEntry.objects.filter(seq__gt=since)
+        .order_by('seq')
+        .values_list('seq', 'collection', 'object_id', 'action')[:limit]
+    )
+    return [
+        {"seq": seq, "collection": collection, "id": pk, "action": action}
+        for seq, collection, pk, action in entries
+    ]
+
+
+hub = BroadcastHub()
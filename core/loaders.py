@@ -0,0 +1,179 @@
+"""
+Batched loading of related objects for serializers.
+
+This file contains RelationLoader, a request-scoped identity map that fills in
+the relations of a whole page of model instances at once, and
+BatchedListSerializer, which runs it before serializing a list. Serializers opt
+in through their Meta::
+
+    class Meta:
+        model = Professor
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['research_group', 'leads_research_group']
+
+Their SerializerMethodFields keep using ``obj.research_group`` or
+``obj.phd_students.all()`` as before; the loader has already put the objects
+into the caches Django reads those from. Forward relations of a page are
+collected by target model and fetched with one ``id__in`` query per model,
+reverse and many-to-many relations with one query per relation. Every object is
+loaded at most once per request, so a research group referenced by two fields
+of a professor, or by many professors of a page, is a single shared instance.
+"""
+
+from collections import defaultdict
+
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+FORWARD = 'forward'
+REVERSE_ONE = 'reverse_one'
+REVERSE_MANY = 'reverse_many'
+MANY_TO_MANY = 'many_to_many'
+
+
+def relation_kind(field):
+    if field.many_to_many:
+        return MANY_TO_MANY
+    if field.one_to_many:
+        return REVERSE_MANY
+    if field.one_to_one and not field.concrete:
+        return REVERSE_ONE
+    return FORWARD
+
+
+def prefetched(instance):
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    return instance._prefetched_objects_cache
+
+
+class RelationLoader:
+    """Identity map of model instances plus the batched relation loading built on it."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def register(self, instance):
+        """Return the shared instance for ``instance``'s row, registering it if new."""
+        return self.objects.setdefault((instance._meta.label, instance.pk), instance)
+
+    def fetch(self, model, ids):
+        """Load the rows of ``model`` in ``ids`` that aren't in the map yet, with one query."""
+        missing = {pk for pk in ids if pk is not None and (model._meta.label, pk) not in self.objects}
+        if missing:
+            for instance in model._default_manager.filter(pk__in=missing):
+                self.register(instance)
+
+    def get(self, model, pk):
+        return self.objects.get((model._meta.label, pk))
+
+    def load(self, instances, names):
+        """Fill the relations ``names`` of ``instances``, which all have the same model."""
+        if not instances:
+            return
+        model = type(instances[0])
+        for instance in instances:
+            self.register(instance)
+        forward = []
+        reverse = {}
+        wanted = defaultdict(set)
+
+        for name in names:
+            field = model._meta.get_field(name)
+            kind = relation_kind(field)
+            pending = [instance for instance in instances if not self.is_loaded(instance, field, kind)]
+            if not pending:
+                continue
+            pks = [instance.pk for instance in pending]
+            if kind == FORWARD:
+                forward.append((field, pending))
+                wanted[field.related_model].update(getattr(instance, field.attname) for instance in pending)
+            elif kind == MANY_TO_MANY:
+                through, own, other, target = self.link_columns(field)
+                links = defaultdict(list)
+                rows = through._default_manager.filter(**{f'{own}__in': pks}).order_by('pk')
+                for owner, linked in rows.values_list(own, other):
+                    links[owner].append(linked)
+                    wanted[target].add(linked)
+                reverse[name] = (field, kind, pending, target, links)
+            else:
+                target = field.related_model
+                fk = field.field.attname
+                rows = target._default_manager.filter(**{f'{fk}__in': pks}).order_by('pk')
+                links = defaultdict(list)
+                for row in rows:
+                    row = self.register(row)
+                    links[getattr(row, fk)].append(row.pk)
+                reverse[name] = (field, kind, pending, target, links)
+
+        for target, ids in wanted.items():
+            self.fetch(target, ids)
+
+        for field, pending in forward:
+            for instance in pending:
+                pk = getattr(instance, field.attname)
+                field.set_cached_value(instance, None if pk is None else self.get(field.related_model, pk))
+        for name, (field, kind, pending, target, links) in reverse.items():
+            for instance in pending:
+                related = [self.get(target, pk) for pk in links.get(instance.pk, ())]
+                if kind == REVERSE_ONE:
+                    field.set_cached_value(instance, related[0] if related else None)
+                    continue
+                if kind == REVERSE_MANY:
+                    # Like prefetch_related(), point the rows back at their owner.
+                    for row in related:
+                        field.field.set_cached_value(row, instance)
+                queryset = getattr(instance, field.get_accessor_name() if not field.concrete else name).all()
+                queryset._result_cache = related
+                queryset._prefetch_done = True
+                prefetched(instance)[self.cache_name(field, kind)] = queryset
+
+    @staticmethod
+    def link_columns(field):
+        """Return (through model, owner column, target column, target model) of a many-to-many relation."""
+        if field.concrete:
+            through = field.remote_field.through
+            own, other = field.m2m_field_name(), field.m2m_reverse_field_name()
+        else:
+            through = field.through
+            own, other = field.field.m2m_reverse_field_name(), field.field.m2m_field_name()
+        return (
+            through,
+            through._meta.get_field(own).attname,
+            through._meta.get_field(other).attname,
+            field.related_model,
+        )
+
+    @staticmethod
+    def cache_name(field, kind):
+        # The keys the related managers look up in _prefetched_objects_cache.
+        if kind == MANY_TO_MANY:
+            return field.name if field.concrete else field.field.related_query_name()
+        return field.get_cache_name()
+
+    def is_loaded(self, instance, field, kind):
+        if kind in (FORWARD, REVERSE_ONE):
+            return field.is_cached(instance)
+        return self.cache_name(field, kind) in prefetched(instance)
+
+
+def loader_for(context):
+    """Return the RelationLoader of the serializer ``context``'s request, creating it if needed."""
+    request = context.get('request')
+    if request is None:
+        return RelationLoader()
+    request = getattr(request, '_request', request)
+    if getattr(request, 'relation_loader', None) is None:
+        request.relation_loader = RelationLoader()
+    return request.relation_loader
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """ListSerializer that loads the child's ``Meta.batch_relations`` for all items first."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        names = getattr(self.child.Meta, 'batch_relations', ())
+        if items and names:
+            loader_for(self.context).load(items, names)
+        return super().to_representation(items)
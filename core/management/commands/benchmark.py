@@ -0,0 +1,66 @@
+"""
+Management command to run the benchmark suite in core/benchmarks.py.
+
+Usage:
+    python manage.py benchmark [name ...] [--repeat 5] [--output results.jsonl]
+
+Without names, every registered benchmark runs. With --output, one JSON line
+per benchmark is appended so results can be compared over time.
+"""
+
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.benchmarks import BENCHMARKS
+
+
+def current_revision():
+    """Return the git revision of the working tree, or '' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+class Command(BaseCommand):
+    help = "Run performance benchmarks and optionally record the results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Benchmarks to run (default: all).")
+        parser.add_argument('--repeat', type=int, default=5, help="Repetitions per benchmark.")
+        parser.add_argument('--output', help="Append results as JSON lines to this file.")
+        parser.add_argument('--list', action='store_true', help="List the available benchmarks.")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name, func in BENCHMARKS.items():
+                self.stdout.write(f"{name}: {(func.__doc__ or '').strip()}")
+            return
+
+        names = options['names'] or list(BENCHMARKS)
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+        revision = current_revision()
+        for name in names:
+            metrics = BENCHMARKS[name](repeat=options['repeat'])
+            self.stdout.write(self.style.SUCCESS(name))
+            for metric, value in metrics.items():
+                self.stdout.write(f"  {metric}: {value}")
+            if options['output']:
+                record = {
+                    'benchmark': name,
+                    'revision': revision,
+                    'timestamp': timezone.now().isoformat(),
+                    'metrics': metrics,
+                }
+                with open(options['output'], 'a') as handle:
+                    handle.write(json.dumps(record) + '\n')
@@ -0,0 +1,23 @@
+"""
+Management command to compact the MOOChub change log.
+
+Usage:
+    python manage.py compact_changes
+
+Deletes change log entries superseded by a later entry for the same resource,
+so the log never holds more than one entry per resource. Harvesters keep
+syncing correctly: they only ever need the newest entry. Run it periodically,
+e.g. nightly from cron.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.changes import compact_changes
+
+
+class Command(BaseCommand):
+    help = "Delete MOOChub change log entries superseded by newer ones."
+
+    def handle(self, *args, **options):
+        deleted = compact_changes()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} superseded change log entries."))
@@ -0,0 +1,62 @@
+"""
+Management command to export the MOOChub API as static files.
+
+Usage:
+    python manage.py export_moochub [--output DIR] [--page-size 100] [collection ...]
+
+Renders the courses, persons, students and organizations collections into
+pre-paginated, precompressed JSON:API files under MOOCHUB_SNAPSHOT_ROOT. Only
+pages whose contents changed since the last export are rewritten, so the
+command can run from cron as often as needed.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.snapshots import COLLECTIONS, SnapshotExporter
+
+
+class Command(BaseCommand):
+    help = "Export the MOOChub collections as a static, precompressed JSON:API bundle."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'collections', nargs='*',
+            help="Collections to export (default: all of %s)." % ', '.join(COLLECTIONS),
+        )
+        parser.add_argument(
+            '--output', default=settings.MOOCHUB_SNAPSHOT_ROOT,
+            help="Directory to write the snapshot to.",
+        )
+        parser.add_argument(
+            '--base-url', default=settings.MOOCHUB_SNAPSHOT_URL,
+            help="URL the output directory is served at.",
+        )
+        parser.add_argument(
+            '--site-url', default=settings.SITE_URL,
+            help="Scheme and host used for absolute URLs.",
+        )
+        parser.add_argument(
+            '--page-size', type=int, default=100,
+            help="Resources per page.",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['collections']) - set(COLLECTIONS)
+        if unknown:
+            raise CommandError("Unknown collections: %s" % ', '.join(sorted(unknown)))
+        if options['page_size'] < 1:
+            raise CommandError("--page-size must be at least 1.")
+
+        exporter = SnapshotExporter(
+            options['output'], options['base_url'], options['site_url'], options['page_size'],
+        )
+        summary = exporter.export(options['collections'] or None)
+        for collection, info in summary.items():
+            if options['collections'] and collection not in options['collections']:
+                continue
+            self.stdout.write(
+                f"{collection}: {info['total']} resources, {info['pages']} pages, "
+                f"{info['written']} rewritten"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Snapshot written to {options['output']}."))
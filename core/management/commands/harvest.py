@@ -0,0 +1,82 @@
+"""
+Management command to pull partner LMS catalogs into this one.
+
+Usage:
+    python manage.py harvest [source ...] [--workers 8] [--full]
+
+Harvests every enabled HarvestSource (or only the named ones) concurrently; see
+core/harvest.py. Pages that didn't change since the last run are skipped with
+conditional requests unless --full is given. Meant to be run from cron; the
+command fails if any source failed, after harvesting all the others.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.harvest import REQUEST_TIMEOUT, SOURCE_TIMEOUT, Harvester
+from core.models import HarvestSource
+
+
+class Command(BaseCommand):
+    help = "Fetch the MOOChub feeds of partner LMSs and upsert their courses and persons."
+
+    def add_arguments(self, parser):
+        parser.add_argument('sources', nargs='*', help="Names of the sources to harvest (default: all enabled).")
+        parser.add_argument(
+            '--workers', type=int, default=8,
+            help="Number of sources fetched concurrently.",
+        )
+        parser.add_argument(
+            '--request-timeout', type=float, default=REQUEST_TIMEOUT,
+            help="Seconds allowed for one HTTP request.",
+        )
+        parser.add_argument(
+            '--source-timeout', type=float, default=SOURCE_TIMEOUT,
+            help="Seconds allowed for all pages of one source.",
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Fetch every page, ignoring the ETags and dates of the last harvest.",
+        )
+        parser.add_argument(
+            '--max-errors', type=int, default=20,
+            help="Maximum number of error lines printed per source.",
+        )
+
+    def handle(self, *args, **options):
+        sources = HarvestSource.objects.order_by('name')
+        if options['sources']:
+            sources = sources.filter(name__in=options['sources'])
+            missing = set(options['sources']) - {source.name for source in sources}
+            if missing:
+                raise CommandError(f"Unknown sources: {', '.join(sorted(missing))}.")
+        else:
+            sources = sources.filter(enabled=True)
+        if not sources:
+            raise CommandError("No harvest sources to run.")
+
+        harvester = Harvester(
+            workers=options['workers'],
+            request_timeout=options['request_timeout'],
+            source_timeout=options['source_timeout'],
+            full=options['full'],
+        )
+        results = harvester.harvest(list(sources))
+
+        for result in sorted(results, key=lambda result: result.source.name):
+            if result.status == HarvestSource.FAILED:
+                self.stdout.write(self.style.ERROR(f"{result.source}: failed: {result.error}"))
+                continue
+            summary = (
+                f"{result.source}: {result.pages} pages fetched, {result.unchanged} unchanged, "
+                f"{result.created} created, {result.updated} updated, {result.links} instructor links"
+            )
+            if result.errors:
+                self.stdout.write(self.style.WARNING(f"{summary}, {len(result.errors)} errors"))
+                for where, message in result.errors[:options['max_errors']]:
+                    self.stdout.write(f"  {where}: {message}")
+            else:
+                self.stdout.write(self.style.SUCCESS(summary))
+
+        failed = [result.source.name for result in results if result.status == HarvestSource.FAILED]
+        if failed:
+            raise CommandError(f"Harvest failed for: {', '.join(sorted(failed))}.")
@@ -0,0 +1,82 @@
+"""
+Management command to seed the catalog from a directory of CSV files.
+
+Usage:
+    python manage.py import_catalog path/to/csv_dir [--workers 8]
+    python manage.py import_catalog path/to/csv_dir --validate-only
+
+The directory may contain research_groups.csv, professors.csv, courses.csv,
+phd_students.csv, professor_courses.csv and course_research.csv. Files are
+imported in dependency order; missing files are skipped. With --validate-only
+the files are checked and every problem is reported, but nothing is written.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import CatalogImporter, CatalogValidator
+
+
+class Command(BaseCommand):
+    help = "Import research groups, professors, courses, PhD students and relations from a directory of CSV files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory containing the CSV files.")
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of parser processes (defaults to the number of CPUs; 1 disables the pool).",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help="Rows parsed per worker task.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Rows written per transaction.",
+        )
+        parser.add_argument(
+            '--max-errors', type=int, default=20,
+            help="Maximum number of error lines printed per file.",
+        )
+        parser.add_argument(
+            '--validate-only', '--dry-run', action='store_true', dest='validate_only',
+            help="Check the files and report every error without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f"'{directory}' is not a directory.")
+
+        if options['validate_only']:
+            results = CatalogValidator().validate_directory(directory)
+        else:
+            importer = CatalogImporter(
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                batch_size=options['batch_size'],
+            )
+            results = importer.import_directory(directory)
+        if not results:
+            raise CommandError(f"No importable CSV files found in '{directory}'.")
+
+        for result in results:
+            if options['validate_only']:
+                summary = f"{os.path.basename(result.path)}: {result.rows} {result.label} checked"
+            else:
+                summary = (
+                    f"{os.path.basename(result.path)}: {result.rows} rows, "
+                    f"{result.created} {result.label} created, {result.updated} updated"
+                )
+            if result.errors:
+                self.stdout.write(self.style.WARNING(f"{summary}, {len(result.errors)} errors"))
+                for line, message in sorted(result.errors)[:options['max_errors']]:
+                    self.stdout.write(f"  line {line}: {message}")
+            else:
+                self.stdout.write(self.style.SUCCESS(summary))
+
+        if options['validate_only']:
+            error_count = sum(len(result.errors) for result in results)
+            if error_count:
+                raise CommandError(f"Validation found {error_count} errors; nothing was imported.")
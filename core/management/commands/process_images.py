@@ -0,0 +1,57 @@
+"""
+Management command to run catalog pictures through the image pipeline.
+
+Usage:
+    python manage.py process_images [--refresh] [--workers 8]
+
+Each distinct image URL of professors, PhD students and courses is fetched once;
+its dimensions and validity are recorded and thumbnails are cached under
+MEDIA_ROOT. Already processed URLs are skipped unless --refresh is given.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.images import collect_image_urls, process_image
+from core.models import ImageAsset
+
+
+def _process(url):
+    try:
+        return process_image(url)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Fetch catalog images once, validate them and cache resized thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh', action='store_true',
+            help="Re-fetch images that were already processed.",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=8,
+            help="Number of concurrent downloads.",
+        )
+
+    def handle(self, *args, **options):
+        urls = collect_image_urls()
+        if not options['refresh']:
+            urls -= set(
+                ImageAsset.objects.filter(checked_at__isnull=False).values_list('source_url', flat=True)
+            )
+
+        valid = broken = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            for asset in executor.map(_process, sorted(urls)):
+                if asset.is_valid:
+                    valid += 1
+                else:
+                    broken += 1
+                    self.stdout.write(self.style.WARNING(f"{asset.source_url}: {asset.error}"))
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {valid + broken} images ({valid} valid, {broken} broken)."))
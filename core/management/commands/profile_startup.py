@@ -0,0 +1,62 @@
+"""
+Management command to report import time per module for a worker cold start.
+
+Usage:
+    python manage.py profile_startup [--sort self|cumulative] [--limit 30] [--prefix courses]
+
+Runs core.startup.cold_start() in a fresh interpreter with ``-X importtime``
+and prints the slowest imports.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.startup import LAZY_MODULES, measure_cold_start
+
+
+def parse_importtime(output):
+    """
+    Parse ``-X importtime`` output.
+
+    Returns a list of (module, self microseconds, cumulative microseconds).
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time of a worker cold start."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sort', choices=['self', 'cumulative'], default='cumulative',
+            help="Order modules by their own import time or including their imports.",
+        )
+        parser.add_argument('--limit', type=int, default=30, help="Number of modules to show.")
+        parser.add_argument('--prefix', default='', help="Only show modules starting with this prefix.")
+
+    def handle(self, *args, **options):
+        startup, total, stderr = measure_cold_start(python_options=['-X', 'importtime'])
+        rows = parse_importtime(stderr)
+        column = 1 if options['sort'] == 'self' else 2
+        shown = [row for row in rows if row[0].startswith(options['prefix'])]
+        shown.sort(key=lambda row: row[column], reverse=True)
+
+        self.stdout.write(f"{'self ms':>9} {'cumul. ms':>10}  module")
+        for module, self_us, cumulative_us in shown[:options['limit']]:
+            self.stdout.write(f"{self_us / 1000:9.1f} {cumulative_us / 1000:10.1f}  {module}")
+
+        loaded = {row[0] for row in rows}
+        eager = [name for name in LAZY_MODULES if name in loaded]
+        self.stdout.write(
+            f"\n{len(rows)} modules imported; cold start {startup * 1000:.0f} ms "
+            f"(process {total * 1000:.0f} ms, timings include -X importtime overhead)."
+        )
+        if eager:
+            self.stdout.write(self.style.WARNING(
+                "Modules meant to load lazily were imported at startup: " + ', '.join(eager)
+            ))
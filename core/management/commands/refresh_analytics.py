@@ -0,0 +1,26 @@
+"""
+Management command to recompute the collaboration analytics.
+
+Usage:
+    python manage.py refresh_analytics
+
+Recomputes the report served by /api/analytics/ (co-teaching, research group
+bridges and supervision load, see core/analytics.py) from the current
+catalog. Run it after imports or periodically, e.g. nightly from cron.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.analytics import refresh_analytics
+
+
+class Command(BaseCommand):
+    help = "Recompute the collaboration analytics report."
+
+    def handle(self, *args, **options):
+        report = refresh_analytics()
+        summary = report.data['summary']
+        self.stdout.write(self.style.SUCCESS(
+            f"Analytics refreshed at generation {report.generation}: {summary['professors']} professors, "
+            f"{summary['coteaching_pairs']} co-teaching pairs, {summary['components']} components."
+        ))
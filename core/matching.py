@@ -0,0 +1,187 @@
+"""
+Fuzzy matching of professor and research group names.
+
+This file contains NameIndex, used by the CSV importers to link rows whose
+``supervisor`` or ``research_group`` doesn't exactly match a stored name, such
+as "Prof. Dr. Müller" for the professor "Hans Müller". Names are normalized
+(case, accents, German umlauts, academic titles) into tokens, and every entry is
+indexed by the trigrams of its tokens. A lookup only scores the entries that
+share the query's rarer trigrams, so it stays fast with tens of thousands of
+names.
+
+Scores run from 0 to 1. A name is linked automatically when its best candidate
+scores at least AUTO_LINK_SCORE and clearly beats the runner-up; otherwise the
+candidates are reported so the row can be fixed by hand.
+"""
+
+import functools
+import re
+import unicodedata
+from collections import Counter, defaultdict, namedtuple
+
+from django.apps import apps
+
+# Best score needed to link a name without asking.
+AUTO_LINK_SCORE = 0.8
+# Lead the best candidate needs over the runner-up to be linked.
+AMBIGUITY_MARGIN = 0.1
+# Candidates scoring less are not reported at all.
+MIN_SCORE = 0.4
+# Entries fully scored per lookup, picked by the number of shared trigrams.
+CANDIDATE_POOL = 50
+# Trigrams shared by more entries than this are skipped once the rarest
+# MIN_TRIGRAMS of a query have been used; they select too little to be worth it.
+MAX_POSTING = 2000
+MIN_TRIGRAMS = 3
+
+# Titles and degrees dropped from names before matching.
+HONORIFICS = {
+    'prof', 'professor', 'dr', 'doctor', 'phd', 'habil', 'dipl', 'ing', 'rer', 'nat',
+    'med', 'phil', 'msc', 'bsc', 'mba', 'mr', 'mrs', 'ms', 'jun', 'jr', 'apl', 'em',
+}
+GERMAN_TRANSLITERATION = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue'})
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+LINKED = 'linked'
+AMBIGUOUS = 'ambiguous'
+UNMATCHED = 'unmatched'
+
+# Importer entity -> (model, fields joined into the indexed name).
+MATCHED_ENTITIES = {
+    'professors': ('professors.Professor', ('title', 'name')),
+    'research_groups': ('research_groups.ResearchGroup', ('name',)),
+}
+
+Candidate = namedtuple('Candidate', 'key label score')
+
+
+class Match(namedtuple('Match', 'status candidates')):
+    """Outcome of NameIndex.resolve(): a status and the ranked candidates."""
+
+    @property
+    def key(self):
+        return self.candidates[0].key if self.status == LINKED else None
+
+
+def fold(text, table=None):
+    """Lowercase ``text`` and strip its accents, after applying ``table``."""
+    text = text.casefold()
+    if table is not None:
+        text = text.translate(table)
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def name_forms(text):
+    """
+    Return the normalized token tuples of ``text``.
+
+    Names with umlauts have two forms, "mueller" and "muller", so they match
+    however the CSV spells them.
+    """
+    forms = []
+    for folded in (fold(text, GERMAN_TRANSLITERATION), fold(text)):
+        tokens = tuple(token for token in TOKEN_RE.findall(folded) if token not in HONORIFICS)
+        if tokens and tokens not in forms:
+            forms.append(tokens)
+    return forms
+
+
+@functools.lru_cache(maxsize=65536)
+def token_trigrams(token):
+    # First names and common surnames repeat a lot.
+    padded = f"  {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def prepare(tokens):
+    """Return the (per-token trigrams, all trigrams) form of a token tuple."""
+    grams = [token_trigrams(token) for token in tokens]
+    return grams, set().union(*grams)
+
+
+def similarity(query, entry):
+    """
+    Score two prepared forms.
+
+    Averages the Dice coefficient of the names' trigram sets with how well each
+    query token is covered by its closest entry token, so "Müller" scores well
+    against "Hans Müller" and "Schmid" against "Schmidt".
+    """
+    query_tokens, query_grams = query
+    entry_tokens, entry_grams = entry
+    coverage = sum(max(dice(token, other) for other in entry_tokens) for token in query_tokens)
+    return (dice(query_grams, entry_grams) + coverage / len(query_tokens)) / 2
+
+
+class NameIndex:
+    """Trigram index over (key, name) entries."""
+
+    def __init__(self, entries):
+        self.keys = []
+        self.labels = []
+        self.forms = []
+        self.postings = defaultdict(list)
+        for key, label in entries:
+            forms = [prepare(tokens) for tokens in name_forms(label)]
+            if not forms:
+                continue
+            position = len(self.keys)
+            self.keys.append(key)
+            self.labels.append(label)
+            self.forms.append(forms)
+            for gram in set().union(*(grams for _tokens, grams in forms)):
+                self.postings[gram].append(position)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, name, limit=5):
+        """Return up to ``limit`` Candidates for ``name``, best first."""
+        forms = [prepare(tokens) for tokens in name_forms(name)]
+        if not forms:
+            return []
+        grams = set().union(*(grams for _tokens, grams in forms))
+        postings = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        shared = Counter()
+        for number, posting in enumerate(postings):
+            if number >= MIN_TRIGRAMS and len(posting) > MAX_POSTING:
+                break
+            shared.update(posting)
+
+        scored = []
+        for position, _count in shared.most_common(CANDIDATE_POOL):
+            score = max(similarity(query, entry) for query in forms for entry in self.forms[position])
+            if score >= MIN_SCORE:
+                scored.append(Candidate(self.keys[position], self.labels[position], round(score, 3)))
+        scored.sort(key=lambda candidate: -candidate.score)
+        return scored[:limit]
+
+    def resolve(self, name):
+        """Return the Match for ``name``; linked only when unambiguous."""
+        candidates = self.candidates(name)
+        if not candidates or candidates[0].score < AUTO_LINK_SCORE:
+            return Match(UNMATCHED, candidates)
+        if len(candidates) > 1 and candidates[0].score - candidates[1].score < AMBIGUITY_MARGIN:
+            return Match(AMBIGUOUS, candidates)
+        return Match(LINKED, candidates)
+
+
+def load_name_index(entity, extra_names=()):
+    """
+    Build the NameIndex of an importer entity with one query.
+
+    ``extra_names`` are indexed with a None key, for names defined by files
+    that haven't been imported yet.
+    """
+    label, fields = MATCHED_ENTITIES[entity]
+    model = apps.get_model(label)
+    entries = [
+        (pk, ' '.join(value for value in values if value))
+        for pk, *values in model.objects.values_list('pk', *fields).iterator()
+    ]
+    entries.extend((None, name) for name in extra_names)
+    return NameIndex(entries)
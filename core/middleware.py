@@ -0,0 +1,106 @@
+"""
+Lean middleware stack for anonymous API reads.
+
+Most API traffic is anonymous GETs from harvesters and the portal frontend,
+which need no session, user, CSRF token, messages or X-Frame-Options header.
+The stock middleware classes in settings.MIDDLEWARE are replaced by the
+subclasses below, which step aside for such requests ("lean routes", see
+``lean_route()``): a safe request under /api/ (the REST and MOOChub APIs)
+without a session cookie. Admin and HTML pages, writes and logged-in users
+keep the full stack.
+
+On lean routes LeanContentNegotiation also skips content negotiation for the
+common case, a client accepting JSON: there is no Accept header to parse and
+the browsable API is never considered. Browsers asking for HTML with the
+browsable API enabled get the full stack, which that API needs for its forms.
+"""
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, csrf
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from core.db import SAFE_METHODS
+
+LEAN_PREFIXES = ('/api/',)
+# Accept headers that the first (JSON) renderer answers without negotiation.
+PLAIN_ACCEPTS = ('', '*/*', 'application/json')
+
+
+def wants_browsable_api(request):
+    return settings.BROWSABLE_API and (
+        'text/html' in request.META.get('HTTP_ACCEPT', '') or request.GET.get('format') == 'api'
+    )
+
+
+def lean_route(request):
+    """Return whether ``request`` is served by the lean stack; decided once per request."""
+    try:
+        return request.lean_route
+    except AttributeError:
+        request.lean_route = bool(
+            settings.LEAN_API_MIDDLEWARE
+            and request.method in SAFE_METHODS
+            and request.path_info.startswith(LEAN_PREFIXES)
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not wants_browsable_api(request)
+        )
+        return request.lean_route
+
+
+class FullStackOnly:
+    """Mixin for MiddlewareMixin classes that lean routes skip."""
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if lean_route(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if lean_route(request):
+            return await self.get_response(request)
+        return await super().__acall__(request)
+
+
+class SessionMiddleware(FullStackOnly, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(FullStackOnly, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if lean_route(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(FullStackOnly, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(FullStackOnly, messages.MessageMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(FullStackOnly, clickjacking.XFrameOptionsMiddleware):
+    pass
+
+
+class LeanContentNegotiation(DefaultContentNegotiation):
+    """Answer plain JSON requests on lean routes with the first renderer, without negotiating."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        if (
+            getattr(request._request, 'lean_route', False)
+            and not format_suffix
+            and self.settings.URL_FORMAT_OVERRIDE not in request.query_params
+            and request.META.get('HTTP_ACCEPT', '').strip() in PLAIN_ACCEPTS
+        ):
+            renderer = renderers[0]
+            if renderer.media_type == 'application/json':
+                return renderer, renderer.media_type
+        return super().select_renderer(request, renderers, format_suffix)
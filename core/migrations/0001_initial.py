@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_url', models.CharField(max_length=500, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64)),
+                ('extension', models.CharField(blank=True, max_length=8)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('is_valid', models.BooleanField(default=False)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('checked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_changelogentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HarvestSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('enabled', models.BooleanField(default=True)),
+                ('validators', models.JSONField(blank=True, default=dict, editable=False)),
+                ('last_harvested_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('ok', 'OK'), ('not modified', 'Not modified'), ('failed', 'Failed')], editable=False, max_length=20)),
+                ('last_error', models.TextField(blank=True, editable=False)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_harvestsource'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('generation', models.BigIntegerField(default=0)),
+                ('data', models.JSONField(default=dict, editable=False)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,3 +1,131 @@
 from django.db import models
 
-# Create your models here.
+
+class ImageAsset(models.Model):
+    """
+    Outcome of running an ``image_url`` through the image pipeline (core/images.py).
+
+    Renditions are stored under MEDIA_ROOT keyed by ``content_hash``, so URLs
+    pointing at identical images share the same files.
+    """
+    source_url = models.CharField(max_length=500, unique=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    extension = models.CharField(max_length=8, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    is_valid = models.BooleanField(default=False)
+    error = models.CharField(max_length=255, blank=True)
+    checked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.source_url
+
+
+class ChangeLogEntry(models.Model):
+    """
+    One change to a MOOChub resource, recorded by core/changes.py.
+
+    ``seq`` only ever grows, so harvesters can ask for everything after the last
+    entry they have seen. Compaction removes entries superseded by a later
+    entry for the same resource.
+    """
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(UPSERT, 'Upsert'), (DELETE, 'Delete')]
+
+    seq = models.BigAutoField(primary_key=True)
+    collection = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "change log entries"
+        indexes = [
+            models.Index(fields=['collection', 'object_id'], name='changelog_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.collection}/{self.object_id}"
+
+
+class HarvestSource(models.Model):
+    """
+    A partner LMS whose MOOChub feed is pulled by ``manage.py harvest`` (core/harvest.py).
+
+    ``url`` is the first page of a MOOChub courses or persons collection.
+    ``validators`` keeps the ETag, Last-Modified and next link of every page
+    fetched last time, so unchanged pages are answered with 304 Not Modified.
+    """
+    OK = 'ok'
+    NOT_MODIFIED = 'not modified'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(OK, 'OK'), (NOT_MODIFIED, 'Not modified'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=100, unique=True)
+    url = models.URLField(max_length=500)
+    enabled = models.BooleanField(default=True)
+    validators = models.JSONField(default=dict, blank=True, editable=False)
+    last_harvested_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, editable=False)
+    last_error = models.TextField(blank=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+
+class AnalyticsReport(models.Model):
+    """
+    A stored analytics report, e.g. the collaboration report of core/analytics.py.
+
+    ``generation`` is the change log sequence number the report was computed
+    at; ``manage.py refresh_analytics`` recomputes it.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    generation = models.BigIntegerField(default=0)
+    data = models.JSONField(default=dict, editable=False)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+
+class RequestProfile(models.Model):
+    """
+    A sampling profile of one request, taken on demand by a staff user (core/profiling.py).
+
+    ``stacks`` holds the samples in collapsed-stack format, one
+    ``root;...;leaf <count>`` line per distinct stack.
+    """
+    created_at = models.DateTimeField(auto_now_add=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    username = models.CharField(max_length=150, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    duration_ms = models.FloatField(default=0)
+    interval_ms = models.FloatField(default=0)
+    samples = models.PositiveIntegerField(default=0)
+    stacks = models.TextField(blank=True, editable=False)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path}"
+
+
+class ViewProfile(models.Model):
+    """
+    Samples of one view aggregated by continuous low-rate profiling (core/profiling.py).
+
+    ``stacks`` is in collapsed-stack format like RequestProfile.stacks.
+    """
+    view = models.CharField(max_length=200, unique=True)
+    requests = models.PositiveIntegerField(default=0)
+    samples = models.PositiveIntegerField(default=0)
+    stacks = models.TextField(blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.view
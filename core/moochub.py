@@ -0,0 +1,172 @@
+"""
+Shared building blocks for the MOOChub JSON:API endpoints.
+
+This file contains the paginator and the read-only base viewset used by the
+MOOChub course, person, PhD student and organization APIs. The paginator builds
+the whole JSON:API envelope (``jsonapi``, ``data``, ``links`` and, on request,
+``meta``) in a single pass, so each page is serialized exactly once.
+"""
+
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+from rest_framework import viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.catalog import SnapshotReadsMixin
+from core.db import ReplicaReadsMixin
+from core.filters import DeclarativeFilterBackend
+
+JSONAPI_VERSION = {"version": "1.0"}
+
+# Collection name -> MOOChub viewset, as published under /api/moochub/<name>/.
+COLLECTIONS = {
+    'courses': 'courses.api_views.MOOChubCourseViewSet',
+    'persons': 'professors.api_views.MOOChubPersonViewSet',
+    'students': 'phd_students.api_views.MOOChubPhDStudentViewSet',
+    'organizations': 'research_groups.api_views.MOOChubOrganizationViewSet',
+}
+
+
+def jsonapi_document(data, links=None, meta=None):
+    """Return a MOOChub JSON:API top-level document."""
+    document = {"jsonapi": JSONAPI_VERSION, "data": data}
+    if links is not None:
+        document["links"] = links
+    if meta is not None:
+        document["meta"] = meta
+    return document
+
+
+class MOOChubPagination(BasePagination):
+    """
+    Page-number pagination that renders MOOChub JSON:API envelopes.
+
+    Pages are fetched with one extra row to find out whether a next page exists,
+    so no COUNT query is needed. ``meta.total`` (which does need one) is only
+    added when the client asks for it with ``?meta=total``.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = 'page'
+    meta_query_param = 'meta'
+
+    def get_page_size(self, request):
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        raw_page = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(raw_page)
+        except (TypeError, ValueError):
+            raise NotFound("Invalid page.")
+        if self.page_number < 1:
+            raise NotFound("Invalid page.")
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound("Invalid page.")
+        self.has_next = len(rows) > page_size
+
+        self.total = None
+        if 'total' in request.query_params.getlist(self.meta_query_param):
+            self.total = queryset.count()
+        return rows[:page_size]
+
+    def get_links(self):
+        url = self.request.build_absolute_uri()
+        links = {"self": url}
+        if self.has_next:
+            links["next"] = replace_query_param(url, self.page_query_param, self.page_number + 1)
+        if self.page_number > 1:
+            if self.page_number == 2:
+                links["prev"] = remove_query_param(url, self.page_query_param)
+            else:
+                links["prev"] = replace_query_param(url, self.page_query_param, self.page_number - 1)
+        return links
+
+    def get_paginated_response(self, data):
+        meta = {"total": self.total} if self.total is not None else None
+        return Response(jsonapi_document(data, links=self.get_links(), meta=meta))
+
+
+class MOOChubViewSet(SnapshotReadsMixin, ReplicaReadsMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only base ViewSet for the MOOChub-compatible APIs.
+
+    Subclasses set ``queryset`` and ``serializer_path``, the dotted path of their
+    MOOChub serializer. The serializer is imported on first use so that workers
+    don't load it at startup (see core/startup.py).
+
+    List pages accept the filters declared in ``filter_spec`` (core/filters.py).
+    Reads go to the read replica when one is configured (core/db.py), or to the
+    catalog snapshot when that is enabled (core/catalog.py).
+
+    Optionally, ``compiled_serializer_path`` names a CompiledSerializer
+    (core/compiled.py) that list pages use instead of the DRF serializer,
+    except for pages served from the snapshot, which has no rows to compile.
+    """
+
+    pagination_class = MOOChubPagination
+    filter_backends = [DeclarativeFilterBackend]
+    serializer_path = None
+    compiled_serializer_path = None
+
+    def get_serializer_class(self):
+        return import_string(self.serializer_path)
+
+    def get_compiled_serializer(self):
+        """Return the compiled serializer for list pages, or None."""
+        if self.compiled_serializer_path is None:
+            return None
+        compiled_class = import_string(self.compiled_serializer_path)
+        return compiled_class(context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        """Return a page of resources as a MOOChub JSON:API document."""
+        queryset = self.filter_queryset(self.get_queryset())
+        compiled = self.get_compiled_serializer() if isinstance(queryset, QuerySet) else None
+        if compiled is not None:
+            rows = compiled.prepare(queryset)
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                return self.get_paginated_response(compiled.serialize(page))
+            return Response(jsonapi_document(compiled.serialize(rows)))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(jsonapi_document(serializer.data))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return a single resource as a MOOChub JSON:API document."""
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(jsonapi_document(serializer.data, links={"self": request.build_absolute_uri()}))
+
+
+def get_collection_view(collection, request):
+    """Return the MOOChub viewset of ``collection``, set up as for a list request."""
+    return import_string(COLLECTIONS[collection])(
+        request=request, format_kwarg=None, action='list', kwargs={},
+    )
+
+
+def serialize_resources(view, queryset):
+    """Serialize ``queryset`` with the view's compiled serializer, or its DRF serializer."""
+    compiled = view.get_compiled_serializer()
+    if compiled is not None:
+        return compiled.serialize(compiled.prepare(queryset))
+    return view.get_serializer(queryset, many=True).data
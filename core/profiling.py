@@ -0,0 +1,299 @@
+"""
+Sampling profiler for live requests.
+
+This file contains ProfilingMiddleware and the sampler behind it. A staff user
+sends ``X-Profile: 1`` (or ``?profile=1``) with any request; a background
+thread then records the stack of the thread serving it every
+PROFILING_INTERVAL_MS, and the samples are stored as a RequestProfile, whose
+id comes back in the ``X-Profile-Id`` header. The admin offers each profile
+as collapsed stacks (for flamegraph.pl, speedscope, etc.) and as a speedscope
+JSON file.
+
+With PROFILING_CONTINUOUS_INTERVAL_MS set, one sampler thread per process
+also samples every request at that (low) rate. Samples are aggregated per view
+in memory and merged into the view's ViewProfile row every
+PROFILING_FLUSH_SECONDS; the admin shows the hot frames of each view.
+
+Sampling reads other threads' frames with ``sys._current_frames()`` and never
+traces the request, so the request runs at full speed between samples. Only
+sync request handling is profiled; streamed response bodies are produced after
+the middleware returns and are not part of the profile.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+# Frames kept per sample, counted from the innermost one.
+MAX_DEPTH = 128
+# Distinct stacks kept per ViewProfile, most frequent first.
+MAX_STACKS = 5000
+LABEL_RE = re.compile(r'^(?P<name>.*) \((?P<file>.*):(?P<line>\d+)\)$')
+
+_labels = {}
+
+
+def short_path(filename):
+    """Return ``filename`` relative to the project or its site-packages directory."""
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base + os.sep):
+        return filename[len(base) + 1:]
+    _, marker, rest = filename.rpartition('site-packages' + os.sep)
+    return rest if marker else filename
+
+
+def frame_label(code):
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, 'co_qualname', code.co_name)
+        label = _labels[code] = f"{name} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def stack_of(frame):
+    """Return the collapsed ``root;...;leaf`` stack of ``frame``."""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class Sampler(threading.Thread):
+    """
+    Background thread counting the stacks of watched threads every ``interval`` seconds.
+
+    ``watch()`` starts counting the calling thread into a fresh Counter and
+    returns it; ``unwatch()`` stops.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name='profiling-sampler', daemon=True)
+        self.interval = interval
+        self.watched = {}
+        self.stopped = threading.Event()
+
+    def watch(self):
+        stacks = Counter()
+        self.watched[threading.get_ident()] = stacks
+        return stacks
+
+    def unwatch(self):
+        self.watched.pop(threading.get_ident(), None)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            watched = self.watched.copy()
+            if not watched:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stacks in watched.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[stack_of(frame)] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def collapsed(stacks, limit=None):
+    """Return ``stacks`` in collapsed-stack format, most frequent first."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common(limit))
+
+
+def parse_collapsed(text):
+    stacks = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack:
+            stacks[stack] += int(count)
+    return stacks
+
+
+def speedscope(stacks, name, interval_ms):
+    """Return ``stacks`` as a speedscope sampled profile (https://www.speedscope.app/)."""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in stacks.most_common():
+        ids = []
+        for label in stack.split(';'):
+            if label not in index:
+                index[label] = len(frames)
+                match = LABEL_RE.match(label)
+                frames.append(
+                    {'name': match['name'], 'file': match['file'], 'line': int(match['line'])}
+                    if match else {'name': label}
+                )
+            ids.append(index[label])
+        samples.append(ids)
+        weights.append(count * interval_ms)
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'lms-consolidator',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+
+def hot_frames(stacks, limit=20):
+    """Return (frame, self samples, total samples) for the frames most often on top of the stack."""
+    own = Counter()
+    total = Counter()
+    for stack, count in stacks.items():
+        labels = stack.split(';')
+        own[labels[-1]] += count
+        for label in set(labels):
+            total[label] += count
+    return [(label, count, total[label]) for label, count in own.most_common(limit)]
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ''
+    return match.view_name or match._func_path
+
+
+def profile_requested(request):
+    """Return whether ``request`` asks for a profile and comes from an active staff user."""
+    wanted = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    if not wanted or wanted.lower() in ('0', 'false', 'no'):
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+def profile_request(get_response, request):
+    """Run ``request`` under its own sampler and store a RequestProfile."""
+    from core.models import RequestProfile
+
+    interval_ms = settings.PROFILING_INTERVAL_MS
+    sampler = Sampler(interval_ms / 1000)
+    stacks = sampler.watch()
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        response = get_response(request)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        sampler.stop()
+    profile = RequestProfile.objects.create(
+        method=request.method,
+        path=request.get_full_path()[:500],
+        view=view_name(request)[:200],
+        username=request.user.get_username(),
+        status_code=response.status_code,
+        duration_ms=round(duration_ms, 3),
+        interval_ms=interval_ms,
+        samples=sum(stacks.values()),
+        stacks=collapsed(stacks),
+    )
+    response['X-Profile-Id'] = str(profile.pk)
+    return response
+
+
+_sampler = None
+_lock = threading.Lock()
+# View name -> [requests, stacks] not yet merged into ViewProfile rows.
+_pending = defaultdict(lambda: [0, Counter()])
+_flushed_at = time.monotonic()
+
+
+def continuous_sampler():
+    """Return the process's low-rate sampler, starting it first; None if continuous profiling is off."""
+    global _sampler
+    if not settings.PROFILING_CONTINUOUS_INTERVAL_MS:
+        return None
+    if _sampler is None:
+        with _lock:
+            if _sampler is None:
+                _sampler = Sampler(settings.PROFILING_CONTINUOUS_INTERVAL_MS / 1000)
+                _sampler.start()
+    return _sampler
+
+
+def record(view, stacks):
+    with _lock:
+        entry = _pending[view]
+        entry[0] += 1
+        entry[1].update(stacks)
+
+
+def flush_view_profiles():
+    """Merge the samples aggregated in this process into ViewProfile rows; return how many views were written."""
+    from django.db import transaction
+
+    from core.models import ViewProfile
+
+    global _pending, _flushed_at
+    with _lock:
+        pending, _pending = _pending, defaultdict(lambda: [0, Counter()])
+        _flushed_at = time.monotonic()
+    for view, (requests, stacks) in pending.items():
+        with transaction.atomic():
+            profile, _created = ViewProfile.objects.select_for_update().get_or_create(view=view)
+            merged = parse_collapsed(profile.stacks)
+            merged.update(stacks)
+            profile.requests += requests
+            profile.samples += sum(stacks.values())
+            profile.stacks = collapsed(merged, MAX_STACKS)
+            profile.save()
+    return len(pending)
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests on demand for staff users, and continuously at a low rate if configured.
+
+    Must come after AuthenticationMiddleware, which sets ``request.user``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if profile_requested(request):
+            return profile_request(self.get_response, request)
+        sampler = continuous_sampler()
+        if sampler is None:
+            return self.get_response(request)
+        stacks = sampler.watch()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.unwatch()
+        view = view_name(request)
+        if view:
+            record(view, stacks)
+        if time.monotonic() - _flushed_at >= settings.PROFILING_FLUSH_SECONDS:
+            flush_view_profiles()
+        return response
+
+    async def __acall__(self, request):
+        # Coroutines share threads; a thread's stack says nothing about one request.
+        return await self.get_response(request)
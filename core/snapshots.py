@@ -0,0 +1,193 @@
+"""
+Static MOOChub snapshots.
+
+This file contains the exporter that renders the complete MOOChub collections
+into pre-paginated JSON:API files which a web server or CDN can serve without
+touching Django. Each page is written next to its precompressed ``.gz`` (and
+``.br`` when the optional ``brotli`` package is installed) variants, always
+through a temporary file and an atomic rename.
+
+Exports are incremental: ``manifest.json`` records the content hash of every
+page, and pages whose hash didn't change are left alone. Unchanged files keep
+their bytes and modification time, so the ETags derived from them stay stable.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from urllib.parse import urljoin, urlsplit
+
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from core.moochub import COLLECTIONS, get_collection_view, jsonapi_document
+
+MANIFEST_NAME = 'manifest.json'
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def page_path(collection, number):
+    """Return the path of a page relative to the snapshot root."""
+    return f"{collection}/page-{number}.json"
+
+
+def content_etag(data):
+    """Return the strong ETag of a file's uncompressed contents."""
+    return '"%s"' % hashlib.sha256(data).hexdigest()[:32]
+
+
+def compress(data):
+    """
+    Return {suffix: compressed bytes} for every available encoding.
+
+    Output is deterministic (no timestamps), so unchanged pages compress to
+    identical files.
+    """
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        return variants
+    variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` so that readers only ever see a complete file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            output.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def remove_file(path):
+    for name in (path, *(path + suffix for suffix in COMPRESSED_SUFFIXES)):
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            pass
+
+
+class SnapshotExporter:
+    """
+    Render the MOOChub collections into ``root``.
+
+    ``base_url`` is where ``root`` is served (used for the pagination links) and
+    ``site_url`` the scheme and host of the site, used for resource URLs.
+    """
+
+    def __init__(self, root, base_url, site_url, page_size=100):
+        self.root = os.fspath(root)
+        self.site_url = site_url.rstrip('/')
+        self.base_url = urljoin(self.site_url + '/', base_url.rstrip('/') + '/')
+        self.page_size = page_size
+        self.renderer = JSONRenderer()
+
+    def get_request(self):
+        parts = urlsplit(self.site_url)
+        request = RequestFactory(HTTP_HOST=parts.netloc).get('/', secure=parts.scheme == 'https')
+        return Request(request)
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME), 'rb') as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def export(self, collections=None):
+        """
+        Export ``collections`` (all by default) and return a summary.
+
+        The summary maps each collection to {'pages', 'total', 'written'}.
+        """
+        manifest = self.load_manifest()
+        files = manifest.get('files', {})
+        summary = manifest.get('collections', {})
+        request = self.get_request()
+
+        for collection in collections or COLLECTIONS:
+            total, pages = self.render_collection(collection, request)
+            written = 0
+            for number, data in enumerate(pages, start=1):
+                path = page_path(collection, number)
+                etag = content_etag(data)
+                if files.get(path) == etag and os.path.exists(os.path.join(self.root, path)):
+                    continue
+                self.write_page(path, data)
+                files[path] = etag
+                written += 1
+
+            # Drop pages left over from a larger previous snapshot.
+            number = len(pages) + 1
+            while page_path(collection, number) in files:
+                remove_file(os.path.join(self.root, page_path(collection, number)))
+                del files[page_path(collection, number)]
+                number += 1
+
+            summary[collection] = {
+                'pages': len(pages),
+                'total': total,
+                'written': written,
+            }
+
+        manifest = {
+            'generated_at': timezone.now().isoformat(),
+            'page_size': self.page_size,
+            'collections': summary,
+            'files': files,
+        }
+        write_atomic(
+            os.path.join(self.root, MANIFEST_NAME),
+            json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'),
+        )
+        return summary
+
+    def write_page(self, path, data):
+        target = os.path.join(self.root, path)
+        for suffix, compressed in compress(data).items():
+            write_atomic(target + suffix, compressed)
+        write_atomic(target, data)
+
+    def render_collection(self, collection, request):
+        """
+        Return (number of resources, [page bytes, ...]) for ``collection``.
+
+        Pages are rendered with the collection's viewset queryset and serializer
+        (the compiled one if it has one), so they match the live API. They carry
+        no ``meta.total``: a new resource would otherwise change every page.
+        """
+        viewset = get_collection_view(collection, request)
+        queryset = viewset.get_queryset()
+        compiled = viewset.get_compiled_serializer()
+        rows = compiled.prepare(queryset) if compiled is not None else queryset
+        total = queryset.count()
+        page_count = max(1, -(-total // self.page_size))
+
+        pages = []
+        for number in range(1, page_count + 1):
+            offset = (number - 1) * self.page_size
+            page = list(rows[offset:offset + self.page_size])
+            if compiled is not None:
+                data = compiled.serialize(page)
+            else:
+                data = viewset.get_serializer(page, many=True).data
+
+            links = {"self": self.base_url + page_path(collection, number)}
+            if number < page_count:
+                links["next"] = self.base_url + page_path(collection, number + 1)
+            if number > 1:
+                links["prev"] = self.base_url + page_path(collection, number - 1)
+            pages.append(self.renderer.render(jsonapi_document(data, links=links)))
+        return total, pages
@@ -0,0 +1,16 @@
+from django import template
+
+from core.images import rendition_url
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail(url, size='thumb'):
+    """
+    Return the cached rendition of an image URL.
+
+    Usage: {{ professor.image_url|thumbnail:"medium" }}. Broken images resolve to
+    an empty string so templates can skip the <img> tag.
+    """
+    return rendition_url(url, size)
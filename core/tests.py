@@ -1,3 +1,966 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Permission, User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import analytics, autocomplete, catalog, profiling
+from core.admin_tools import ESTIMATE_THRESHOLD, EstimatedCountPaginator
+from core.batch import run_batch
+from core.changes import compact_changes, latest_sequence
+from core.db import PIN_COOKIE, ReplicaRouter, replica_reads
+from core.harvest import Harvester
+from core.images import RENDITION_SIZES, collect_image_urls, process_image, rendition_name
+from core.importers import CatalogImporter, CatalogValidator
+from core.loaders import RelationLoader
+from core.live import hub
+from core.matching import AMBIGUOUS, LINKED, UNMATCHED, NameIndex
+from core.models import ChangeLogEntry, HarvestSource, ImageAsset, RequestProfile, ViewProfile
+from core.snapshots import SnapshotExporter
+from courses.models import Course
+from phd_students.models import PhDStudent
+from professors.models import Professor
+from relations.models import CourseResearch, ProfessorCourse
+from research_groups.models import ResearchGroup
+
+
+class SnapshotExporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.courses = [Course.objects.create(name=f'Course {i}', code=f'C{i}') for i in range(5)]
+
+    def export(self, page_size=2):
+        exporter = SnapshotExporter(self.root, '/moochub/', 'https://lms.example.org', page_size)
+        return exporter.export(['courses'])['courses']
+
+    def read(self, name):
+        with open(os.path.join(self.root, 'courses', name), 'rb') as handle:
+            return handle.read()
+
+    def test_pages_match_the_api(self):
+        summary = self.export()
+        self.assertEqual(summary, {'pages': 3, 'total': 5, 'written': 3})
+
+        first = json.loads(self.read('page-1.json'))
+        self.assertEqual([course['courseCode'] for course in first['data']], ['C0', 'C1'])
+        self.assertEqual(first['links'], {
+            'self': 'https://lms.example.org/moochub/courses/page-1.json',
+            'next': 'https://lms.example.org/moochub/courses/page-2.json',
+        })
+        self.assertTrue(first['data'][0]['url'].startswith('https://lms.example.org/courses/'))
+        self.assertEqual(gzip.decompress(self.read('page-1.json.gz')), self.read('page-1.json'))
+
+    def test_only_changed_pages_are_rewritten(self):
+        self.export()
+        self.assertEqual(self.export()['written'], 0)
+
+        course = self.courses[3]
+        course.name = 'Renamed'
+        course.save()
+        self.assertEqual(self.export()['written'], 1)
+
+    def test_stale_pages_are_removed(self):
+        self.export()
+        Course.objects.filter(pk__in=[c.pk for c in self.courses[2:]]).delete()
+        self.assertEqual(self.export()['pages'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'courses', 'page-3.json')))
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'courses', 'page-3.json.gz')))
+
+
+@override_settings(CHANGE_FEED_COMMIT_LAG_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ada = Professor.objects.create(title='Prof.', name='Ada', position='Chair')
+        self.course = Course.objects.create(name='Machine Learning', code='ML1')
+        ProfessorCourse.objects.create(professor=self.ada, course=self.course)
+
+    def get_changes(self, since):
+        response = self.client.get('/api/moochub/changes/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_full_sync_returns_each_resource_once(self):
+        document = self.get_changes(0)
+        records = [(r['collection'], r['id'], r['action']) for r in document['data']]
+        self.assertEqual(records, [
+            ('persons', self.ada.pk, 'upsert'),
+            ('courses', self.course.pk, 'upsert'),
+        ])
+        self.assertEqual(document['data'][1]['resource']['instructor'][0]['name'], 'Prof. Ada')
+        self.assertEqual(document['meta']['latest'], latest_sequence())
+        self.assertTrue(document['links']['next'].endswith(f"since={latest_sequence()}"))
+
+    def test_embedding_resources_and_tombstones(self):
+        since = latest_sequence()
+        self.ada.name = 'Ada L.'
+        self.ada.save()
+        records = [(r['collection'], r['action']) for r in self.get_changes(since)['data']]
+        self.assertEqual(records, [('persons', 'upsert'), ('courses', 'upsert')])
+
+        since = latest_sequence()
+        course_id = self.course.pk
+        self.course.delete()
+        records = [(r['collection'], r['id'], r['action']) for r in self.get_changes(since)['data']]
+        self.assertEqual(records, [('courses', course_id, 'delete')])
+
+    def moved_organizations(self, since):
+        return sorted(r['id'] for r in self.get_changes(since)['data'] if r['collection'] == 'organizations')
+
+    def test_moves_between_groups_change_both_organizations(self):
+        g1 = ResearchGroup.objects.create(name='Vision')
+        g2 = ResearchGroup.objects.create(name='Robotics')
+        student = PhDStudent.objects.create(name='Grace', research_group=g1)
+        self.ada.leads_research_group = g1
+        self.ada.save()
+
+        since = latest_sequence()
+        student.research_group = g2
+        student.save()
+        self.assertEqual(self.moved_organizations(since), [g1.pk, g2.pk])
+
+        since = latest_sequence()
+        self.ada.leads_research_group = g2
+        self.ada.save()
+        self.assertEqual(self.moved_organizations(since), [g1.pk, g2.pk])
+
+    def test_bulk_import_moves_change_both_organizations(self):
+        g1 = ResearchGroup.objects.create(name='Vision')
+        g2 = ResearchGroup.objects.create(name='Robotics')
+        PhDStudent.objects.create(name='Grace', research_group=g1)
+        since = latest_sequence()
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'phd_students.csv'), 'w', encoding='utf-8') as handle:
+                handle.write("name,research_group\nGrace,Robotics\n")
+            CatalogImporter(workers=1).import_directory(directory)
+        self.assertEqual(PhDStudent.objects.get().research_group, g2)
+        self.assertEqual(self.moved_organizations(since), [g1.pk, g2.pk])
+
+    def test_compaction_keeps_newest_entry_per_resource(self):
+        self.course.name = 'Deep Learning'
+        self.course.save()
+        before = self.get_changes(0)['data']
+
+        self.assertGreater(compact_changes(), 0)
+        self.assertEqual(ChangeLogEntry.objects.count(), 2)
+        self.assertEqual(self.get_changes(0)['data'], before)
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get('/api/moochub/changes/', {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHANGE_FEED_COMMIT_LAG_SECONDS=60)
+    def test_entries_within_the_commit_lag_are_held_back(self):
+        document = self.get_changes(0)
+        self.assertEqual(document['data'], [])
+        self.assertEqual(document['meta']['latest'], 0)
+        self.assertTrue(document['links']['next'].endswith("since=0"))
+
+        # Entries older than the window are served up to the first recent one,
+        # even when later entries are old too (e.g. a slow commit in between).
+        self.course.name = 'Deep Learning'
+        self.course.save()
+        seqs = sorted(ChangeLogEntry.objects.values_list('seq', flat=True))
+        old = timezone.now() - datetime.timedelta(seconds=120)
+        ChangeLogEntry.objects.exclude(seq=seqs[1]).update(changed_at=old)
+        document = self.get_changes(0)
+        self.assertEqual([record['seq'] for record in document['data']], seqs[:1])
+        self.assertEqual(document['meta']['latest'], seqs[0])
+
+        ChangeLogEntry.objects.update(changed_at=old)
+        self.assertEqual(self.get_changes(0)['meta']['latest'], seqs[-1])
+
+
+class LiveChangesTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name='Machine Learning', code='ML1')
+
+    def test_long_poll_returns_pending_changes(self):
+        response = self.client.get('/api/live/changes/', {'since': 0})
+        self.assertEqual(response.status_code, 200)
+        events = response.json()['data']
+        self.assertEqual([(e['collection'], e['id']) for e in events], [('courses', self.course.pk)])
+        self.assertTrue(response.json()['links']['next'].endswith(f"since={events[-1]['seq']}"))
+
+    def test_long_poll_times_out_without_changes(self):
+        response = self.client.get('/api/live/changes/', {'since': latest_sequence(), 'timeout': 0})
+        self.assertEqual(response.json()['data'], [])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get('/api/live/changes/', {'since': '-1'})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_event_stream_pushes_published_changes(self):
+        response = await self.async_client.get('/api/live/changes/', headers={'Accept': 'text/event-stream'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content
+        self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+
+        event = {"seq": 10 ** 9, "collection": "courses", "id": self.course.pk, "action": "upsert"}
+        hub.publish([event])
+        self.assertEqual(await anext(chunks), f"id: {10 ** 9}\nevent: change\ndata: {json.dumps(event)}\n\n".encode())
+
+    async def test_event_stream_sends_heartbeats_and_resyncs_slow_clients(self):
+        with mock.patch('core.api_views.HEARTBEAT_SECONDS', 0.01):
+            response = await self.async_client.get('/api/live/changes/', headers={'Accept': 'text/event-stream'})
+            chunks = response.streaming_content
+            await anext(chunks)
+            self.assertEqual(await anext(chunks), b': heartbeat\n\n')
+
+            hub.publish([
+                {"seq": -i, "collection": "courses", "id": i, "action": "upsert"} for i in range(1, 200)
+            ])
+            self.assertEqual(await anext(chunks), b'event: resync\ndata: {}\n\n')
+
+
+class ReplicaRoutingTests(TestCase):
+    def route(self, request):
+        with replica_reads(request):
+            return ReplicaRouter().db_for_read(Course), ReplicaRouter().db_for_read(Session)
+
+    @override_settings(REPLICA_DATABASE='replica')
+    def test_public_reads_go_to_the_replica(self):
+        factory = RequestFactory()
+        self.assertEqual(self.route(factory.get('/courses/')), ('replica', None))
+        self.assertEqual(self.route(factory.post('/courses/')), (None, None))
+        self.assertEqual(ReplicaRouter().db_for_read(Course), None)
+
+    @override_settings(REPLICA_DATABASE='replica')
+    def test_writers_are_pinned_to_default(self):
+        response = self.client.post('/api/courses/', {'name': 'Statistics', 'code': 'ST1'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = RequestFactory().get('/courses/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.route(request), (None, None))
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_without_replica_everything_reads_default(self):
+        self.assertEqual(self.route(RequestFactory().get('/courses/')), (None, None))
+
+    @override_settings(READ_ONLY_MODE=True)
+    def test_read_only_mode_refuses_writes(self):
+        self.assertEqual(self.client.post('/api/courses/', {'name': 'Statistics'}).status_code, 405)
+        self.assertEqual(self.client.get('/api/courses/').status_code, 200)
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.org', 'secret'))
+
+    def add_rows(self, start, stop):
+        for i in range(start, stop):
+            group = ResearchGroup.objects.create(name=f'Group {i}')
+            professor = Professor.objects.create(
+                title='Prof.', name=f'Professor {i}', position='Chair',
+                image_url=f'https://example.org/{i}.jpg', research_group=group,
+            )
+            PhDStudent.objects.create(name=f'Student {i}', research_group=group, supervisor=professor)
+            course = Course.objects.create(name=f'Course {i}', code=f'C{i}')
+            ProfessorCourse.objects.create(professor=professor, course=course)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_queries_per_page_do_not_grow_with_rows(self):
+        urls = [
+            '/admin/phd_students/phdstudent/', '/admin/professors/professor/',
+            '/admin/courses/course/', '/admin/relations/professorcourse/',
+            '/admin/phd_students/phdstudent/?q=Student',
+        ]
+        self.add_rows(0, 2)
+        before = [self.count_queries(url) for url in urls]
+        self.add_rows(2, 8)
+        cache.clear()
+        self.assertEqual([self.count_queries(url) for url in urls], before)
+
+    def test_large_unfiltered_tables_are_estimated(self):
+        self.add_rows(0, 3)
+        queryset = Course.objects.order_by('pk')
+        with mock.patch('core.admin_tools.estimate_row_count', return_value=ESTIMATE_THRESHOLD * 5):
+            self.assertEqual(EstimatedCountPaginator(queryset, 10).count, ESTIMATE_THRESHOLD * 5)
+            self.assertEqual(EstimatedCountPaginator(queryset.filter(code='C1'), 10).count, 1)
+        self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 3)
+
+
+class CatalogImportTests(TestCase):
+    def write(self, directory, name, text):
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as handle:
+            handle.write(text)
+
+    def test_import_and_reimport_upsert_by_natural_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.write(directory, 'professors.csv', "name,title,position\nAda,Prof.,Chair\nAlan,Dr.,Lecturer\n")
+            self.write(directory, 'courses.csv', (
+                "name,code,credits,start_date\n"
+                "Databases,DB1,5,2025-04-01\n"
+                "Compilers,CC1,six,2025-04-01\n"
+                "Networks,NW1,4,someday\n"
+            ))
+            results = CatalogImporter(workers=2, chunk_size=1).import_directory(directory)
+            counts = {result.entity: (result.rows, result.created, result.updated) for result in results}
+            self.assertEqual(counts, {'professors': (2, 2, 0), 'courses': (3, 1, 0)})
+            courses = next(result for result in results if result.entity == 'courses')
+            self.assertEqual(sorted(courses.errors), [
+                (3, "credits 'six' is not an integer"),
+                (4, "start_date 'someday' is not a YYYY-MM-DD date"),
+            ])
+
+            self.write(directory, 'professors.csv', "name,title,position\nAda,Prof. Dr.,Chair\nGrace,Dr.,Lecturer\n")
+            results = CatalogImporter(workers=1).import_directory(directory)
+            counts = {result.entity: (result.created, result.updated) for result in results}
+            self.assertEqual(counts, {'professors': (1, 1), 'courses': (0, 1)})
+        self.assertEqual(Professor.objects.count(), 3)
+        self.assertEqual(Professor.objects.get(name='Ada').title, 'Prof. Dr.')
+        self.assertEqual(Course.objects.get().credits, 5)
+
+
+class ImportValidationTests(TestCase):
+    def setUp(self):
+        ResearchGroup.objects.create(name='Vision')
+        Professor.objects.create(title='Prof.', name='Ada', position='Chair')
+
+    def validate(self, entity, text):
+        return CatalogValidator().validate_rows(entity, csv.DictReader(StringIO(text)))
+
+    def test_reports_every_problem_without_writing(self):
+        result = self.validate('courses', (
+            "name,code,credits,start_date,image_url\n"
+            "Vision,V1,5,2024-10-01,https://example.org/a.jpg\n"
+            ",V2,five,2024-13-01,ftp://example.org/a.jpg\n"
+            "Vision,V1,5,2024-10-01,\n"
+        ))
+        self.assertEqual(result.rows, 3)
+        self.assertEqual(result.errors, [
+            (3, "credits 'five' is not an integer"),
+            (3, "image_url 'ftp://example.org/a.jpg' is not an http(s) URL"),
+            (3, "name is required"),
+            (3, "start_date '2024-13-01' is not a YYYY-MM-DD date"),
+            (4, "duplicate code/name (first on line 2)"),
+        ])
+        self.assertFalse(Course.objects.exists())
+
+    def test_foreign_keys_are_checked_against_known_names(self):
+        result = self.validate('phd_students', (
+            "name,research_group,supervisor\n"
+            "Grace,Vision,Ada\n"
+            "Alan,Robotics,Nobody\n"
+        ))
+        self.assertEqual(result.errors, [
+            (3, "research_group 'Robotics' does not exist"),
+            (3, "supervisor 'Nobody' does not exist"),
+        ])
+
+    def test_names_from_earlier_files_are_known(self):
+        validator = CatalogValidator()
+        validator.validate_rows('research_groups', csv.DictReader(StringIO("name\nRobotics\n")))
+        result = validator.validate_rows('phd_students', csv.DictReader(StringIO("name,research_group\nAlan,Robotics\n")))
+        self.assertEqual(result.errors, [])
+
+    def test_misspelled_names_from_earlier_files_are_matched(self):
+        validator = CatalogValidator()
+        validator.validate_rows('professors', csv.DictReader(StringIO("title,name\nProf. Dr.,Hans Müller\n")))
+        validator.validate_rows('courses', csv.DictReader(StringIO("name,code\nVision,V1\n")))
+        result = validator.validate_rows('professor_courses', csv.DictReader(StringIO(
+            "professor,course\nHans Mueller,Vision\nNobody,Vision\n"
+        )))
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(result.errors[0][0], 3)
+        self.assertIn("professor 'Nobody' does not exist", result.errors[0][1])
+
+    def test_admin_validate_only_upload_reports_without_importing(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.org', 'secret'))
+        upload = StringIO("name,code,credits,start_date\nVision,V1,5,2024-10-01\nRobotics,R1,2,soon\n")
+        upload.name = 'courses.csv'
+        response = self.client.post(
+            '/admin/courses/course/import-csv/', {'csv_file': upload, 'validate_only': 'on'}, follow=True,
+        )
+        self.assertContains(response, "Line 3: start_date &#x27;soon&#x27; is not a YYYY-MM-DD date")
+        self.assertContains(response, "Found 1 errors in 2 rows; nothing was imported.")
+        self.assertFalse(Course.objects.exists())
+
+    def test_admin_upload_imports_without_validating(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.org', 'secret'))
+        # Duplicates are an error for the validator, but plain uploads import
+        # every row as they always have.
+        upload = StringIO("name,code,credits\nVision,V1,5\nVision,V1,5\n")
+        upload.name = 'courses.csv'
+        response = self.client.post('/admin/courses/course/import-csv/', {'csv_file': upload}, follow=True)
+        self.assertContains(response, "Imported 2 courses")
+        self.assertEqual(Course.objects.filter(code='V1').count(), 2)
+
+
+class NameMatchingTests(TestCase):
+    def test_titles_umlauts_and_typos(self):
+        index = NameIndex([(1, 'Prof. Dr. Hans Müller'), (2, 'Dr. Anna Schmidt'), (3, 'Robotics Lab')])
+        for name, key in [('Prof. Dr. Müller', 1), ('Hans Mueller', 1), ('anna schmid', 2), ('Robotic lab', 3)]:
+            match = index.resolve(name)
+            self.assertEqual((match.status, match.key), (LINKED, key), name)
+        self.assertEqual(index.resolve('Nobody').status, UNMATCHED)
+
+    def test_close_candidates_are_ambiguous(self):
+        index = NameIndex([(1, 'Hans Müller'), (2, 'Petra Müller')])
+        match = index.resolve('Prof. Müller')
+        self.assertEqual(match.status, AMBIGUOUS)
+        self.assertEqual({candidate.key for candidate in match.candidates}, {1, 2})
+        self.assertIsNone(match.key)
+
+    def test_admin_import_links_fuzzy_names(self):
+        group = ResearchGroup.objects.create(name='Machine Learning Group')
+        supervisor = Professor.objects.create(title='Prof. Dr.', name='Hans Müller', position='Chair')
+        Professor.objects.create(title='Prof.', name='Petra Müller', position='Chair')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.org', 'secret'))
+
+        upload = StringIO("name,research_group,supervisor\nGrace,machine learning,Prof. Dr. Müller\n")
+        upload.name = 'students.csv'
+        response = self.client.post('/admin/phd_students/phdstudent/import-csv/', {'csv_file': upload}, follow=True)
+        self.assertContains(response, "Line 2: supervisor &#x27;Prof. Dr. Müller&#x27; is ambiguous")
+        student = PhDStudent.objects.get()
+        self.assertEqual((student.research_group, student.supervisor), (group, None))
+
+        upload = StringIO("name,research_group,supervisor\nAlan,machine learning,Hans Mueller\n")
+        upload.name = 'students.csv'
+        self.client.post('/admin/phd_students/phdstudent/import-csv/', {'csv_file': upload})
+        student = PhDStudent.objects.get(name='Alan')
+        self.assertEqual((student.research_group, student.supervisor), (group, supervisor))
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        autocomplete._index = None
+        self.course = Course.objects.create(name='Machine Learning', code='ML1')
+        self.professor = Professor.objects.create(title='Prof.', name='Jürgen Maier', position='Chair')
+        self.group = ResearchGroup.objects.create(name='Learning Systems')
+
+    def suggest(self, **params):
+        response = self.client.get('/api/autocomplete/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(item['type'], item['id']) for item in response.json()['data']]
+
+    def test_prefixes_match_any_word_and_start_of_name_ranks_first(self):
+        self.assertEqual(self.suggest(q='lea'), [
+            ('research_group', self.group.pk), ('course', self.course.pk),
+        ])
+        self.assertEqual(self.suggest(q='ml'), [('course', self.course.pk)])
+        self.assertEqual(self.suggest(q='jurg'), [('professor', self.professor.pk)])
+        self.assertEqual(self.suggest(q='lea', type='course'), [('course', self.course.pk)])
+        self.assertEqual(self.suggest(q=''), [])
+
+    def test_index_is_rebuilt_when_the_catalog_changes(self):
+        self.assertEqual(self.suggest(q='stat'), [])
+        course = Course.objects.create(name='Statistics', code='ST1')
+        self.assertEqual(self.suggest(q='stat'), [('course', course.pk)])
+        with self.assertNumQueries(1):
+            self.suggest(q='stat')
+
+    def test_invalid_type_is_rejected(self):
+        self.assertEqual(self.client.get('/api/autocomplete/', {'q': 'a', 'type': 'room'}).status_code, 400)
+
+    def test_type_filter_applies_before_the_scan_limit(self):
+        entries = [(autocomplete.COURSE, pk, f'Learning {pk}', [f'Learning {pk}']) for pk in range(300)]
+        entries.append((autocomplete.RESEARCH_GROUP, 1, 'Learning Zoo', ['Learning Zoo']))
+        index = autocomplete.PrefixIndex(entries)
+        self.assertEqual(index.search('learning', types={autocomplete.RESEARCH_GROUP}), [
+            (autocomplete.RESEARCH_GROUP, 1, 'Learning Zoo'),
+        ])
+
+    def test_meta_reports_the_index_size(self):
+        meta = self.client.get('/api/autocomplete/', {'q': 'lea'}).json()['meta']
+        self.assertEqual(meta['entries'], 3)
+        self.assertEqual(meta['memory_bytes'], autocomplete.get_index().memory_bytes())
+        self.assertGreater(meta['memory_bytes'], 0)
+
+
+class StandInLMS(BaseHTTPRequestHandler):
+    """Partner LMS serving fixed JSON pages with ETags."""
+
+    pages = {}
+    delays = {}
+    seen = []
+
+    def do_GET(self):
+        self.seen.append((self.path, self.headers.get('If-None-Match')))
+        time.sleep(self.delays.get(self.path, 0))
+        if self.path not in self.pages:
+            self.send_error(500)
+            return
+        body = json.dumps(self.pages[self.path]).encode()
+        etag = '"%d"' % hash(body)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.api+json')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HarvestTests(TestCase):
+    def setUp(self):
+        StandInLMS.pages = {
+            '/persons/': {"data": [{"type": "Person", "name": "Ada", "honorificPrefix": "Prof."}]},
+            '/courses/': {
+                "data": [{
+                    "type": "courses", "id": "1",
+                    "attributes": {
+                        "type": "Course", "name": "Machine Learning", "courseCode": "ML1",
+                        "startDate": ["2024-10-01T09:00:00Z"], "courseMode": ["asynchronous"],
+                        "instructor": [{"type": "Person", "name": "Prof. Ada"}],
+                    },
+                }],
+                "links": {"next": "/courses/?page=2"},
+            },
+            '/courses/?page=2': {"data": [{"type": "Course", "name": "Statistics", "courseCode": "ST1"}]},
+        }
+        StandInLMS.delays = {}
+        StandInLMS.seen = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInLMS)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def source(self, name, path):
+        return HarvestSource.objects.create(name=name, url=f'http://127.0.0.1:{self.server.server_port}{path}')
+
+    def test_pages_are_followed_upserted_and_fetched_conditionally(self):
+        sources = [self.source('persons', '/persons/'), self.source('courses', '/courses/')]
+        results = {result.source.name: result for result in Harvester(workers=2).harvest(sources)}
+        self.assertEqual((results['courses'].pages, results['courses'].created), (2, 2))
+        self.assertEqual(results['courses'].links, 1)
+        course = Course.objects.get(code='ML1')
+        self.assertEqual((course.format, str(course.start_date)), ('Self-paced', '2024-10-01'))
+        self.assertEqual([str(professor) for professor in course.professors.all()], ['Prof. Ada'])
+
+        StandInLMS.seen = []
+        sources = list(HarvestSource.objects.all())
+        results = Harvester(workers=2).harvest(sources)
+        self.assertEqual({result.status for result in results}, {HarvestSource.NOT_MODIFIED})
+        self.assertEqual(len(StandInLMS.seen), 3)
+        self.assertTrue(all(etag for _path, etag in StandInLMS.seen))
+        self.assertEqual(Course.objects.count(), 2)
+
+    def test_slow_and_failing_sources_do_not_block_others(self):
+        StandInLMS.delays = {'/persons/': 1}
+        sources = [
+            self.source('slow', '/persons/'), self.source('broken', '/missing/'), self.source('courses', '/courses/'),
+        ]
+        started = time.monotonic()
+        results = Harvester(workers=3, request_timeout=0.2).harvest(sources)
+        self.assertLess(time.monotonic() - started, 1)
+        statuses = {result.source.name: result.status for result in results}
+        self.assertEqual(statuses, {'slow': 'failed', 'broken': 'failed', 'courses': 'ok'})
+        self.assertEqual(Course.objects.count(), 2)
+        self.assertIn('HTTP 500', HarvestSource.objects.get(name='broken').last_error)
+
+
+class ImageHost(BaseHTTPRequestHandler):
+    files = {}
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (800, 400), 'red').save(buffer, 'JPEG')
+        ImageHost.files = {'/ada.jpg': buffer.getvalue(), '/broken.jpg': b'not an image'}
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHost)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self, path):
+        return f'http://127.0.0.1:{self.server.server_port}{path}'
+
+    def test_valid_images_get_renditions(self):
+        Professor.objects.create(title='Prof.', name='Ada', position='Chair', image_url=self.url('/ada.jpg'))
+        self.assertEqual(collect_image_urls(), {self.url('/ada.jpg')})
+        # process_images runs this on a thread pool, which can't see this test's rows.
+        asset = process_image(self.url('/ada.jpg'))
+        self.assertEqual((asset.is_valid, asset.width, asset.height, asset.extension), (True, 800, 400, 'jpg'))
+        for size in RENDITION_SIZES:
+            self.assertTrue(os.path.exists(os.path.join(self.media.name, rendition_name(asset.content_hash, size, 'jpg'))))
+
+    def test_invalid_images_and_local_paths_are_recorded_as_broken(self):
+        self.assertIn('cannot identify image', process_image(self.url('/broken.jpg')).error)
+        for url in ('/etc/passwd', 'file:///etc/passwd'):
+            asset = process_image(url)
+            self.assertFalse(asset.is_valid)
+            self.assertEqual(asset.error, "image URL is not an http(s) URL")
+
+
+@override_settings(CATALOG_SNAPSHOT=True, CATALOG_SNAPSHOT_CHECK_SECONDS=0)
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        catalog._snapshot = None
+        self.group = ResearchGroup.objects.create(name='Data Systems', description='Databases')
+        self.professor = Professor.objects.create(
+            title='Prof.', name='Ada Lovelace', position='Chair',
+            research_group=self.group, leads_research_group=self.group,
+        )
+        self.student = PhDStudent.objects.create(name='Grace Hopper', supervisor=self.professor, research_group=self.group)
+        self.course = Course.objects.create(name='Databases', code='DB1', level='Master')
+        ProfessorCourse.objects.create(professor=self.professor, course=self.course)
+        CourseResearch.objects.create(course=self.course, research_group=self.group)
+
+    def get(self, url, queries):
+        self.client.get(url)  # build the snapshot
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_reads_only_check_the_generation(self):
+        # The one query left is the generation check.
+        data = self.get(f'/api/courses/{self.course.pk}/', 1).json()
+        self.assertEqual(data['professor_names'], ['Prof. Ada Lovelace'])
+        self.assertEqual(data['research_group_names'], ['Data Systems'])
+        data = self.get('/api/research_groups/', 1).json()
+        self.assertEqual(data['results'][0]['lead_professor_name'], 'Ada Lovelace')
+        data = self.get('/api/moochub/courses/?meta=total', 1).json()
+        self.assertEqual(data['meta']['total'], 1)
+        self.assertEqual(data['data'][0]['instructor'][0]['name'], 'Prof. Ada Lovelace')
+        data = self.get(f'/api/moochub/students/{self.student.pk}/', 1).json()
+        self.assertEqual(data['data']['mentor']['name'], 'Ada Lovelace')
+        self.assertContains(self.get('/courses/', 1), 'Ada Lovelace')
+        self.assertContains(self.get(f'/research-groups/{self.group.pk}/', 1), 'Grace Hopper')
+        self.assertEqual(self.client.get('/api/courses/999/').status_code, 404)
+
+    def test_snapshot_is_swapped_when_the_catalog_changes(self):
+        self.assertEqual(self.client.get('/api/courses/').json()['count'], 1)
+        Course.objects.create(name='Statistics', code='ST1')
+        self.assertEqual(self.client.get('/api/courses/').json()['count'], 2)
+
+    def test_filters_and_writes_use_the_database(self):
+        self.client.get('/api/courses/')
+        with self.assertNumQueries(3):
+            # Generation check, count and page.
+            self.client.get('/api/courses/', {'level': 'Master'})
+        response = self.client.post('/api/courses/', {'name': 'Statistics'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_mapped_snapshot_matches_the_built_one(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(CATALOG_SNAPSHOT_PATH=root):
+            snapshot = catalog.get_snapshot()
+            self.assertEqual(os.listdir(root), [f'catalog-{latest_sequence()}.bin'])
+            reader = catalog.SnapshotReader(snapshot)
+            student = reader.get('phd_students', self.student.pk)
+            self.assertEqual(student.supervisor.name, 'Ada Lovelace')
+            self.assertEqual([s.name for s in student.research_group.phd_students.all()], ['Grace Hopper'])
+            self.assertEqual(reader.get('courses', self.course.pk).professors.all()[0], self.professor)
+            Course.objects.create(name='Statistics', code='ST1')
+            self.assertEqual(len(catalog.SnapshotReader(catalog.get_snapshot()).list('courses')), 2)
+            self.assertEqual(os.listdir(root), [f'catalog-{latest_sequence()}.bin'])
+
+
+class RelationLoaderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            group = ResearchGroup.objects.create(name=f'Group {i}', description='')
+            professor = Professor.objects.create(
+                title='Prof.', name=f'Professor {i}', position='Chair',
+                research_group=group, leads_research_group=group,
+            )
+            PhDStudent.objects.create(name=f'Student {i}', supervisor=professor, research_group=group)
+            PhDStudent.objects.create(name=f'Student {i}b', research_group=group)
+
+    def test_list_pages_load_each_target_table_once(self):
+        # Count, page and one query per related table, whatever the page size.
+        with self.assertNumQueries(3):
+            data = self.client.get('/api/professors/').json()['results']
+        self.assertEqual([row['research_group_name'] for row in data], [f'Group {i}' for i in range(5)])
+        with self.assertNumQueries(4):
+            data = self.client.get('/api/phd_students/').json()['results']
+        self.assertEqual(data[0]['supervisor_name'], 'Professor 0')
+        self.assertIsNone(data[1]['supervisor_name'])
+
+    def test_reverse_relations_and_shared_instances(self):
+        from research_groups.moochub_serializers import MOOChubOrganizationSerializer
+
+        groups = list(ResearchGroup.objects.order_by('pk'))
+        with self.assertNumQueries(2):
+            data = MOOChubOrganizationSerializer(groups, many=True).data
+        self.assertEqual([member['roleName'] for member in data[0]['member']], ['Lead', 'PhD Student', 'PhD Student'])
+
+        loader = RelationLoader()
+        professors = list(Professor.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            loader.load(professors, ['research_group', 'leads_research_group'])
+        self.assertIs(professors[0].research_group, professors[0].leads_research_group)
+        groups = list(ResearchGroup.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            loader.load(groups, ['phd_students'])
+        with self.assertNumQueries(0):
+            self.assertIs(groups[0].phd_students.all()[0].research_group, groups[0])
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.professor = Professor.objects.create(title='Prof.', name='Ada Lovelace', position='Chair')
+        cls.course = Course.objects.create(name='Databases', code='DB1')
+        ProfessorCourse.objects.create(professor=cls.professor, course=cls.course)
+
+    def batch(self, requests, **options):
+        return self.client.post('/api/batch/', {'requests': requests, **options}, content_type='application/json')
+
+    def test_sub_responses_match_separate_requests(self):
+        paths = [
+            f'/api/courses/{self.course.pk}/',
+            {'path': f'/api/courses/{self.course.pk}/professors/'},
+            '/api/moochub/persons/?meta=total',
+            '/api/courses/999/',
+            '/api/nowhere/',
+        ]
+        response = self.batch(paths)
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([entry['status'] for entry in responses], [200, 200, 200, 404, 404])
+        self.assertEqual(responses[0]['body'], self.client.get(paths[0]).json())
+        self.assertEqual(responses[1]['body'][0]['name'], 'Ada Lovelace')
+        self.assertEqual(responses[2]['body']['meta'], {'total': 1})
+
+    def test_invalid_batches_are_rejected(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch(['/courses/']).status_code, 400)
+        self.assertEqual(self.batch(['/api/batch/']).status_code, 400)
+        self.assertEqual(self.batch(['/api/courses/'] * 26).status_code, 400)
+        self.assertEqual(self.batch(['/api/courses/'], parallel='yes').status_code, 400)
+        self.assertEqual(self.batch(['/api/live/changes/']).json()['responses'][0]['status'], 400)
+
+    def test_parallel_batches_keep_request_order(self):
+        # Routes that don't query: pool threads can't see this test's uncommitted rows.
+        paths = ['/api/nowhere/', '/api/live/changes/', '/api/nowhere/either/']
+        entries = self.batch(paths, parallel=True).json()['responses']
+        self.assertEqual([(entry['path'], entry['status']) for entry in entries], list(zip(paths, [404, 400, 404])))
+
+    @override_settings(REPLICA_DATABASE='replica')
+    def test_parallel_sub_requests_keep_the_outer_replica_routing(self):
+        def route(parent, path, loader=None):
+            return {"path": path, "status": 200, "body": ReplicaRouter().db_for_read(Course)}
+
+        factory = RequestFactory()
+        for request, expected in [
+            (factory.get('/api/batch/'), 'replica'),
+            (factory.get('/api/batch/', HTTP_COOKIE=f'{PIN_COOKIE}=1'), None),
+        ]:
+            with replica_reads(request), mock.patch('core.batch.run_one', route):
+                entries = run_batch(request, ['/api/a/', '/api/b/', '/api/c/'], parallel=True)
+            self.assertEqual([entry['body'] for entry in entries], [expected] * 3)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        analytics._report = None
+        self.ml = ResearchGroup.objects.create(name='Machine Learning')
+        self.db = ResearchGroup.objects.create(name='Databases')
+        self.ada = Professor.objects.create(title='Prof.', name='Ada', position='Chair', research_group=self.ml)
+        self.bob = Professor.objects.create(title='Dr.', name='Bob', position='Lecturer', research_group=self.db)
+        self.cy = Professor.objects.create(title='Dr.', name='Cy', position='Lecturer', leads_research_group=self.ml)
+        self.dee = Professor.objects.create(title='Dr.', name='Dee', position='Lecturer')
+        shared = [Course.objects.create(name=f'Shared {number}') for number in range(2)]
+        solo = Course.objects.create(name='Solo')
+        for course in shared:
+            ProfessorCourse.objects.create(professor=self.ada, course=course)
+            ProfessorCourse.objects.create(professor=self.bob, course=course)
+            CourseResearch.objects.create(course=course, research_group=self.ml)
+            CourseResearch.objects.create(course=course, research_group=self.db)
+        ProfessorCourse.objects.create(professor=self.bob, course=solo)
+        ProfessorCourse.objects.create(professor=self.cy, course=solo)
+        PhDStudent.objects.create(name='Eve', supervisor=self.ada, research_group=self.ml)
+        PhDStudent.objects.create(name='Fay', supervisor=self.ada)
+        PhDStudent.objects.create(name='Gus')
+
+    def test_report_metrics(self):
+        with self.assertNumQueries(5):
+            report = analytics.compute_report()
+        summary = report['summary']
+        self.assertEqual(summary['coteaching_pairs'], 2)
+        self.assertEqual(summary['components'], 2)
+        self.assertEqual(summary['largest_component'], 3)
+        self.assertEqual(summary['isolated_professors'], 1)
+        self.assertEqual(summary['group_bridges'], 1)
+        self.assertEqual((summary['max_supervision_load'], summary['unsupervised_students']), (2, 1))
+        professors = {row['id']: row for row in report['professors']}
+        ada, bob, dee = professors[self.ada.pk], professors[self.bob.pk], professors[self.dee.pk]
+        self.assertEqual((ada['coteachers'], ada['shared_courses'], ada['cross_group_coteachers']), (1, 2, 1))
+        self.assertEqual(ada['supervised_students'], 2)
+        self.assertEqual(bob['coteachers'], 2)
+        self.assertEqual(bob['eigenvector_centrality'], 1.0)
+        self.assertEqual(ada['component'], professors[self.cy.pk]['component'])
+        self.assertNotEqual(ada['component'], dee['component'])
+        self.assertEqual(dee['eigenvector_centrality'], 0.0)
+        self.assertEqual(report['top_coteaching'][0], {'professors': sorted([self.ada.pk, self.bob.pk]), 'courses': 2})
+        self.assertEqual(report['top_bridges'], [{'research_groups': sorted([self.ml.pk, self.db.pk]), 'courses': 2}])
+
+    def test_coteachers_without_a_group_are_not_cross_group(self):
+        course = Course.objects.create(name='Seminar')
+        ProfessorCourse.objects.create(professor=self.bob, course=course)
+        ProfessorCourse.objects.create(professor=self.dee, course=course)
+        professors = {row['id']: row for row in analytics.compute_report()['professors']}
+        bob, dee = professors[self.bob.pk], professors[self.dee.pk]
+        self.assertEqual((bob['name'], dee['name']), ('Dr. Bob', 'Dr. Dee'))
+        self.assertEqual((bob['coteachers'], bob['cross_group_coteachers']), (3, 2))
+        self.assertEqual((dee['coteachers'], dee['cross_group_coteachers']), (1, 0))
+
+    def test_endpoint_serves_the_stored_report_until_refreshed(self):
+        data = self.client.get('/api/analytics/').json()
+        self.assertFalse(data['meta']['stale'])
+        self.assertEqual(data['data']['summary']['professors'], 4)
+        Professor.objects.create(title='', name='Hal', position='Lecturer')
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/analytics/').json()
+        self.assertEqual(data['data']['summary']['professors'], 4)
+        out = StringIO()
+        call_command('refresh_analytics', stdout=out)
+        self.assertIn('5 professors', out.getvalue())
+        data = self.client.get('/api/analytics/').json()
+        self.assertEqual(data['data']['summary']['professors'], 5)
+        self.assertIn('Hal', [row['name'] for row in data['data']['professors']])
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', password='secret', is_staff=True)
+        Course.objects.create(name='Databases')
+
+    def test_sampler_records_the_stacks_of_watched_threads(self):
+        sampler = profiling.Sampler(0.001)
+        stacks = sampler.watch()
+        sampler.start()
+        busy(0.05)
+        sampler.unwatch()
+        sampler.stop()
+        self.assertGreater(sum(stacks.values()), 0)
+        self.assertTrue(all(stack.split(';')[-1].startswith('busy (core/tests.py:') for stack in stacks))
+        data = profiling.speedscope(stacks, 'busy', 1.0)
+        self.assertEqual(data['profiles'][0]['endValue'], sum(stacks.values()))
+        self.assertIn({'name': 'busy', 'file': 'core/tests.py', 'line': busy.__code__.co_firstlineno},
+                      data['shared']['frames'])
+        self.assertEqual(profiling.parse_collapsed(profiling.collapsed(stacks)), stacks)
+
+    def test_staff_requests_are_profiled_on_demand(self):
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/courses/', HTTP_X_PROFILE='1'))
+        self.client.force_login(self.staff)
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/courses/'))
+        response = self.client.get('/api/courses/?profile=1')
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((profile.view, profile.status_code, profile.username), ('course-list', 200, 'staff'))
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_profiles_download_from_the_admin(self):
+        profile = RequestProfile.objects.create(
+            method='GET', path='/api/courses/', view='course-list', interval_ms=2, samples=3,
+            stacks='main;handler;view 2\nmain;handler 1\n',
+        )
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.org', 'secret'))
+        base = f'/admin/core/requestprofile/{profile.pk}/'
+        self.assertContains(self.client.get(f'{base}change/'), 'Hot frames')
+        self.assertEqual(self.client.get(f'{base}download/collapsed/').content, profile.stacks.encode())
+        data = json.loads(self.client.get(f'{base}download/speedscope/').content)
+        self.assertEqual(data['profiles'][0]['weights'], [4, 2])
+        self.assertEqual([frame['name'] for frame in data['shared']['frames']], ['main', 'handler', 'view'])
+
+    def test_profile_downloads_need_view_permission(self):
+        profile = RequestProfile.objects.create(method='GET', path='/api/courses/', stacks='main 1\n')
+        self.client.force_login(self.staff)
+        for kind in ('collapsed', 'speedscope'):
+            url = f'/admin/core/requestprofile/{profile.pk}/download/{kind}/'
+            self.assertEqual(self.client.get(url).status_code, 403)
+        self.staff.user_permissions.add(Permission.objects.get(codename='view_requestprofile'))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(PROFILING_CONTINUOUS_INTERVAL_MS=1, PROFILING_FLUSH_SECONDS=0)
+    def test_continuous_profiling_aggregates_per_view(self):
+        profiling._sampler = None
+        try:
+            for _ in range(3):
+                self.client.get('/api/courses/')
+        finally:
+            profiling._sampler.stop()
+            profiling._sampler = None
+        profile = ViewProfile.objects.get(view='course-list')
+        self.assertEqual(profile.requests, 3)
+        self.assertEqual(profile.samples, sum(profiling.parse_collapsed(profile.stacks).values()))
+
+
+class LeanMiddlewareTests(TestCase):
+    def setUp(self):
+        Course.objects.create(name='Databases')
+
+    def test_anonymous_api_reads_skip_the_full_stack(self):
+        response = self.client.get('/api/courses/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.wsgi_request.lean_route)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertTrue(response.wsgi_request.user.is_anonymous)
+        self.assertNotIn('X-Frame-Options', response)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_other_requests_keep_the_full_stack(self):
+        self.assertIn('X-Frame-Options', self.client.get('/courses/'))
+        self.assertIn('X-Frame-Options', self.client.post('/api/courses/', {'name': 'Compilers'}))
+        with override_settings(LEAN_API_MIDDLEWARE=False):
+            self.assertIn('X-Frame-Options', self.client.get('/api/courses/'))
+        with override_settings(BROWSABLE_API=True):
+            self.assertFalse(self.client.get('/api/courses/', HTTP_ACCEPT='text/html').wsgi_request.lean_route)
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        response = self.client.get('/api/courses/')
+        self.assertFalse(response.wsgi_request.lean_route)
+        self.assertTrue(response.wsgi_request.user.is_staff)
@@ -5,10 +5,13 @@ from django.shortcuts import render, redirect
 from django.urls import path
 from .models import Course
 from core.admin_forms import CsvImportForm
+from core.admin_tools import CatalogAdmin
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(CatalogAdmin):
     list_display = ['name', 'code', 'credits']
+    import_entity = 'courses'
+    search_fields = ['name', 'code']
 
     def get_urls(self):
         urls = super().get_urls()
@@ -25,6 +28,9 @@ class CourseAdmin(admin.ModelAdmin):
                 # Use utf-8-sig to handle BOM
                 decoded_file = io.TextIOWrapper(csv_file, encoding='utf-8-sig')
                 reader = csv.DictReader(decoded_file)
+                if form.cleaned_data['validate_only']:
+                    self.validate_csv(request, reader)
+                    return redirect(".")
 
                 count = 0
                 for row in reader:
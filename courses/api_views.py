@@ -5,14 +5,52 @@ This file contains ViewSets and API views that handle HTTP requests and response
 for the courses API endpoints.
 """
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import DateField
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from core.catalog import SnapshotReadsMixin
+from core.db import ReadOnlyModeMixin
+from core.facets import BucketFacet, FacetedListMixin, FieldFacet, RelationFacet
+from core.filters import (
+    CHOICE_LOOKUPS, RANGE_LOOKUPS, DeclarativeFilterBackend, FieldFilter, IntervalFilter, RelationFilter,
+)
+from core.moochub import MOOChubViewSet
+from relations.models import CourseResearch, ProfessorCourse
+
 from .models import Course
-from .serializers import CourseSerializer, CourseListSerializer, MOOChubCourseSerializer
+from .schedule import MAX_CALENDAR_DAYS, get_interval_index
+from .serializers import CourseCalendarSerializer, CourseSerializer, CourseListSerializer
+from .similarity import similar_courses
+
+# Query parameters accepted by the course APIs, e.g.
+# /api/courses/?level__in=Master,MBA&start_date__gte=2025-04-01&professor=3
+# or /api/courses/?active__overlaps=2025-05-01,2025-05-31 for courses running in May.
+COURSE_FILTERS = {
+    'level': FieldFilter('level', CHOICE_LOOKUPS),
+    'format': FieldFilter('format', CHOICE_LOOKUPS),
+    'code': FieldFilter('code', CHOICE_LOOKUPS),
+    'start_date': FieldFilter('start_date', RANGE_LOOKUPS),
+    'end_date': FieldFilter('end_date', RANGE_LOOKUPS),
+    'active': IntervalFilter('start_date', 'end_date'),
+    'credits': FieldFilter('credits', RANGE_LOOKUPS),
+    'professor': RelationFilter(ProfessorCourse, 'course', 'professor'),
+    'research_group': RelationFilter(CourseResearch, 'course', 'research_group'),
+}
 
-class CourseViewSet(viewsets.ModelViewSet):
+# Facets of the course list, e.g. /api/courses/?level=Master&facets=format,professor
+COURSE_FACETS = {
+    'level': FieldFacet('level'),
+    'format': FieldFacet('format'),
+    'credits': BucketFacet('credits', [('0-2', None, 3), ('3-5', 3, 6), ('6-9', 6, 10), ('10+', 10, None)]),
+    'professor': RelationFacet(ProfessorCourse, 'course', 'professor', label=('title', 'name')),
+    'research_group': RelationFacet(CourseResearch, 'course', 'research_group', label=('name',)),
+}
+
+class CourseViewSet(FacetedListMixin, SnapshotReadsMixin, ReadOnlyModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for Course model.
     
@@ -26,7 +64,9 @@ class CourseViewSet(viewsets.ModelViewSet):
     serializer_class = CourseSerializer
     
     # Add search and filtering capabilities
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DeclarativeFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_spec = COURSE_FILTERS
+    facet_spec = COURSE_FACETS
     search_fields = ['name', 'code', 'description']  # Fields that can be searched
     ordering_fields = ['name', 'start_date', 'level']  # Fields that can be used for ordering
     
@@ -69,69 +109,66 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = ResearchGroupSerializer(groups, many=True)
         return Response(serializer.data)
 
-class MOOChubCourseViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Return the courses most similar to this one, best first, with their scores.
+
+        This is a custom endpoint that will be available at:
+        /api/courses/{id}/similar/
+        The lists are precomputed by the similar_courses command.
+        """
+        course = self.get_object()
+        neighbours = similar_courses(course.pk)
+        data = CourseListSerializer([other for other, _score in neighbours], many=True).data
+        for item, (_other, score) in zip(data, neighbours):
+            item['score'] = score
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Return the courses running between two days, by start date.
+
+        This is a custom endpoint that will be available at:
+        /api/courses/calendar/?from=2025-05-01&to=2025-05-31
+        Both days are included; ``to`` defaults to ``from``. Courses without a
+        start or end date are open-ended on that side.
+        """
+        raw = {'from': request.query_params.get('from', '')}
+        raw['to'] = request.query_params.get('to') or raw['from']
+        days, errors = {}, {}
+        for param, value in raw.items():
+            try:
+                days[param] = DateField().to_python(value.strip() or None)
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+            else:
+                if days[param] is None:
+                    errors[param] = ["Provide a day as YYYY-MM-DD."]
+        if not errors and days['to'] < days['from']:
+            errors['to'] = ["Must not be before from."]
+        elif not errors and (days['to'] - days['from']).days >= MAX_CALENDAR_DAYS:
+            errors['to'] = [f"The calendar covers at most {MAX_CALENDAR_DAYS} days."]
+        if errors:
+            raise ValidationError(errors)
+
+        ids = get_interval_index().overlapping(days['from'], days['to'])
+        courses = Course.objects.in_bulk(ids)
+        # Courses deleted since the index was built are skipped.
+        data = CourseCalendarSerializer([courses[pk] for pk in ids if pk in courses], many=True).data
+        return Response({'from': days['from'], 'to': days['to'], 'count': len(data), 'results': data})
+
+class MOOChubCourseViewSet(MOOChubViewSet):
     """
     ViewSet for MOOChub-compatible Course API.
     
     This ViewSet provides read-only access to courses in a format compatible with
-    the MOOChub schema for interoperability with other platforms.
-    
-    Only 'list' and 'retrieve' actions are available since this is a read-only API.
+    the MOOChub schema for interoperability with other platforms. The JSON:API
+    envelope is built by the shared MOOChubViewSet and MOOChubPagination.
     """
     
-    queryset = Course.objects.all()
-    serializer_class = MOOChubCourseSerializer
-    
-    def list(self, request, *args, **kwargs):
-        """
-        Override list method to format response according to MOOChub JSON:API spec.
-        
-        This ensures the response structure follows the MOOChub requirements,
-        including proper pagination links and metadata.
-        """
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = self.get_paginated_response(serializer.data)
-            
-            # Format according to MOOChub JSON:API spec
-            formatted_data = {
-                "jsonapi": {"version": "1.0"},
-                "data": data.data['results'],
-                "links": {
-                    "self": request.build_absolute_uri(),
-                }
-            }
-            
-            # Add pagination links if available
-            if 'links' in data.data:
-                if data.data['links'].get('next'):
-                    formatted_data['links']['next'] = data.data['links']['next']
-                
-                if data.data['links'].get('previous'):
-                    formatted_data['links']['prev'] = data.data['links']['previous']
-                    
-            return Response(formatted_data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"jsonapi": {"version": "1.0"}, "data": serializer.data})
-    
-    def retrieve(self, request, *args, **kwargs):
-        """
-        Override retrieve method to format single course response according to MOOChub JSON:API spec.
-        """
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        
-        # Format according to MOOChub JSON:API spec
-        formatted_data = {
-            "jsonapi": {"version": "1.0"},
-            "data": serializer.data,
-            "links": {
-                "self": request.build_absolute_uri()
-            }
-        }
-        
-        return Response(formatted_data)
+    queryset = Course.objects.order_by('pk')
+    serializer_path = 'courses.moochub_serializers.MOOChubCourseSerializer'
+    compiled_serializer_path = 'courses.moochub_serializers.CompiledMOOChubCourseSerializer'
+    filter_spec = COURSE_FILTERS
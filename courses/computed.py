@@ -0,0 +1,82 @@
+"""
+Derived MOOChub attributes of courses.
+
+This file contains the rules that turn a course's format, level and credits
+into its MOOChub ``courseMode`` and ``duration``. The results are stored on the
+Course row so the MOOChub API doesn't recompute them per request. Each rule
+exists twice: as a Python function, used when a single course is saved, and as
+a SQL CASE expression, used by the recompute_course_fields command to refresh
+every row with one UPDATE per attribute. courses/tests.py checks they agree.
+"""
+
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce, NullIf
+
+# Course format (compared case-insensitively) -> MOOChub courseMode.
+COURSE_MODES = {
+    'self-paced': 'asynchronous',
+    'scheduled': 'synchronous',
+}
+DEFAULT_COURSE_MODE = 'online'
+
+# Levels whose duration is 25 hours per credit, and no duration without credits.
+CREDIT_LEVELS = ('MBA', 'Master', 'Micro Degree')
+BASICS_LEVEL = 'Basics'
+HOURS_PER_CREDIT = 25
+BASICS_HOURS = 14
+
+# Course fields kept up to date by Course.update_computed_fields().
+COMPUTED_FIELDS = ('course_mode', 'duration_hours')
+
+
+def course_mode(format):
+    """Return the MOOChub courseMode for a course format."""
+    if not format:
+        return DEFAULT_COURSE_MODE
+    return COURSE_MODES.get(format.lower(), DEFAULT_COURSE_MODE)
+
+
+def duration_hours(level, credits):
+    """
+    Return the MOOChub duration of a course in hours, or None.
+
+    - For MBA, Master, and Micro Degree: 1 credit = 25 hours.
+    - For Basics (open courses): always 14 hours.
+    - If level is missing, default to Basics; other levels use their credits
+      if they have any and 14 hours otherwise.
+    """
+    credit_hours = credits * HOURS_PER_CREDIT if credits else None
+    if level in CREDIT_LEVELS:
+        return credit_hours
+    if not level or level == BASICS_LEVEL:
+        return BASICS_HOURS
+    return credit_hours or BASICS_HOURS
+
+
+def course_mode_expression():
+    """SQL equivalent of ``course_mode(F('format'))``."""
+    return Case(
+        *[When(format__iexact=format, then=Value(mode)) for format, mode in COURSE_MODES.items()],
+        default=Value(DEFAULT_COURSE_MODE),
+    )
+
+
+def duration_hours_expression():
+    """SQL equivalent of ``duration_hours(F('level'), F('credits'))``."""
+    credit_hours = NullIf(F('credits'), Value(0)) * Value(HOURS_PER_CREDIT)
+    return Case(
+        When(level__in=CREDIT_LEVELS, then=credit_hours),
+        When(level__in=['', BASICS_LEVEL], then=Value(BASICS_HOURS)),
+        default=Coalesce(credit_hours, Value(BASICS_HOURS)),
+        output_field=IntegerField(),
+    )
+
+
+def recompute_course_fields(queryset):
+    """
+    Recompute the derived columns of every course in ``queryset``.
+
+    Runs one UPDATE per attribute and returns the number of rows updated.
+    """
+    queryset.update(course_mode=course_mode_expression())
+    return queryset.update(duration_hours=duration_hours_expression())
@@ -0,0 +1,26 @@
+"""
+Management command to recompute the derived MOOChub attributes of courses.
+
+Usage:
+    python manage.py recompute_course_fields
+
+Course.save() keeps ``course_mode`` and ``duration_hours`` current for single
+courses; run this after changing the rules in courses/computed.py or after
+writing courses without save() (raw SQL, QuerySet.update()). Every course is
+refreshed with one UPDATE statement per attribute.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.computed import recompute_course_fields
+from courses.models import Course
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed MOOChub courseMode and duration of every course."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = recompute_course_fields(Course.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Recomputed MOOChub fields of {count} courses."))
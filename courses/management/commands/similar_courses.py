@@ -0,0 +1,26 @@
+"""
+Management command to precompute the "similar courses" of every course.
+
+Usage:
+    python manage.py similar_courses [--full] [--k 10]
+
+The first run computes every course; later runs only recompute what the
+courses changed since the last run can affect (see courses/similarity.py).
+Run it from cron after imports and harvests.
+"""
+
+from django.core.management.base import BaseCommand
+
+from courses.similarity import TOP_K, update_similar_courses
+
+
+class Command(BaseCommand):
+    help = "Precompute the most similar courses of each course for course pages and the API."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every course.")
+        parser.add_argument('--k', type=int, default=TOP_K, help="Number of similar courses kept per course.")
+
+    def handle(self, *args, **options):
+        count = update_similar_courses(full=options['full'], k=options['k'])
+        self.stdout.write(self.style.SUCCESS(f"Updated the similar courses of {count} courses."))
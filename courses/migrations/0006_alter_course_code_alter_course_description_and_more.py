@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_merge_20250531_0658'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='code',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='description',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='format',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='start_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
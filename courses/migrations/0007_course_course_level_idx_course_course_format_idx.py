@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_alter_course_code_alter_course_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['level'], name='course_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['format'], name='course_format_idx'),
+        ),
+    ]
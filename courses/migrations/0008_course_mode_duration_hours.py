@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:34
+
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce, NullIf
+
+
+def populate_computed_fields(apps, schema_editor):
+    # The rules of courses/computed.py as they were when the columns were added;
+    # later changes to that module must not change what this migration writes.
+    Course = apps.get_model('courses', 'Course')
+    Course.objects.update(course_mode=Case(
+        When(format__iexact='self-paced', then=Value('asynchronous')),
+        When(format__iexact='scheduled', then=Value('synchronous')),
+        default=Value('online'),
+    ))
+    credit_hours = NullIf(F('credits'), Value(0)) * Value(25)
+    Course.objects.update(duration_hours=Case(
+        When(level__in=['MBA', 'Master', 'Micro Degree'], then=credit_hours),
+        When(level__in=['', 'Basics'], then=Value(14)),
+        default=Coalesce(credit_hours, Value(14)),
+        output_field=models.IntegerField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_course_level_idx_course_course_format_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='course_mode',
+            field=models.CharField(default='online', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='duration_hours',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_computed_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_mode_duration_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarCourses',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='similar', serialize=False, to='courses.course')),
+                ('neighbours', models.JSONField(default=list)),
+                ('generation', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'similar courses',
+            },
+        ),
+    ]
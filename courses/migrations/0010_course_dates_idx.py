@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_similarcourses'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['start_date', 'end_date'], name='course_dates_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from .computed import COMPUTED_FIELDS, course_mode, duration_hours
+
 class Course(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -10,6 +12,9 @@ class Course(models.Model):
     end_date = models.DateField(null=True, blank=True)
     format = models.CharField(max_length=50, blank=True)
     level = models.CharField(max_length=50, blank=True)
+    # MOOChub attributes derived from format, level and credits (see computed.py).
+    course_mode = models.CharField(max_length=20, default='online', editable=False)
+    duration_hours = models.IntegerField(null=True, blank=True, editable=False)
     professors = models.ManyToManyField(
         'professors.Professor',
         related_name='courses',
@@ -21,6 +26,44 @@ class Course(models.Model):
         through='relations.CourseResearch'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['level'], name='course_level_idx'),
+            models.Index(fields=['format'], name='course_format_idx'),
+            # "Running on/between" queries (see courses/schedule.py).
+            models.Index(fields=['start_date', 'end_date'], name='course_dates_idx'),
+        ]
+
     def __str__(self):
         return self.name
-        return self.name
\ No newline at end of file
+
+    def update_computed_fields(self):
+        """Set the derived MOOChub attributes from the current field values."""
+        credits = self._meta.get_field('credits').to_python(self.credits)
+        self.course_mode = course_mode(self.format)
+        self.duration_hours = duration_hours(self.level, credits)
+
+    def save(self, *args, **kwargs):
+        self.update_computed_fields()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *COMPUTED_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class SimilarCourses(models.Model):
+    """
+    Precomputed "similar courses" of a course (see courses/similarity.py).
+
+    ``neighbours`` is a list of [course id, score] pairs, best first.
+    ``generation`` is the change log sequence number the list was computed at.
+    """
+
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True, related_name='similar')
+    neighbours = models.JSONField(default=list)
+    generation = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "similar courses"
+
+    def __str__(self):
+        return f"Courses similar to {self.course_id}"
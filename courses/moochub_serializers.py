@@ -0,0 +1,161 @@
+"""
+MOOChub serializers for the courses app.
+
+This file contains the serializers that render courses in the MOOChub schema.
+They live apart from serializers.py so that workers only import them when the
+MOOChub API is actually used (see core/startup.py).
+"""
+
+from collections import defaultdict
+
+from django.urls import reverse
+from rest_framework import serializers
+
+from courses.models import Course
+from core.compiled import CompiledSerializer, compile_reverse
+from core.images import moochub_image, prefetch_asset_info
+from core.loaders import BatchedListSerializer
+from relations.models import ProfessorCourse
+
+# MOOChub compatible serializer
+class MOOChubCourseSerializer(serializers.ModelSerializer):
+    """
+    Serializer specifically formatted for MOOChub API compatibility.
+    
+    This serializer maps our internal Course model fields to the field names and
+    structure expected by the MOOChub schema for interoperability with other platforms.
+    """
+    
+    # MOOChub specific field mappings
+    type = serializers.SerializerMethodField()
+    courseCode = serializers.CharField(source='code')
+    courseMode = serializers.SerializerMethodField()
+    inLanguage = serializers.SerializerMethodField()
+    startDate = serializers.SerializerMethodField()
+    endDate = serializers.SerializerMethodField()
+    duration = serializers.SerializerMethodField()
+    instructor = serializers.SerializerMethodField()
+    publisher = serializers.SerializerMethodField()
+    url = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Course
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['professors']
+        fields = [
+            'id', 'type', 'name', 'description', 'courseCode', 
+            'courseMode', 'inLanguage', 'startDate', 'endDate',
+            'duration', 'instructor', 'publisher', 'url', 'image',
+            'credits', 'level'
+        ]
+    
+    def get_type(self, obj):
+        """Return the type of resource according to MOOChub schema."""
+        return "Course"
+    
+    def get_courseMode(self, obj):
+        """Return the MOOChub courseMode precomputed from the course format."""
+        return [obj.course_mode]
+    
+    def get_inLanguage(self, obj):
+        """Return the language of the course in ISO format."""
+        # Since our model doesn't have a language field, default to English
+        return ["en"]
+    
+    def get_startDate(self, obj):
+        """Return start date in ISO format as required by MOOChub."""
+        if obj.start_date:
+            return [obj.start_date.isoformat()]
+        return []
+    
+    def get_endDate(self, obj):
+        """Return end date in ISO format as required by MOOChub."""
+        if obj.end_date:
+            return [obj.end_date.isoformat()]
+        return []
+    
+    def get_duration(self, obj):
+        """
+        Return the course duration in ISO 8601 format (hours) for MOOChub.
+
+        The hours are precomputed from the course level and credits; see
+        courses/computed.py for the rules.
+        """
+        hours = obj.duration_hours
+        return f"PT{hours}H" if hours else None
+    
+    def get_instructor(self, obj):
+        """Return instructors in MOOChub format."""
+        instructors = []
+        for professor in obj.professors.all():
+            instructors.append({
+                "type": "Person",
+                "name": str(professor),
+                "honorificPrefix": professor.title if hasattr(professor, 'title') else "",
+            })
+        return instructors
+    
+    def get_publisher(self, obj):
+        """Return publisher information for MOOChub."""
+        return {
+            "type": "Organization",
+            "name": "German University of Digital Science"
+        }
+    
+    def get_url(self, obj):
+        """Return the absolute URL for this course using Django's reverse()."""
+        request = self.context.get('request')
+        url = reverse('course_detail', kwargs={'pk': obj.pk})
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    
+    def get_image(self, obj):
+        """Return image information in MOOChub format, pointing at the cached rendition."""
+        return moochub_image(obj.image_url, self.context.get('request'))
+
+
+class CompiledMOOChubCourseSerializer(CompiledSerializer):
+    """
+    Compiled, read-only version of MOOChubCourseSerializer for list pages.
+
+    Instructors for the whole page are loaded with one query over ProfessorCourse
+    and image renditions with one query over ImageAsset; course URLs are built
+    from a URL template reversed once.
+    """
+
+    serializer_class = MOOChubCourseSerializer
+    row_fields = (
+        'id', 'name', 'description', 'image_url', 'credits', 'code',
+        'start_date', 'end_date', 'level', 'course_mode', 'duration_hours',
+    )
+    constant_fields = ('type', 'inLanguage', 'publisher')
+    relation_fields = {'instructor': 'get_instructor', 'url': 'get_url'}
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.course_url = compile_reverse('course_detail', self.context.get('request'))
+
+    def load_relations(self, rows):
+        """Return {course id: [instructor, ...]} for the courses in ``rows``."""
+        prefetch_asset_info(row['image_url'] for row in rows)
+        instructors = defaultdict(list)
+        links = (
+            ProfessorCourse.objects.filter(course_id__in=[row['id'] for row in rows])
+            .order_by('pk')
+            .values_list('course_id', 'professor__title', 'professor__name')
+        )
+        for course_id, title, name in links:
+            instructors[course_id].append({
+                "type": "Person",
+                "name": f"{title} {name}",
+                "honorificPrefix": title,
+            })
+        return instructors
+
+    def get_instructor(self, row, instructors):
+        return instructors.get(row['id'], [])
+
+    def get_url(self, row, instructors):
+        return self.course_url(row['id'])
@@ -0,0 +1,168 @@
+"""
+Course date ranges: which courses run when.
+
+This file contains IntervalIndex, an in-process interval tree over the
+(start_date, end_date) ranges of all courses behind ``/api/courses/calendar/``,
+and the sweep that finds professors teaching courses with overlapping dates.
+A course without a start date counts as running since forever, one without an
+end date as running for good. A course whose end date comes before its start
+date (nothing stops such rows from being entered) counts as running between
+the two dates; IntervalFilter (core/filters.py) does the same in SQL.
+
+The tree is a centered interval tree: each node keeps the ranges containing
+its center date, sorted by start and by end, and the ranges entirely before or
+after the center in its subtrees. Overlap and "running on" queries touch one
+node per level plus the ranges they report, O(log n + k). Like the
+autocomplete index (core/autocomplete.py), the tree belongs to a catalog
+generation and is rebuilt when the catalog changed.
+"""
+
+import datetime
+import heapq
+import threading
+from collections import defaultdict
+
+OPEN_START = datetime.date.min
+OPEN_END = datetime.date.max
+# Longest range the calendar endpoint answers for.
+MAX_CALENDAR_DAYS = 366
+
+
+def bounds(start, end):
+    """Return (start, end) with open ends filled in and an inverted range swapped."""
+    start, end = start or OPEN_START, end or OPEN_END
+    return (start, end) if start <= end else (end, start)
+
+
+class IntervalNode:
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, intervals):
+        # The median of all endpoints keeps the tree balanced.
+        endpoints = sorted(point for start, end, _key in intervals for point in (start, end))
+        self.center = endpoints[len(endpoints) // 2]
+        here, before, after = [], [], []
+        for interval in intervals:
+            start, end, _key = interval
+            if end < self.center:
+                before.append(interval)
+            elif start > self.center:
+                after.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalNode(before) if before else None
+        self.right = IntervalNode(after) if after else None
+
+
+class IntervalIndex:
+    """Interval tree over (start, end, key) ranges with inclusive ends."""
+
+    def __init__(self, intervals, generation=0):
+        self.generation = generation
+        intervals = [(*bounds(start, end), key) for start, end, key in intervals]
+        self.size = len(intervals)
+        self.root = IntervalNode(intervals) if intervals else None
+
+    def __len__(self):
+        return self.size
+
+    def overlapping(self, low, high):
+        """Return the keys of the ranges sharing at least one day with [low, high], by start date."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if high < node.center:
+                for start, end, key in node.by_start:
+                    if start > high:
+                        break
+                    found.append((start, end, key))
+                if node.left:
+                    stack.append(node.left)
+            elif low > node.center:
+                for start, end, key in node.by_end:
+                    if end < low:
+                        break
+                    found.append((start, end, key))
+                if node.right:
+                    stack.append(node.right)
+            else:
+                found.extend(node.by_start)
+                stack.extend(child for child in (node.left, node.right) if child)
+        found.sort(key=lambda interval: (interval[0], interval[1]))
+        return [key for _start, _end, key in found]
+
+    def running_on(self, day):
+        """Return the keys of the ranges that include ``day``."""
+        return self.overlapping(day, day)
+
+
+def load_intervals():
+    from courses.models import Course
+
+    return Course.objects.values_list('start_date', 'end_date', 'pk').iterator()
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_interval_index():
+    """Return the interval tree of the current catalog generation, rebuilding it if needed."""
+    from core.changes import latest_sequence
+
+    global _index
+    generation = latest_sequence()
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+    with _lock:
+        if _index is None or _index.generation != generation:
+            _index = IntervalIndex(load_intervals(), generation)
+        return _index
+
+
+def overlapping_pairs(intervals):
+    """
+    Return the pairs of keys whose ranges overlap, in one sweep by start date.
+
+    ``intervals`` are (start, end, key) with None for open ends. Ranges still
+    running are kept in a heap by end date, so each range is compared only
+    with those it actually overlaps.
+    """
+    pairs = []
+    running = []
+    intervals = sorted(((*bounds(start, end), key) for start, end, key in intervals), key=lambda interval: interval[:2])
+    for start, end, key in intervals:
+        while running and running[0][0] < start:
+            heapq.heappop(running)
+        pairs.extend((other, key) for _end, other in running)
+        heapq.heappush(running, (end, key))
+    return pairs
+
+
+def professor_overlaps(professor_id=None):
+    """
+    Return {professor id: [(course id, course id), ...]} for professors teaching overlapping courses.
+
+    Reads every teaching assignment with its dates in one query, ordered so
+    each professor's courses are swept in turn.
+    """
+    from relations.models import ProfessorCourse
+
+    links = ProfessorCourse.objects.order_by('professor_id')
+    if professor_id is not None:
+        links = links.filter(professor_id=professor_id)
+    courses = defaultdict(list)
+    for professor, start, end, course in links.values_list(
+        'professor_id', 'course__start_date', 'course__end_date', 'course_id',
+    ).iterator():
+        courses[professor].append((start, end, course))
+    overlaps = {}
+    for professor, intervals in courses.items():
+        pairs = overlapping_pairs(intervals)
+        if pairs:
+            overlaps[professor] = pairs
+    return overlaps
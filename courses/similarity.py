@@ -0,0 +1,189 @@
+"""
+"Similar courses" recommendations.
+
+This file contains the job behind ``manage.py similar_courses``, which
+precomputes the closest courses of every course into SimilarCourses rows so
+course pages look them up with a single query. Two courses are similar when
+their texts are (cosine similarity of TF-IDF vectors over name and
+description, the name counting double) and when they share staff (cosine
+similarity of their sets of professors and research groups); the score is a
+weighted sum of both.
+
+Vectors are sparse dicts and the scores of one course against all others are
+accumulated through inverted indexes (a sparse matrix-vector product), so a
+course is only compared with courses sharing a term, professor or group. Terms
+used by more than MAX_DF_RATIO of all courses are dropped like stop words.
+
+Runs after the first are incremental: only courses changed since the last run
+(per the change log, core/changes.py), courses that listed them, and courses
+they now rank high enough for are recomputed.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from core.matching import TOKEN_RE, fold
+
+TOP_K = 10
+TEXT_WEIGHT = 0.7
+STAFF_WEIGHT = 0.3
+NAME_WEIGHT = 2
+MIN_SCORE = 0.05
+MAX_DF_RATIO = 0.5
+STOPWORDS = {
+    'and', 'the', 'for', 'with', 'from', 'into', 'this', 'that', 'are', 'how', 'you', 'your', 'course',
+    'und', 'der', 'die', 'das', 'mit', 'fur', 'fuer', 'von', 'zur', 'zum', 'ein', 'eine', 'den', 'dem', 'des',
+}
+
+
+def terms(text):
+    return [token for token in TOKEN_RE.findall(fold(text or '')) if len(token) > 2 and token not in STOPWORDS]
+
+
+def normalized(vector):
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+class SimilarityModel:
+    """TF-IDF and staff vectors of every course plus their inverted indexes."""
+
+    def __init__(self, courses, staff):
+        """``courses`` are (id, name, description); ``staff`` maps course ids to sets of staff keys."""
+        self.ids = []
+        counts = []
+        for pk, name, description in courses:
+            self.ids.append(pk)
+            counts.append(Counter(terms(name) * NAME_WEIGHT + terms(description)))
+        self.position = {pk: index for index, pk in enumerate(self.ids)}
+
+        total = len(self.ids)
+        document_frequency = Counter(term for count in counts for term in count)
+        idf = {
+            term: math.log((1 + total) / (1 + df)) + 1
+            for term, df in document_frequency.items()
+            if df <= max(1, MAX_DF_RATIO * total)
+        }
+        self.vectors = [
+            normalized({term: (1 + math.log(n)) * idf[term] for term, n in count.items() if term in idf})
+            for count in counts
+        ]
+        self.postings = defaultdict(list)
+        for index, vector in enumerate(self.vectors):
+            for term, weight in vector.items():
+                self.postings[term].append((index, weight))
+
+        self.staff = [staff.get(pk, frozenset()) for pk in self.ids]
+        self.staff_postings = defaultdict(list)
+        for index, keys in enumerate(self.staff):
+            for key in keys:
+                self.staff_postings[key].append(index)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, index):
+        """Return {other index: score} for every course sharing something with course ``index``."""
+        scores = defaultdict(float)
+        for term, weight in self.vectors[index].items():
+            for other, other_weight in self.postings[term]:
+                scores[other] += TEXT_WEIGHT * weight * other_weight
+        keys = self.staff[index]
+        shared = Counter(other for key in keys for other in self.staff_postings[key])
+        for other, count in shared.items():
+            scores[other] += STAFF_WEIGHT * count / math.sqrt(len(keys) * len(self.staff[other]))
+        scores.pop(index, None)
+        return scores
+
+    def neighbours(self, index, k=TOP_K):
+        """Return the ``k`` best [course id, score] pairs of course ``index``."""
+        best = heapq.nlargest(k, (
+            (score, other) for other, score in self.scores(index).items() if score >= MIN_SCORE
+        ))
+        return [[self.ids[other], round(score, 4)] for score, other in best]
+
+
+def load_model():
+    """Build the SimilarityModel of the current catalog with three queries."""
+    from courses.models import Course
+    from relations.models import CourseResearch, ProfessorCourse
+
+    staff = defaultdict(set)
+    for course_id, professor_id in ProfessorCourse.objects.values_list('course_id', 'professor_id').iterator():
+        staff[course_id].add(f'professor:{professor_id}')
+    for course_id, group_id in CourseResearch.objects.values_list('course_id', 'research_group_id').iterator():
+        staff[course_id].add(f'group:{group_id}')
+    courses = Course.objects.order_by('pk').values_list('pk', 'name', 'description').iterator()
+    return SimilarityModel(courses, staff)
+
+
+def affected_courses(model, stored, changed, k):
+    """
+    Return the indexes of the courses whose neighbours may differ after ``changed`` changed.
+
+    ``stored`` maps course ids to their stored neighbour lists.
+    """
+    affected = {model.position[pk] for pk in changed if pk in model.position}
+    affected.update(
+        model.position[pk] for pk, neighbours in stored.items()
+        if pk in model.position and any(other in changed for other, _score in neighbours)
+    )
+    # Scores are symmetric: a changed course enters the list of every course it
+    # now beats the last neighbour of.
+    for index in list(affected):
+        for other, score in model.scores(index).items():
+            neighbours = stored.get(model.ids[other])
+            if score >= MIN_SCORE and (neighbours is None or len(neighbours) < k or score > neighbours[-1][1]):
+                affected.add(other)
+    return affected
+
+
+def update_similar_courses(full=False, k=TOP_K):
+    """
+    Recompute the SimilarCourses rows that are out of date; return how many were written.
+
+    The first run, and any run with ``full``, recomputes every course.
+    """
+    from django.db import transaction
+
+    from core.changes import latest_sequence
+    from core.models import ChangeLogEntry
+    from courses.models import SimilarCourses
+
+    generation = latest_sequence()
+    stored = dict(SimilarCourses.objects.values_list('course_id', 'neighbours'))
+    since = SimilarCourses.objects.order_by('-generation').values_list('generation', flat=True).first()
+    model = load_model()
+    if full or since is None:
+        affected = range(len(model))
+    else:
+        changed = set(
+            ChangeLogEntry.objects.filter(collection='courses', seq__gt=since).values_list('object_id', flat=True)
+        )
+        if not changed:
+            return 0
+        affected = affected_courses(model, stored, changed, k)
+
+    rows = [
+        SimilarCourses(course_id=model.ids[index], neighbours=model.neighbours(index, k), generation=generation)
+        for index in affected
+    ]
+    with transaction.atomic():
+        SimilarCourses.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True,
+            unique_fields=['course'], update_fields=['neighbours', 'generation'],
+        )
+    return len(rows)
+
+
+def similar_courses(course_id):
+    """Return [(course, score)] for the stored neighbours of a course, best first, with two queries."""
+    from courses.models import Course, SimilarCourses
+
+    neighbours = SimilarCourses.objects.filter(course_id=course_id).values_list('neighbours', flat=True).first()
+    if not neighbours:
+        return []
+    courses = Course.objects.in_bulk([pk for pk, _score in neighbours])
+    # Courses deleted since the last run are skipped.
+    return [(courses[pk], score) for pk, score in neighbours if pk in courses]
@@ -1,3 +1,338 @@
+import datetime
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from courses.computed import recompute_course_fields
+from courses.models import Course, SimilarCourses
+from courses.moochub_serializers import CompiledMOOChubCourseSerializer, MOOChubCourseSerializer
+from courses.schedule import IntervalIndex, overlapping_pairs
+from courses.similarity import update_similar_courses
+from professors.models import Professor
+from relations.models import ProfessorCourse
+
+
+class CompiledMOOChubCourseSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ada = Professor.objects.create(title='Prof. Dr.', name='Ada', position='Chair')
+        alan = Professor.objects.create(title='Dr.', name='Alan', position='Lecturer')
+        courses = [
+            Course.objects.create(
+                name='Machine Learning', description='Intro', code='ML1', credits=6,
+                level='Master', format='Self-paced', image_url='https://example.org/ml.png',
+                start_date=datetime.date(2025, 4, 1), end_date=datetime.date(2025, 7, 31),
+            ),
+            Course.objects.create(name='Basics of Python', level='Basics', format='Scheduled'),
+            Course.objects.create(name='Open Seminar', level='Other', credits=2),
+            Course.objects.create(name='No Level', credits=None),
+            Course.objects.create(name='MBA Finance', level='MBA'),
+        ]
+        ProfessorCourse.objects.create(professor=ada, course=courses[0])
+        ProfessorCourse.objects.create(professor=alan, course=courses[0])
+        ProfessorCourse.objects.create(professor=alan, course=courses[2])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_output_matches_drf_serializer(self):
+        request = Request(APIRequestFactory().get('/api/moochub/courses/'))
+        context = {'request': request}
+        queryset = Course.objects.order_by('pk')
+
+        expected = MOOChubCourseSerializer(queryset, many=True, context=context).data
+        compiled = CompiledMOOChubCourseSerializer(context=context)
+        actual = compiled.serialize(compiled.prepare(queryset))
+
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_list_endpoint_uses_one_query_per_relation(self):
+        # Page (with the look-ahead row), instructors and image assets.
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/moochub/courses/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), 5)
+
+
+class MOOChubPaginationTests(TestCase):
+    url = 'http://testserver/api/moochub/courses/'
+
+    @classmethod
+    def setUpTestData(cls):
+        # Three pages of ten, the last one holding three courses.
+        Course.objects.bulk_create(Course(name=f'Course {number:02}') for number in range(23))
+
+    def setUp(self):
+        cache.clear()
+
+    def get_page(self, query=''):
+        response = self.client.get(f'/api/moochub/courses/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_first_page(self):
+        data = self.get_page()
+        self.assertEqual(data['jsonapi'], {'version': '1.0'})
+        self.assertEqual(len(data['data']), 10)
+        self.assertEqual(data['links'], {'self': self.url, 'next': f'{self.url}?page=2'})
+        self.assertNotIn('meta', data)
+
+    def test_middle_page(self):
+        data = self.get_page('?page=2')
+        self.assertEqual(len(data['data']), 10)
+        self.assertEqual(data['links'], {
+            'self': f'{self.url}?page=2', 'next': f'{self.url}?page=3', 'prev': self.url,
+        })
+
+    def test_last_page(self):
+        data = self.get_page('?page=3&meta=total')
+        self.assertEqual(len(data['data']), 3)
+        self.assertEqual(data['links'], {
+            'self': f'{self.url}?page=3&meta=total', 'prev': f'{self.url}?meta=total&page=2',
+        })
+        self.assertEqual(data['meta'], {'total': 23})
+
+    def test_pages_do_not_overlap(self):
+        ids = [course['id'] for page in (1, 2, 3) for course in self.get_page(f'?page={page}')['data']]
+        self.assertEqual(len(set(ids)), 23)
+
+    def test_invalid_page(self):
+        for page in ('0', '-1', 'two', '4'):
+            response = self.client.get(f'/api/moochub/courses/?page={page}')
+            self.assertEqual(response.status_code, 404, page)
+
+    def test_empty_collection(self):
+        Course.objects.all().delete()
+        data = self.get_page('?meta=total')
+        self.assertEqual(data['data'], [])
+        self.assertEqual(data['links'], {'self': f'{self.url}?meta=total'})
+        self.assertEqual(data['meta'], {'total': 0})
+        self.assertEqual(self.client.get('/api/moochub/courses/?page=2').status_code, 404)
+
+
+class CourseFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ada = Professor.objects.create(title='Prof. Dr.', name='Ada', position='Chair')
+        alan = Professor.objects.create(title='Dr.', name='Alan', position='Lecturer')
+        cls.ml = Course.objects.create(
+            name='Machine Learning', code='ML1', credits=6, level='Master',
+            start_date=datetime.date(2025, 4, 1), end_date=datetime.date(2025, 7, 31),
+        )
+        cls.python = Course.objects.create(
+            name='Basics of Python', code='PY1', credits=3, level='Basics',
+            start_date=datetime.date(2024, 10, 1),
+        )
+        cls.finance = Course.objects.create(name='MBA Finance', code='FI1', level='MBA')
+        cls.ada, cls.alan = ada, alan
+        ProfessorCourse.objects.create(professor=ada, course=cls.ml)
+        ProfessorCourse.objects.create(professor=alan, course=cls.ml)
+        ProfessorCourse.objects.create(professor=alan, course=cls.python)
+
+    def get_codes(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sorted(course['code'] for course in response.json()['results'])
+
+    def test_field_and_range_filters(self):
+        self.assertEqual(self.get_codes('/api/courses/?level__in=Master,MBA'), ['FI1', 'ML1'])
+        self.assertEqual(self.get_codes('/api/courses/?start_date__gte=2025-01-01'), ['ML1'])
+        self.assertEqual(self.get_codes('/api/courses/?credits__lte=3'), ['PY1'])
+        self.assertEqual(self.get_codes('/api/courses/?credits__isnull=true'), ['FI1'])
+
+    def test_relation_filter_does_not_duplicate_rows(self):
+        url = f'/api/courses/?professor__in={self.ada.pk},{self.alan.pk}'
+        self.assertEqual(self.get_codes(url), ['ML1', 'PY1'])
+        self.assertEqual(self.get_codes(f'/api/courses/?professor={self.ada.pk}'), ['ML1'])
+
+    def test_invalid_value_is_rejected(self):
+        response = self.client.get('/api/courses/?start_date__gte=April')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('start_date__gte', response.json())
+
+    def test_facets_count_the_filtered_rows(self):
+        cache.clear()
+        url = '/api/courses/?level__in=Master,Basics&facets=level,credits,professor&page_size=1'
+        # Count, page, generation check and one statement per facet.
+        with self.assertNumQueries(6):
+            data = self.client.get(url).json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['facets']['level'], [{'value': 'Basics', 'count': 1}, {'value': 'Master', 'count': 1}])
+        self.assertEqual(data['facets']['credits'], [{'value': '3-5', 'count': 1}, {'value': '6-9', 'count': 1}])
+        self.assertEqual(data['facets']['professor'], [
+            {'value': self.alan.pk, 'count': 2, 'label': 'Dr. Alan'},
+            {'value': self.ada.pk, 'count': 1, 'label': 'Prof. Dr. Ada'},
+        ])
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(url).json()['facets'], data['facets'])
+        Course.objects.create(name='Deep Learning', level='Master', credits=6)
+        self.assertEqual(self.client.get(url).json()['facets']['credits'][1], {'value': '6-9', 'count': 2})
+
+    def test_unknown_facet_is_rejected(self):
+        response = self.client.get('/api/courses/?facets=level,colour')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('facets', response.json())
+
+
+class CourseComputedFieldsTests(TestCase):
+    # (format, level, credits) -> (MOOChub courseMode, duration)
+    MAPPING = [
+        (('Self-paced', 'Master', 6), ('asynchronous', 'PT150H')),
+        (('self-paced', 'MBA', None), ('asynchronous', None)),
+        (('SCHEDULED', 'Micro Degree', 0), ('synchronous', None)),
+        (('Scheduled', 'Basics', 6), ('synchronous', 'PT14H')),
+        (('', '', 6), ('online', 'PT14H')),
+        (('Blended', 'Other', 2), ('online', 'PT50H')),
+        (('Blended', 'Other', None), ('online', 'PT14H')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        for index, ((format, level, credits), _expected) in enumerate(self.MAPPING):
+            Course.objects.create(name=f'Course {index}', format=format, level=level, credits=credits)
+
+    def get_moochub_fields(self):
+        response = self.client.get('/api/moochub/courses/')
+        return [(course['courseMode'], course['duration']) for course in response.json()['data']]
+
+    def test_mapping_on_save(self):
+        expected = [([mode], duration) for _row, (mode, duration) in self.MAPPING]
+        self.assertEqual(self.get_moochub_fields(), expected)
+
+    def test_bulk_recompute_matches_save(self):
+        saved = list(Course.objects.order_by('pk').values_list('course_mode', 'duration_hours'))
+        Course.objects.update(course_mode='', duration_hours=None)
+
+        self.assertEqual(recompute_course_fields(Course.objects.all()), len(self.MAPPING))
+        recomputed = list(Course.objects.order_by('pk').values_list('course_mode', 'duration_hours'))
+        self.assertEqual(recomputed, saved)
+
+    def test_save_with_update_fields_refreshes_derived_fields(self):
+        course = Course.objects.get(name='Course 0')
+        course.format = 'Scheduled'
+        course.save(update_fields=['format'])
+        course.refresh_from_db()
+        self.assertEqual(course.course_mode, 'synchronous')
+
+
+class SimilarCoursesTests(TestCase):
+    def setUp(self):
+        self.ada = Professor.objects.create(title='Prof.', name='Ada', position='Chair')
+        self.ml = Course.objects.create(name='Machine Learning', description='Neural networks and statistics')
+        self.dl = Course.objects.create(name='Deep Learning', description='Neural networks in practice')
+        self.law = Course.objects.create(name='Contract Law', description='Civil law basics')
+        self.finance = Course.objects.create(name='Corporate Finance', description='Valuation')
+        ProfessorCourse.objects.create(professor=self.ada, course=self.law)
+        ProfessorCourse.objects.create(professor=self.ada, course=self.finance)
+
+    def neighbours(self, course):
+        return [pk for pk, _score in SimilarCourses.objects.get(course=course).neighbours]
+
+    def test_text_and_shared_staff_make_courses_similar(self):
+        self.assertEqual(update_similar_courses(), 4)
+        self.assertEqual(self.neighbours(self.ml), [self.dl.pk])
+        self.assertEqual(self.neighbours(self.law), [self.finance.pk])
+
+        with self.assertNumQueries(3):
+            data = self.client.get(f'/api/courses/{self.ml.pk}/similar/').json()
+        self.assertEqual([item['id'] for item in data], [self.dl.pk])
+        self.assertGreater(data[0]['score'], 0)
+        self.assertContains(self.client.get(f'/courses/{self.dl.pk}/'), 'Similar Courses')
+
+    def test_later_runs_only_recompute_affected_courses(self):
+        update_similar_courses()
+        self.assertEqual(update_similar_courses(), 0)
+        course = Course.objects.create(name='Contract Drafting', description='Writing civil contracts')
+        # The new course and the course it now ranks for.
+        self.assertEqual(update_similar_courses(), 2)
+        self.assertEqual(self.neighbours(course), [self.law.pk])
+        self.assertIn(course.pk, self.neighbours(self.law))
+        self.assertEqual(self.neighbours(self.ml), [self.dl.pk])
+
+
+class CourseScheduleTests(TestCase):
+    def setUp(self):
+        day = datetime.date
+        self.spring = Course.objects.create(name='Spring', start_date=day(2025, 3, 1), end_date=day(2025, 5, 31))
+        self.summer = Course.objects.create(name='Summer', start_date=day(2025, 6, 1), end_date=day(2025, 8, 31))
+        self.open_end = Course.objects.create(name='Ongoing', start_date=day(2025, 5, 15))
+        self.undated = Course.objects.create(name='Undated')
+
+    def ids(self, response):
+        return sorted(item['id'] for item in response.json()['results'])
+
+    def test_interval_index_matches_brute_force(self):
+        day = datetime.date(2025, 1, 1)
+        intervals = [
+            (day + datetime.timedelta(days=number * 37 % 300), day + datetime.timedelta(days=number * 37 % 300 + number % 45), number)
+            for number in range(200)
+        ] + [(None, day, 'open start'), (day, None, 'open end'), (None, None, 'always')]
+        index = IntervalIndex(intervals)
+        for offset in range(0, 400, 7):
+            low = day + datetime.timedelta(days=offset - 30)
+            high = low + datetime.timedelta(days=offset % 20)
+            expected = {
+                key for start, end, key in intervals
+                if (start is None or start <= high) and (end is None or end >= low)
+            }
+            self.assertEqual(set(index.overlapping(low, high)), expected)
+        self.assertEqual(index.running_on(day - datetime.timedelta(days=1)), ['open start', 'always'])
+
+    def test_active_filter_treats_missing_dates_as_open(self):
+        response = self.client.get('/api/courses/', {'active__on': '2025-05-20', 'page_size': 50})
+        self.assertEqual(self.ids(response), [self.spring.pk, self.open_end.pk, self.undated.pk])
+        response = self.client.get('/api/courses/', {'active__overlaps': '2025-09-01,2025-12-31', 'page_size': 50})
+        self.assertEqual(self.ids(response), [self.open_end.pk, self.undated.pk])
+        self.assertEqual(self.client.get('/api/courses/', {'active__overlaps': '2025-09-01'}).status_code, 400)
+
+    def test_calendar_lists_courses_running_between_two_days(self):
+        response = self.client.get('/api/courses/calendar/', {'from': '2025-05-31', 'to': '2025-06-01'})
+        data = response.json()
+        self.assertEqual([item['name'] for item in data['results']], ['Undated', 'Spring', 'Ongoing', 'Summer'])
+        self.assertEqual(data['results'][1]['end_date'], '2025-05-31')
+        self.assertEqual(self.client.get('/api/courses/calendar/').status_code, 400)
+        self.assertEqual(self.client.get('/api/courses/calendar/', {'from': '2025-06-01', 'to': '2025-05-01'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/courses/calendar/', {'from': '2025-01-01', 'to': '2026-06-01'}).status_code, 400)
+
+    def test_inverted_ranges_count_as_running_between_their_dates(self):
+        day = datetime.date
+        inverted = Course.objects.create(name='Inverted', start_date=day(2025, 5, 10), end_date=day(2025, 5, 1))
+        index = IntervalIndex([(day(2025, 5, 10), day(2025, 5, 1), 'inverted')])
+        self.assertEqual(index.running_on(day(2025, 5, 5)), ['inverted'])
+        self.assertEqual(index.running_on(day(2025, 5, 11)), [])
+        self.assertEqual(
+            overlapping_pairs([(day(2025, 5, 10), day(2025, 5, 1), 'a'), (day(2025, 5, 3), day(2025, 5, 4), 'b')]),
+            [('a', 'b')],
+        )
+
+        response = self.client.get('/api/courses/calendar/', {'from': '2025-05-04', 'to': '2025-05-05'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(inverted.pk, [item['id'] for item in response.json()['results']])
+        response = self.client.get('/api/courses/', {'active__on': '2025-05-05', 'page_size': 50})
+        self.assertIn(inverted.pk, self.ids(response))
+        for params in ({'active__on': '2025-05-11'}, {'active__overlaps': '2025-04-01,2025-04-30'}):
+            response = self.client.get('/api/courses/', {**params, 'page_size': 50})
+            self.assertNotIn(inverted.pk, self.ids(response))
 
-# Create your tests here.
+    def test_professor_overlaps(self):
+        day = datetime.date
+        intervals = [
+            (day(2025, 1, 1), day(2025, 1, 5), 'a'), (day(2025, 1, 5), day(2025, 1, 9), 'b'),
+            (day(2025, 1, 10), day(2025, 1, 12), 'c'), (None, day(2025, 1, 2), 'd'),
+        ]
+        self.assertEqual(sorted(map(sorted, overlapping_pairs(intervals))), [['a', 'b'], ['a', 'd']])
+        ada = Professor.objects.create(title='Prof.', name='Ada', position='Chair')
+        bob = Professor.objects.create(title='Dr.', name='Bob', position='Lecturer')
+        for course in (self.spring, self.summer, self.open_end):
+            ProfessorCourse.objects.create(professor=ada, course=course)
+        for course in (self.spring, self.summer):
+            ProfessorCourse.objects.create(professor=bob, course=course)
+        data = self.client.get('/api/professors/overlaps/').json()
+        self.assertEqual([item['id'] for item in data], [ada.pk])
+        self.assertEqual(
+            sorted(map(sorted, data[0]['overlapping_courses'])),
+            sorted([sorted([self.spring.pk, self.open_end.pk]), sorted([self.summer.pk, self.open_end.pk])]),
+        )
@@ -1,14 +1,24 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+
+from core.catalog import catalog_list, catalog_object_or_404
+from core.db import reads_from_replica
+
 from .models import Course
+from .similarity import similar_courses
 
+@reads_from_replica
 def course_list(request):
     view_mode = request.GET.get('view', 'block')
-    courses = Course.objects.all()
+    courses = catalog_list(request, Course)
     return render(request, 'courses/courses_list.html', {
         'courses': courses,
         'view_mode': view_mode,
     })
 
+@reads_from_replica
 def course_detail(request, pk):
-    course = get_object_or_404(Course, pk=pk)
-    return render(request, 'courses/course_detail.html', {'course': course})
\ No newline at end of file
+    course = catalog_object_or_404(request, Course, pk)
+    return render(request, 'courses/course_detail.html', {
+        'course': course,
+        'similar_courses': [other for other, _score in similar_courses(course.pk)],
+    })
\ No newline at end of file
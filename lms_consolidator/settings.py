@@ -54,18 +54,35 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'core.middleware.LeanContentNegotiation',
 }
 
+# The browsable API pulls in forms, templates and template tags on first use;
+# enable it for development only unless explicitly requested.
+BROWSABLE_API = config('BROWSABLE_API', default=DEBUG, cast=bool)
+if BROWSABLE_API:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('rest_framework.renderers.BrowsableAPIRenderer')
+
+# Preload lazily imported modules in the master process of pre-forking servers
+# (see lms_consolidator/wsgi.py and core/startup.py).
+PRELOAD_APP = config('PRELOAD_APP', default=False, cast=bool)
+
+# Anonymous API reads skip sessions, CSRF, authentication, messages and
+# X-Frame-Options; the core.middleware classes are the stock ones with that
+# exception (see core/middleware.py).
+LEAN_API_MIDDLEWARE = config('LEAN_API_MIDDLEWARE', default=True, cast=bool)
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.CsrfViewMiddleware',
+    'core.middleware.AuthenticationMiddleware',
+    'core.middleware.MessageMiddleware',
+    'core.middleware.XFrameOptionsMiddleware',
+    'core.db.ReadYourWritesMiddleware',
+    'core.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'lms_consolidator.urls'
@@ -98,6 +115,43 @@ DATABASES = {
     }
 }
 
+# Optional read replica for public read traffic (see core/db.py). Setting
+# REPLICA_DATABASE_NAME adds a SQLite replica, e.g. a periodically refreshed copy
+# of db.sqlite3; other backends can be added to DATABASES as 'replica' directly.
+REPLICA_DATABASE_NAME = config('REPLICA_DATABASE_NAME', default='')
+if REPLICA_DATABASE_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': REPLICA_DATABASE_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_DATABASE = 'replica' if 'replica' in DATABASES else None
+# How long a client that just wrote something keeps reading from default.
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=60, cast=int)
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+# Serve the catalog without any write routes (no admin, read-only API).
+READ_ONLY_MODE = config('READ_ONLY_MODE', default=False, cast=bool)
+
+# Serve public catalog reads from an in-process snapshot (see core/catalog.py),
+# checked for catalog changes every CATALOG_SNAPSHOT_CHECK_SECONDS. With
+# CATALOG_SNAPSHOT_PATH the snapshot is a file there that all workers mmap.
+CATALOG_SNAPSHOT = config('CATALOG_SNAPSHOT', default=False, cast=bool)
+CATALOG_SNAPSHOT_PATH = config('CATALOG_SNAPSHOT_PATH', default='')
+CATALOG_SNAPSHOT_CHECK_SECONDS = config('CATALOG_SNAPSHOT_CHECK_SECONDS', default=1.0, cast=float)
+
+# The MOOChub change feed (see core/changes.py) only hands out entries older
+# than this, so that transactions still committing cannot be skipped.
+CHANGE_FEED_COMMIT_LAG_SECONDS = config('CHANGE_FEED_COMMIT_LAG_SECONDS', default=5.0, cast=float)
+
+# Sampling profiler (see core/profiling.py). Staff users profile a request with
+# an X-Profile: 1 header, sampled every PROFILING_INTERVAL_MS. A non-zero
+# PROFILING_CONTINUOUS_INTERVAL_MS also samples all requests at that rate and
+# stores per-view aggregates every PROFILING_FLUSH_SECONDS.
+PROFILING_INTERVAL_MS = config('PROFILING_INTERVAL_MS', default=1.0, cast=float)
+PROFILING_CONTINUOUS_INTERVAL_MS = config('PROFILING_CONTINUOUS_INTERVAL_MS', default=0.0, cast=float)
+PROFILING_FLUSH_SECONDS = config('PROFILING_FLUSH_SECONDS', default=60, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -135,8 +189,16 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Static MOOChub snapshots written by `manage.py export_moochub`; serve
+# MOOCHUB_SNAPSHOT_ROOT at MOOCHUB_SNAPSHOT_URL (nginx: `gzip_static on;`).
+MOOCHUB_SNAPSHOT_ROOT = config('MOOCHUB_SNAPSHOT_ROOT', default=os.path.join(BASE_DIR, 'moochub'))
+MOOCHUB_SNAPSHOT_URL = config('MOOCHUB_SNAPSHOT_URL', default='/moochub/')
+# Public scheme and host of the site, for absolute URLs built outside requests.
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
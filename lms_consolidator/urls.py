@@ -5,14 +5,13 @@ This file defines the URL patterns for the entire project,
 including both web interface and API endpoints for all apps.
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from core import views
 
 urlpatterns = [
-    # Django admin interface
-    path('admin/', admin.site.urls),
-    
     # Core application (includes home page and other core functionality)
     path('', include('core.urls')),
     
@@ -29,5 +28,13 @@ urlpatterns = [
         path('', include('courses.api_urls')),
         path('', include('phd_students.api_urls')),
         path('', include('research_groups.api_urls')),
+        path('', include('core.api_urls')),
     ]))
 ]
+
+# Django admin interface; read-only deployments have no write routes.
+if not settings.READ_ONLY_MODE:
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
+# Cached image renditions; served by the web server in production.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_consolidator.settings')
 
 application = get_wsgi_application()
+
+# With PRELOAD_APP enabled, a pre-forking server that imports this module in its
+# master process (e.g. gunicorn --preload) shares one fully imported app with
+# all of its workers.
+if settings.PRELOAD_APP:
+    from core.startup import preload
+
+    preload(application)
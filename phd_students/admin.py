@@ -5,8 +5,8 @@ from django.shortcuts import render, redirect
 from django.urls import path, reverse
 from .models import PhDStudent
 from core.admin_forms import CsvImportForm
-from research_groups.models import ResearchGroup
-from professors.models import Professor
+from core.admin_tools import CatalogAdmin
+from core.importers import CatalogImporter, resolve_name
 
 # Custom admin form: only 'name' is required
 class PhDStudentAdminForm(forms.ModelForm):
@@ -21,9 +21,13 @@ class PhDStudentAdminForm(forms.ModelForm):
                 self.fields[field_name].required = False
 
 @admin.register(PhDStudent)
-class PhDStudentAdmin(admin.ModelAdmin):
+class PhDStudentAdmin(CatalogAdmin):
     form = PhDStudentAdminForm
     list_display = ['name', 'title', 'research_group', 'supervisor']
+    import_entity = 'phd_students'
+    list_select_related = ['research_group', 'supervisor']
+    search_fields = ['name']
+    autocomplete_fields = ['research_group', 'supervisor']
 
     def get_urls(self):
         urls = super().get_urls()
@@ -49,26 +53,31 @@ class PhDStudentAdmin(admin.ModelAdmin):
                 csv_file = form.cleaned_data['csv_file']
                 decoded_file = csv_file.read().decode('utf-8').splitlines()
                 reader = csv.DictReader(decoded_file)
+                if form.cleaned_data['validate_only']:
+                    self.validate_csv(request, reader)
+                    return redirect(".")
+                # Names are resolved against one lookup (and fuzzy index) per
+                # referenced table, built once for the whole file.
+                importer = CatalogImporter(workers=1)
+
+                def resolve(entity, column, row, line):
+                    name = (row.get(column) or '').strip()
+                    if not name:
+                        return None
+                    pk, error = resolve_name(
+                        importer.get_lookup(entity), lambda: importer.get_name_index(entity), name,
+                    )
+                    if error:
+                        self.message_user(request, f"Line {line}: {column} {error}; left empty.", messages.WARNING)
+                    return pk
+
                 count = 0
-                for row in reader:
-                    # Get related objects or set None if not found
-                    research_group = None
-                    supervisor = None
-                    if row.get('research_group'):
-                        try:
-                            research_group = ResearchGroup.objects.get(name=row['research_group'])
-                        except ResearchGroup.DoesNotExist:
-                            research_group = None
-                    if row.get('supervisor'):
-                        try:
-                            supervisor = Professor.objects.get(name=row['supervisor'])
-                        except Professor.DoesNotExist:
-                            supervisor = None
+                for line, row in enumerate(reader, start=2):
                     PhDStudent.objects.create(
                         name=row['name'],
                         title=row.get('title', ''),
-                        research_group=research_group,
-                        supervisor=supervisor,
+                        research_group_id=resolve('research_groups', 'research_group', row, line),
+                        supervisor_id=resolve('professors', 'supervisor', row, line),
                         enrollment_date=row.get('enrollment_date') or None,
                         image_url=row.get('image_url', ''),
                     )
@@ -9,10 +9,35 @@ from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.catalog import SnapshotReadsMixin
+from core.db import ReadOnlyModeMixin
+from core.facets import FacetedListMixin, FieldFacet, YearFacet
+from core.filters import CHOICE_LOOKUPS, RANGE_LOOKUPS, DeclarativeFilterBackend, FieldFilter
+from core.moochub import MOOChubViewSet
+
 from .models import PhDStudent
-from .serializers import PhDStudentSerializer, PhDStudentListSerializer, MOOChubPhDStudentSerializer
+from .serializers import PhDStudentSerializer, PhDStudentListSerializer
+
+# Query parameters accepted by the PhD student APIs, e.g.
+# /api/phd_students/?supervisor__in=1,2&enrollment_date__gte=2023-09-01
+PHD_STUDENT_FILTERS = {
+    'title': FieldFilter('title', CHOICE_LOOKUPS),
+    'supervisor': FieldFilter('supervisor', CHOICE_LOOKUPS + ['isnull']),
+    'research_group': FieldFilter('research_group', CHOICE_LOOKUPS + ['isnull']),
+    'enrollment_date': FieldFilter('enrollment_date', RANGE_LOOKUPS),
+    # Older spellings, still used by existing clients.
+    'supervisor_id': FieldFilter('supervisor'),
+    'research_group_id': FieldFilter('research_group'),
+}
+
+# Facets of the PhD student list, e.g. /api/phd_students/?facets=all
+PHD_STUDENT_FACETS = {
+    'supervisor': FieldFacet('supervisor', label=('title', 'name')),
+    'research_group': FieldFacet('research_group', label=('name',)),
+    'enrollment_year': YearFacet('enrollment_date'),
+}
 
-class PhDStudentViewSet(viewsets.ModelViewSet):
+class PhDStudentViewSet(FacetedListMixin, SnapshotReadsMixin, ReadOnlyModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for PhDStudent model.
     
@@ -26,7 +51,9 @@ class PhDStudentViewSet(viewsets.ModelViewSet):
     serializer_class = PhDStudentSerializer
     
     # Add search and filtering capabilities
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DeclarativeFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_spec = PHD_STUDENT_FILTERS
+    facet_spec = PHD_STUDENT_FACETS
     search_fields = ['name', 'title']  # Fields that can be searched
     ordering_fields = ['name', 'enrollment_date']  # Fields that can be used for ordering
     
@@ -72,92 +99,16 @@ class PhDStudentViewSet(viewsets.ModelViewSet):
             serializer = ResearchGroupSerializer(group)
             return Response(serializer.data)
         return Response({"detail": "No research group found for this student."}, status=404)
-    
-    def get_queryset(self):
-        """
-        Optionally filter the PhD students by supervisor or research group.
-        
-        This allows API endpoints like:
-        /api/phd_students/?supervisor_id=1
-        /api/phd_students/?research_group_id=2
-        """
-        queryset = PhDStudent.objects.all()
-        
-        # Filter by supervisor if provided in query params
-        supervisor_id = self.request.query_params.get('supervisor_id', None)
-        if supervisor_id is not None:
-            queryset = queryset.filter(supervisor_id=supervisor_id)
-        
-        # Filter by research group if provided in query params
-        research_group_id = self.request.query_params.get('research_group_id', None)
-        if research_group_id is not None:
-            queryset = queryset.filter(research_group_id=research_group_id)
-        
-        return queryset
 
-class MOOChubPhDStudentViewSet(viewsets.ReadOnlyModelViewSet):
+class MOOChubPhDStudentViewSet(MOOChubViewSet):
     """
     ViewSet for MOOChub-compatible PhD Student API.
     
     This ViewSet provides read-only access to PhD students in a format compatible with
-    the MOOChub schema for interoperability with other platforms.
-    
-    Only 'list' and 'retrieve' actions are available since this is a read-only API.
+    the MOOChub schema for interoperability with other platforms. The JSON:API
+    envelope is built by the shared MOOChubViewSet and MOOChubPagination.
     """
     
-    queryset = PhDStudent.objects.all()
-    serializer_class = MOOChubPhDStudentSerializer
-    
-    def list(self, request, *args, **kwargs):
-        """
-        Override list method to format response according to MOOChub JSON:API spec.
-        
-        This ensures the response structure follows the MOOChub requirements,
-        including proper pagination links and metadata.
-        """
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = self.get_paginated_response(serializer.data)
-            
-            # Format according to MOOChub JSON:API spec
-            formatted_data = {
-                "jsonapi": {"version": "1.0"},
-                "data": data.data['results'],
-                "links": {
-                    "self": request.build_absolute_uri(),
-                }
-            }
-            
-            # Add pagination links if available
-            if 'links' in data.data:
-                if data.data['links'].get('next'):
-                    formatted_data['links']['next'] = data.data['links']['next']
-                
-                if data.data['links'].get('previous'):
-                    formatted_data['links']['prev'] = data.data['links']['previous']
-                    
-            return Response(formatted_data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"jsonapi": {"version": "1.0"}, "data": serializer.data})
-    
-    def retrieve(self, request, *args, **kwargs):
-        """
-        Override retrieve method to format single PhD student response according to MOOChub JSON:API spec.
-        """
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        
-        # Format according to MOOChub JSON:API spec
-        formatted_data = {
-            "jsonapi": {"version": "1.0"},
-            "data": serializer.data,
-            "links": {
-                "self": request.build_absolute_uri()
-            }
-        }
-        
-        return Response(formatted_data)
+    queryset = PhDStudent.objects.order_by('pk')
+    serializer_path = 'phd_students.moochub_serializers.MOOChubPhDStudentSerializer'
+    filter_spec = PHD_STUDENT_FILTERS
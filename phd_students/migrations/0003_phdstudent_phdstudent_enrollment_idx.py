@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('phd_students', '0002_alter_phdstudent_enrollment_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='phdstudent',
+            index=models.Index(fields=['enrollment_date'], name='phdstudent_enrollment_idx'),
+        ),
+    ]
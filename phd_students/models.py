@@ -21,6 +21,9 @@ class PhDStudent(models.Model):
     class Meta:
         verbose_name = "PhD student"
         verbose_name_plural = "PhD students"
+        indexes = [
+            models.Index(fields=['enrollment_date'], name='phdstudent_enrollment_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} {self.name}".strip()
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+MOOChub serializers for the phd_students app.
+
+This file contains the serializers that render PhD students in the MOOChub schema.
+They live apart from serializers.py so that workers only import them when the
+MOOChub API is actually used (see core/startup.py).
+"""
+
+from rest_framework import serializers
+
+from phd_students.models import PhDStudent
+from core.images import moochub_image
+from core.loaders import BatchedListSerializer
+
+# MOOChub compatible serializer for PhD Students
+class MOOChubPhDStudentSerializer(serializers.ModelSerializer):
+    """
+    Serializer specifically formatted for MOOChub API compatibility.
+    
+    This serializer maps our internal PhDStudent model fields to the field names and
+    structure expected by the MOOChub schema for interoperability with other platforms.
+    """
+    
+    # MOOChub specific field mappings
+    type = serializers.SerializerMethodField()
+    honorificPrefix = serializers.CharField(source='title')
+    affiliation = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
+    mentor = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = PhDStudent
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['supervisor', 'research_group']
+        fields = [
+            'id', 'type', 'name', 'honorificPrefix', 
+            'affiliation', 'image', 'mentor', 'enrollment_date'
+        ]
+    
+    def get_type(self, obj):
+        """Return the type of resource according to MOOChub schema."""
+        return "Person"
+    
+    def get_affiliation(self, obj):
+        """Return affiliation information in MOOChub format."""
+        if obj.research_group:
+            return {
+                "type": "Organization",
+                "name": obj.research_group.name
+            }
+        return {
+            "type": "Organization",
+            "name": "German University of Digital Science"
+        }
+    
+    def get_image(self, obj):
+        """Return image information in MOOChub format, pointing at the cached rendition."""
+        return moochub_image(obj.image_url, self.context.get('request'))
+    
+    def get_mentor(self, obj):
+        """Return supervisor information in MOOChub format."""
+        if obj.supervisor:
+            return {
+                "type": "Person",
+                "name": obj.supervisor.name,
+                "honorificPrefix": obj.supervisor.title if hasattr(obj.supervisor, 'title') else ""
+            }
+        return None
@@ -6,6 +6,8 @@ and vice versa, enabling API functionality for the phd_students app.
 """
 
 from rest_framework import serializers
+
+from core.loaders import BatchedListSerializer
 from phd_students.models import PhDStudent
 
 class PhDStudentSerializer(serializers.ModelSerializer):
@@ -26,6 +28,8 @@ class PhDStudentSerializer(serializers.ModelSerializer):
         Meta class to specify model and fields for the serializer.
         """
         model = PhDStudent
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['supervisor', 'research_group']
         fields = [
             'id', 'title', 'name', 'research_group', 'supervisor',
             'enrollment_date', 'image_url', 'supervisor_name', 'research_group_name'
@@ -57,6 +61,8 @@ class PhDStudentListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PhDStudent
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['supervisor', 'research_group']
         fields = ['id', 'title', 'name', 'supervisor_name', 'research_group_name']  # Only essential fields
     
     def get_supervisor_name(self, obj):
@@ -70,61 +76,3 @@ class PhDStudentListSerializer(serializers.ModelSerializer):
         if obj.research_group:
             return obj.research_group.name
         return None
-
-# MOOChub compatible serializer for PhD Students
-class MOOChubPhDStudentSerializer(serializers.ModelSerializer):
-    """
-    Serializer specifically formatted for MOOChub API compatibility.
-    
-    This serializer maps our internal PhDStudent model fields to the field names and
-    structure expected by the MOOChub schema for interoperability with other platforms.
-    """
-    
-    # MOOChub specific field mappings
-    type = serializers.SerializerMethodField()
-    honorificPrefix = serializers.CharField(source='title')
-    affiliation = serializers.SerializerMethodField()
-    image = serializers.SerializerMethodField()
-    mentor = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = PhDStudent
-        fields = [
-            'id', 'type', 'name', 'honorificPrefix', 
-            'affiliation', 'image', 'mentor', 'enrollment_date'
-        ]
-    
-    def get_type(self, obj):
-        """Return the type of resource according to MOOChub schema."""
-        return "Person"
-    
-    def get_affiliation(self, obj):
-        """Return affiliation information in MOOChub format."""
-        if obj.research_group:
-            return {
-                "type": "Organization",
-                "name": obj.research_group.name
-            }
-        return {
-            "type": "Organization",
-            "name": "German University of Digital Science"
-        }
-    
-    def get_image(self, obj):
-        """Return image information in MOOChub format."""
-        if obj.image_url:
-            return {
-                "type": "ImageObject",
-                "contentUrl": obj.image_url,
-            }
-        return None
-    
-    def get_mentor(self, obj):
-        """Return supervisor information in MOOChub format."""
-        if obj.supervisor:
-            return {
-                "type": "Person",
-                "name": obj.supervisor.name,
-                "honorificPrefix": obj.supervisor.title if hasattr(obj.supervisor, 'title') else ""
-            }
-        return None
@@ -1,21 +1,27 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+
+from core.catalog import catalog_list, catalog_object_or_404
+from core.db import reads_from_replica
+
 from .models import PhDStudent
 
+@reads_from_replica
 def phdstudent_list(request):
     """
     Display a list of PhD students.
     Supports 'view' GET parameter to toggle between list and block views.
     """
     view_mode = request.GET.get('view', 'block')
-    students = PhDStudent.objects.all()
+    students = catalog_list(request, PhDStudent)
     return render(request, 'phd_students/phd_students_list.html', {
         'students': students,
         'view_mode': view_mode,
     })
 
+@reads_from_replica
 def phdstudent_detail(request, pk):
     """
     Display details for a single PhD student.
     """
-    student = get_object_or_404(PhDStudent, pk=pk)
+    student = catalog_object_or_404(request, PhDStudent, pk)
     return render(request, 'phd_students/phd_student_detail.html', {'student': student})
\ No newline at end of file
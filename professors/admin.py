@@ -1,14 +1,31 @@
 import csv
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
 from django.shortcuts import render, redirect
 from django.urls import path, reverse
 from django.utils.html import format_html
 from .models import Professor
 from core.admin_forms import CsvImportForm
+from core.admin_tools import CatalogAdmin
+from core.images import prefetch_asset_info, rendition_url
+
+
+class ProfessorChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        # One asset lookup for the whole page instead of one per picture.
+        prefetch_asset_info(obj.image_url for obj in self.result_list)
+
 
 @admin.register(Professor)
-class ProfessorAdmin(admin.ModelAdmin):
+class ProfessorAdmin(CatalogAdmin):
     list_display = ['name', 'title', 'position', 'picture_tag']
+    import_entity = 'professors'
+    search_fields = ['name']
+    autocomplete_fields = ['research_group', 'leads_research_group']
+
+    def get_changelist(self, request, **kwargs):
+        return ProfessorChangeList
 
     def get_urls(self):
         urls = super().get_urls()
@@ -22,9 +39,10 @@ class ProfessorAdmin(admin.ModelAdmin):
         return custom_urls + urls
 
     def picture_tag(self, obj):
-        if obj.image_url:
+        picture = rendition_url(obj.image_url, 'thumb')
+        if picture:
             # Change width/height as you like
-            return format_html('<img src="{}" style="height:60px;width:auto;"/>', obj.image_url)
+            return format_html('<img src="{}" style="height:60px;width:auto;"/>', picture)
         return "-"
     picture_tag.short_description = "Picture"
 
@@ -44,6 +62,9 @@ class ProfessorAdmin(admin.ModelAdmin):
                 csv_file = form.cleaned_data['csv_file']
                 decoded_file = csv_file.read().decode('utf-8').splitlines()
                 reader = csv.DictReader(decoded_file)
+                if form.cleaned_data['validate_only']:
+                    self.validate_csv(request, reader)
+                    return redirect(".")
                 count = 0
                 for row in reader:
                     Professor.objects.create(
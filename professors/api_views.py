@@ -9,10 +9,35 @@ from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.catalog import SnapshotReadsMixin
+from core.db import ReadOnlyModeMixin
+from core.facets import FacetedListMixin, FieldFacet, RelationFacet
+from core.filters import CHOICE_LOOKUPS, DeclarativeFilterBackend, FieldFilter, RelationFilter
+from core.moochub import MOOChubViewSet
+from relations.models import ProfessorCourse
+
 from .models import Professor
-from .serializers import ProfessorSerializer, ProfessorListSerializer, MOOChubPersonSerializer
+from .serializers import ProfessorSerializer, ProfessorListSerializer
+
+# Query parameters accepted by the professor APIs, e.g.
+# /api/professors/?title__in=Prof.,Dr.&course=12
+PROFESSOR_FILTERS = {
+    'title': FieldFilter('title', CHOICE_LOOKUPS),
+    'position': FieldFilter('position', CHOICE_LOOKUPS),
+    'research_group': FieldFilter('research_group', CHOICE_LOOKUPS + ['isnull']),
+    'leads_research_group': FieldFilter('leads_research_group', CHOICE_LOOKUPS + ['isnull']),
+    'course': RelationFilter(ProfessorCourse, 'professor', 'course'),
+}
+
+# Facets of the professor list, e.g. /api/professors/?facets=title,research_group
+PROFESSOR_FACETS = {
+    'title': FieldFacet('title'),
+    'position': FieldFacet('position'),
+    'research_group': FieldFacet('research_group', label=('name',)),
+    'course': RelationFacet(ProfessorCourse, 'professor', 'course', label=('name',)),
+}
 
-class ProfessorViewSet(viewsets.ModelViewSet):
+class ProfessorViewSet(FacetedListMixin, SnapshotReadsMixin, ReadOnlyModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for Professor model.
     
@@ -26,7 +51,9 @@ class ProfessorViewSet(viewsets.ModelViewSet):
     serializer_class = ProfessorSerializer
     
     # Add search capabilities
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DeclarativeFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_spec = PROFESSOR_FILTERS
+    facet_spec = PROFESSOR_FACETS
     search_fields = ['name', 'position']  # Fields that can be searched
     ordering_fields = ['name', 'title']  # Fields that can be used for ordering
     
@@ -84,69 +111,32 @@ class ProfessorViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response({"detail": "No research group found for this professor."}, status=404)
 
-class MOOChubPersonViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['get'])
+    def overlaps(self, request):
+        """
+        Return the professors teaching courses whose dates overlap, with the overlapping pairs.
+
+        This is a custom endpoint that will be available at:
+        /api/professors/overlaps/
+        """
+        from courses.schedule import professor_overlaps  # Import here to avoid circular imports
+        overlaps = professor_overlaps()
+        professors = Professor.objects.in_bulk(list(overlaps))
+        professors = [professors[pk] for pk in sorted(overlaps) if pk in professors]
+        data = ProfessorListSerializer(professors, many=True, context=self.get_serializer_context()).data
+        for item, professor in zip(data, professors):
+            item['overlapping_courses'] = [list(pair) for pair in overlaps[professor.pk]]
+        return Response(data)
+
+class MOOChubPersonViewSet(MOOChubViewSet):
     """
     ViewSet for MOOChub-compatible Professor API.
     
     This ViewSet provides read-only access to professors in a format compatible with
-    the MOOChub schema for interoperability with other platforms.
-    
-    Only 'list' and 'retrieve' actions are available since this is a read-only API.
+    the MOOChub schema for interoperability with other platforms. The JSON:API
+    envelope is built by the shared MOOChubViewSet and MOOChubPagination.
     """
     
-    queryset = Professor.objects.all()
-    serializer_class = MOOChubPersonSerializer
-    
-    def list(self, request, *args, **kwargs):
-        """
-        Override list method to format response according to MOOChub JSON:API spec.
-        
-        This ensures the response structure follows the MOOChub requirements,
-        including proper pagination links and metadata.
-        """
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = self.get_paginated_response(serializer.data)
-            
-            # Format according to MOOChub JSON:API spec
-            formatted_data = {
-                "jsonapi": {"version": "1.0"},
-                "data": data.data['results'],
-                "links": {
-                    "self": request.build_absolute_uri(),
-                }
-            }
-            
-            # Add pagination links if available
-            if 'links' in data.data:
-                if data.data['links'].get('next'):
-                    formatted_data['links']['next'] = data.data['links']['next']
-                
-                if data.data['links'].get('previous'):
-                    formatted_data['links']['prev'] = data.data['links']['previous']
-                    
-            return Response(formatted_data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"jsonapi": {"version": "1.0"}, "data": serializer.data})
-    
-    def retrieve(self, request, *args, **kwargs):
-        """
-        Override retrieve method to format single professor response according to MOOChub JSON:API spec.
-        """
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        
-        # Format according to MOOChub JSON:API spec
-        formatted_data = {
-            "jsonapi": {"version": "1.0"},
-            "data": serializer.data,
-            "links": {
-                "self": request.build_absolute_uri()
-            }
-        }
-        
-        return Response(formatted_data)
+    queryset = Professor.objects.order_by('pk')
+    serializer_path = 'professors.moochub_serializers.MOOChubPersonSerializer'
+    filter_spec = PROFESSOR_FILTERS
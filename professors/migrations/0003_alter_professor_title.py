@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professors', '0002_remove_professor_department_remove_professor_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='professor',
+            name='title',
+            field=models.CharField(max_length=50),
+        ),
+    ]
@@ -0,0 +1,60 @@
+"""
+MOOChub serializers for the professors app.
+
+This file contains the serializers that render professors in the MOOChub schema.
+They live apart from serializers.py so that workers only import them when the
+MOOChub API is actually used (see core/startup.py).
+"""
+
+from rest_framework import serializers
+
+from professors.models import Professor
+from core.images import moochub_image
+from core.loaders import BatchedListSerializer
+
+# MOOChub compatible serializer for professors as instructors
+class MOOChubPersonSerializer(serializers.ModelSerializer):
+    """
+    Serializer specifically formatted for MOOChub API compatibility.
+    
+    This serializer maps our internal Professor model fields to the field names and
+    structure expected by the MOOChub schema for interoperability with other platforms.
+    """
+    
+    # MOOChub specific field mappings
+    type = serializers.SerializerMethodField()
+    honorificPrefix = serializers.CharField(source='title')
+    description = serializers.CharField(source='bio')
+    image = serializers.SerializerMethodField()
+    affiliation = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Professor
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['research_group']
+        fields = [
+            'id', 'type', 'name', 'honorificPrefix', 
+            'description', 'image', 'affiliation'
+        ]
+    
+    def get_type(self, obj):
+        """Return the type of resource according to MOOChub schema."""
+        return "Person"
+    
+    def get_image(self, obj):
+        """Return image information in MOOChub format, pointing at the cached rendition."""
+        return moochub_image(obj.image_url, self.context.get('request'))
+    
+    def get_affiliation(self, obj):
+        """Return affiliation information in MOOChub format."""
+        # Return the research group as the affiliation if available
+        if obj.research_group:
+            return {
+                "type": "Organization",
+                "name": obj.research_group.name
+            }
+        # Otherwise return a default organization
+        return {
+            "type": "Organization",
+            "name": "German University of Digital Science"
+        }
@@ -6,6 +6,8 @@ and vice versa, enabling API functionality for the professors app.
 """
 
 from rest_framework import serializers
+
+from core.loaders import BatchedListSerializer
 from professors.models import Professor
 
 class ProfessorSerializer(serializers.ModelSerializer):
@@ -26,6 +28,8 @@ class ProfessorSerializer(serializers.ModelSerializer):
         Meta class to specify model and fields for the serializer.
         """
         model = Professor
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['research_group', 'leads_research_group']
         fields = [
             'id', 'title', 'name', 'position', 'bio', 'image_url',
             'research_group', 'leads_research_group',
@@ -56,6 +60,8 @@ class ProfessorListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Professor
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['research_group']
         fields = ['id', 'title', 'name', 'position', 'research_group_name']  # Only essential fields
     
     def get_research_group_name(self, obj):
@@ -63,53 +69,3 @@ class ProfessorListSerializer(serializers.ModelSerializer):
         if obj.research_group:
             return obj.research_group.name
         return None
-
-# MOOChub compatible serializer for professors as instructors
-class MOOChubPersonSerializer(serializers.ModelSerializer):
-    """
-    Serializer specifically formatted for MOOChub API compatibility.
-    
-    This serializer maps our internal Professor model fields to the field names and
-    structure expected by the MOOChub schema for interoperability with other platforms.
-    """
-    
-    # MOOChub specific field mappings
-    type = serializers.SerializerMethodField()
-    honorificPrefix = serializers.CharField(source='title')
-    description = serializers.CharField(source='bio')
-    image = serializers.SerializerMethodField()
-    affiliation = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Professor
-        fields = [
-            'id', 'type', 'name', 'honorificPrefix', 
-            'description', 'image', 'affiliation'
-        ]
-    
-    def get_type(self, obj):
-        """Return the type of resource according to MOOChub schema."""
-        return "Person"
-    
-    def get_image(self, obj):
-        """Return image information in MOOChub format."""
-        if obj.image_url:
-            return {
-                "type": "ImageObject",
-                "contentUrl": obj.image_url,
-            }
-        return None
-    
-    def get_affiliation(self, obj):
-        """Return affiliation information in MOOChub format."""
-        # Return the research group as the affiliation if available
-        if obj.research_group:
-            return {
-                "type": "Organization",
-                "name": obj.research_group.name
-            }
-        # Otherwise return a default organization
-        return {
-            "type": "Organization",
-            "name": "German University of Digital Science"
-        }
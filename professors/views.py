@@ -1,14 +1,20 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+
+from core.catalog import catalog_list, catalog_object_or_404
+from core.db import reads_from_replica
+
 from .models import Professor
 
+@reads_from_replica
 def professor_list(request):
     view_mode = request.GET.get('view', 'block')
-    professors = Professor.objects.all()
+    professors = catalog_list(request, Professor)
     return render(request, 'professors/professors_list.html', {
         'professors': professors,
         'view_mode': view_mode,
     })
 
+@reads_from_replica
 def professor_detail(request, pk):
-    professor = get_object_or_404(Professor, pk=pk)
+    professor = catalog_object_or_404(request, Professor, pk)
     return render(request, 'professors/professor_detail.html', {'professor': professor})
\ No newline at end of file
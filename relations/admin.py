@@ -1,5 +1,19 @@
 from django.contrib import admin
 from .models import ProfessorCourse, CourseResearch
+from core.admin_tools import CatalogAdmin
 
-admin.site.register(ProfessorCourse)
-admin.site.register(CourseResearch)
\ No newline at end of file
+# The link tables grow with the product of their sides, so pick rows by id
+# instead of rendering every professor, course and group into a <select>.
+
+@admin.register(ProfessorCourse)
+class ProfessorCourseAdmin(CatalogAdmin):
+    list_display = ['professor', 'course']
+    list_select_related = ['professor', 'course']
+    raw_id_fields = ['professor', 'course']
+
+
+@admin.register(CourseResearch)
+class CourseResearchAdmin(CatalogAdmin):
+    list_display = ['course', 'research_group']
+    list_select_related = ['course', 'research_group']
+    raw_id_fields = ['course', 'research_group']
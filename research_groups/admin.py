@@ -4,10 +4,13 @@ from django.shortcuts import render, redirect
 from django.urls import path
 from .models import ResearchGroup
 from core.admin_forms import CsvImportForm
+from core.admin_tools import CatalogAdmin
 
 @admin.register(ResearchGroup)
-class ResearchGroupAdmin(admin.ModelAdmin):
+class ResearchGroupAdmin(CatalogAdmin):
     list_display = ['name']
+    import_entity = 'research_groups'
+    search_fields = ['name']
 
     def get_urls(self):
         urls = super().get_urls()
@@ -23,6 +26,9 @@ class ResearchGroupAdmin(admin.ModelAdmin):
                 csv_file = form.cleaned_data['csv_file']
                 decoded_file = csv_file.read().decode('utf-8').splitlines()
                 reader = csv.DictReader(decoded_file)
+                if form.cleaned_data['validate_only']:
+                    self.validate_csv(request, reader)
+                    return redirect(".")
                 count = 0
                 for row in reader:
                     ResearchGroup.objects.create(
@@ -9,10 +9,23 @@ from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.catalog import SnapshotReadsMixin
+from core.db import ReadOnlyModeMixin
+from core.filters import CHOICE_LOOKUPS, DeclarativeFilterBackend, FieldFilter, RelationFilter
+from core.moochub import MOOChubViewSet
+from relations.models import CourseResearch
+
 from .models import ResearchGroup
-from .serializers import ResearchGroupSerializer, ResearchGroupListSerializer, MOOChubOrganizationSerializer
+from .serializers import ResearchGroupSerializer, ResearchGroupListSerializer
+
+# Query parameters accepted by the research group APIs, e.g.
+# /api/research_groups/?course__in=4,7
+RESEARCH_GROUP_FILTERS = {
+    'name': FieldFilter('name', CHOICE_LOOKUPS),
+    'course': RelationFilter(CourseResearch, 'research_group', 'course'),
+}
 
-class ResearchGroupViewSet(viewsets.ModelViewSet):
+class ResearchGroupViewSet(SnapshotReadsMixin, ReadOnlyModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for ResearchGroup model.
     
@@ -26,7 +39,8 @@ class ResearchGroupViewSet(viewsets.ModelViewSet):
     serializer_class = ResearchGroupSerializer
     
     # Add search and filtering capabilities
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DeclarativeFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_spec = RESEARCH_GROUP_FILTERS
     search_fields = ['name', 'description']  # Fields that can be searched
     ordering_fields = ['name']  # Fields that can be used for ordering
     
@@ -84,69 +98,16 @@ class ResearchGroupViewSet(viewsets.ModelViewSet):
         serializer = CourseSerializer(courses, many=True)
         return Response(serializer.data)
 
-class MOOChubOrganizationViewSet(viewsets.ReadOnlyModelViewSet):
+class MOOChubOrganizationViewSet(MOOChubViewSet):
     """
     ViewSet for MOOChub-compatible Research Group API.
     
     This ViewSet provides read-only access to research groups in a format compatible with
-    the MOOChub schema for interoperability with other platforms.
-    
-    Only 'list' and 'retrieve' actions are available since this is a read-only API.
+    the MOOChub schema for interoperability with other platforms. The JSON:API
+    envelope is built by the shared MOOChubViewSet and MOOChubPagination.
     """
     
-    queryset = ResearchGroup.objects.all()
-    serializer_class = MOOChubOrganizationSerializer
-    
-    def list(self, request, *args, **kwargs):
-        """
-        Override list method to format response according to MOOChub JSON:API spec.
-        
-        This ensures the response structure follows the MOOChub requirements,
-        including proper pagination links and metadata.
-        """
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = self.get_paginated_response(serializer.data)
-            
-            # Format according to MOOChub JSON:API spec
-            formatted_data = {
-                "jsonapi": {"version": "1.0"},
-                "data": data.data['results'],
-                "links": {
-                    "self": request.build_absolute_uri(),
-                }
-            }
-            
-            # Add pagination links if available
-            if 'links' in data.data:
-                if data.data['links'].get('next'):
-                    formatted_data['links']['next'] = data.data['links']['next']
-                
-                if data.data['links'].get('previous'):
-                    formatted_data['links']['prev'] = data.data['links']['previous']
-                    
-            return Response(formatted_data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"jsonapi": {"version": "1.0"}, "data": serializer.data})
-    
-    def retrieve(self, request, *args, **kwargs):
-        """
-        Override retrieve method to format single research group response according to MOOChub JSON:API spec.
-        """
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        
-        # Format according to MOOChub JSON:API spec
-        formatted_data = {
-            "jsonapi": {"version": "1.0"},
-            "data": serializer.data,
-            "links": {
-                "self": request.build_absolute_uri()
-            }
-        }
-        
-        return Response(formatted_data)
+    queryset = ResearchGroup.objects.order_by('pk')
+    serializer_path = 'research_groups.moochub_serializers.MOOChubOrganizationSerializer'
+    compiled_serializer_path = 'research_groups.moochub_serializers.CompiledMOOChubOrganizationSerializer'
+    filter_spec = RESEARCH_GROUP_FILTERS
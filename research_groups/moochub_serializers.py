@@ -0,0 +1,117 @@
+"""
+MOOChub serializers for the research_groups app.
+
+This file contains the serializers that render research groups in the MOOChub schema.
+They live apart from serializers.py so that workers only import them when the
+MOOChub API is actually used (see core/startup.py).
+"""
+
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from core.compiled import CompiledSerializer
+from core.loaders import BatchedListSerializer
+from phd_students.models import PhDStudent
+from professors.models import Professor
+from research_groups.models import ResearchGroup
+
+# MOOChub compatible serializer for Research Groups
+class MOOChubOrganizationSerializer(serializers.ModelSerializer):
+    """
+    Serializer specifically formatted for MOOChub API compatibility.
+    
+    This serializer maps our internal ResearchGroup model fields to the field names and
+    structure expected by the MOOChub schema for interoperability with other platforms.
+    """
+    
+    # MOOChub specific field mappings
+    type = serializers.SerializerMethodField()
+    identifier = serializers.SerializerMethodField()
+    member = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ResearchGroup
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['lead_professor', 'phd_students']
+        fields = [
+            'id', 'type', 'name', 'description', 
+            'identifier', 'member'
+        ]
+    
+    def get_type(self, obj):
+        """Return the type of resource according to MOOChub schema."""
+        return "Organization"
+    
+    def get_identifier(self, obj):
+        """Return a unique identifier for this research group."""
+        return f"research-group-{obj.id}"
+    
+    def get_member(self, obj):
+        """Return members of this research group in MOOChub format."""
+        members = []
+        
+        # Add lead professor if available
+        if hasattr(obj, 'lead_professor') and obj.lead_professor:
+            members.append({
+                "type": "Person",
+                "name": obj.lead_professor.name,
+                "honorificPrefix": obj.lead_professor.title if hasattr(obj.lead_professor, 'title') else "",
+                "roleName": "Lead"
+            })
+        
+        # Add PhD students
+        for student in obj.phd_students.all():
+            members.append({
+                "type": "Person",
+                "name": student.name,
+                "honorificPrefix": student.title if student.title else "",
+                "roleName": "PhD Student"
+            })
+            
+        return members
+
+
+class CompiledMOOChubOrganizationSerializer(CompiledSerializer):
+    """
+    Compiled, read-only version of MOOChubOrganizationSerializer for list pages.
+
+    Lead professors and PhD students for the whole page are loaded with one
+    query each.
+    """
+
+    serializer_class = MOOChubOrganizationSerializer
+    row_fields = ('id', 'name', 'description')
+    constant_fields = ('type',)
+    relation_fields = {'member': 'get_member'}
+
+    def load_relations(self, rows):
+        """Return {group id: [member, ...]} for the groups in ``rows``."""
+        ids = [row['id'] for row in rows]
+        members = defaultdict(list)
+        leads = Professor.objects.filter(leads_research_group_id__in=ids).values_list(
+            'leads_research_group_id', 'name', 'title'
+        )
+        for group_id, name, title in leads:
+            members[group_id].append({
+                "type": "Person",
+                "name": name,
+                "honorificPrefix": title,
+                "roleName": "Lead"
+            })
+        students = (
+            PhDStudent.objects.filter(research_group_id__in=ids)
+            .order_by('pk')
+            .values_list('research_group_id', 'name', 'title')
+        )
+        for group_id, name, title in students:
+            members[group_id].append({
+                "type": "Person",
+                "name": name,
+                "honorificPrefix": title if title else "",
+                "roleName": "PhD Student"
+            })
+        return members
+
+    def get_member(self, row, members):
+        return members.get(row['id'], [])
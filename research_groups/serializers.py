@@ -6,6 +6,8 @@ and vice versa, enabling API functionality for the research_groups app.
 """
 
 from rest_framework import serializers
+
+from core.loaders import BatchedListSerializer
 from research_groups.models import ResearchGroup
 
 class ResearchGroupSerializer(serializers.ModelSerializer):
@@ -26,6 +28,8 @@ class ResearchGroupSerializer(serializers.ModelSerializer):
         Meta class to specify model and fields for the serializer.
         """
         model = ResearchGroup
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['lead_professor', 'phd_students']
         fields = [
             'id', 'name', 'description', 
             'lead_professor_name', 'phd_student_count'
@@ -54,6 +58,8 @@ class ResearchGroupListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ResearchGroup
+        list_serializer_class = BatchedListSerializer
+        batch_relations = ['lead_professor']
         fields = ['id', 'name', 'lead_professor_name']  # Only essential fields
     
     def get_lead_professor_name(self, obj):
@@ -61,56 +67,3 @@ class ResearchGroupListSerializer(serializers.ModelSerializer):
         if hasattr(obj, 'lead_professor') and obj.lead_professor:
             return obj.lead_professor.name
         return None
-
-# MOOChub compatible serializer for Research Groups
-class MOOChubOrganizationSerializer(serializers.ModelSerializer):
-    """
-    Serializer specifically formatted for MOOChub API compatibility.
-    
-    This serializer maps our internal ResearchGroup model fields to the field names and
-    structure expected by the MOOChub schema for interoperability with other platforms.
-    """
-    
-    # MOOChub specific field mappings
-    type = serializers.SerializerMethodField()
-    identifier = serializers.SerializerMethodField()
-    member = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = ResearchGroup
-        fields = [
-            'id', 'type', 'name', 'description', 
-            'identifier', 'member'
-        ]
-    
-    def get_type(self, obj):
-        """Return the type of resource according to MOOChub schema."""
-        return "Organization"
-    
-    def get_identifier(self, obj):
-        """Return a unique identifier for this research group."""
-        return f"research-group-{obj.id}"
-    
-    def get_member(self, obj):
-        """Return members of this research group in MOOChub format."""
-        members = []
-        
-        # Add lead professor if available
-        if hasattr(obj, 'lead_professor') and obj.lead_professor:
-            members.append({
-                "type": "Person",
-                "name": obj.lead_professor.name,
-                "honorificPrefix": obj.lead_professor.title if hasattr(obj.lead_professor, 'title') else "",
-                "roleName": "Lead"
-            })
-        
-        # Add PhD students
-        for student in obj.phd_students.all():
-            members.append({
-                "type": "Person",
-                "name": student.name,
-                "honorificPrefix": student.title if student.title else "",
-                "roleName": "PhD Student"
-            })
-            
-        return members
@@ -1,3 +1,31 @@
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
-# Create your tests here.
+from phd_students.models import PhDStudent
+from professors.models import Professor
+from research_groups.models import ResearchGroup
+from research_groups.moochub_serializers import (
+    CompiledMOOChubOrganizationSerializer,
+    MOOChubOrganizationSerializer,
+)
+
+
+class CompiledMOOChubOrganizationSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ai = ResearchGroup.objects.create(name='AI', description='Artificial intelligence')
+        systems = ResearchGroup.objects.create(name='Systems', description='')
+        ResearchGroup.objects.create(name='Empty', description='No members')
+        Professor.objects.create(title='Prof.', name='Grace', position='Chair', leads_research_group=ai)
+        PhDStudent.objects.create(name='Linus', title='M.Sc.', research_group=ai)
+        PhDStudent.objects.create(name='Barbara', research_group=ai)
+        PhDStudent.objects.create(name='Ken', research_group=systems)
+
+    def test_output_matches_drf_serializer(self):
+        queryset = ResearchGroup.objects.order_by('pk')
+
+        expected = MOOChubOrganizationSerializer(queryset, many=True).data
+        compiled = CompiledMOOChubOrganizationSerializer()
+        actual = compiled.serialize(compiled.prepare(queryset))
+
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
@@ -1,14 +1,20 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+
+from core.catalog import catalog_list, catalog_object_or_404
+from core.db import reads_from_replica
+
 from .models import ResearchGroup
 
+@reads_from_replica
 def researchgroup_list(request):
     view_mode = request.GET.get('view', 'block')
-    groups = ResearchGroup.objects.all()
+    groups = catalog_list(request, ResearchGroup)
     return render(request, 'research_groups/research_groups_list.html', {
         'groups': groups,
         'view_mode': view_mode,
     })
 
+@reads_from_replica
 def researchgroup_detail(request, pk):
-    group = get_object_or_404(ResearchGroup, pk=pk)
+    group = catalog_object_or_404(request, ResearchGroup, pk)
     return render(request, 'research_groups/research_group_detail.html', {'group': group})
\ No newline at end of file